@@ -0,0 +1,88 @@
+import os
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+
+DEFAULT_SIZES = [1000, 10000]
+
+
+def usage() -> None:
+    python = "python" if platform.system() == "Windows" else "python3"
+    print(f"Usage: {python} benchmarks/agent_id_list.py [list sizes]")
+    print(f"Example: {python} benchmarks/agent_id_list.py 1000,10000")
+    print(
+        "Times the AgentIDList operations the simulation runs in its hot loops, for lists of the given sizes."
+    )
+
+
+def best_ms(function: Callable[[], object], number: int = 1) -> float:
+    """Returns the best time of a few runs of a function, in milliseconds per call."""
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1000
+
+
+def main(sizes: list[int]) -> None:
+    curr_dir = os.path.dirname(os.path.realpath(__file__))
+    sys.path.insert(0, os.path.join(os.path.dirname(curr_dir), "src"))
+
+    from aegis.common import AgentID, AgentIDList
+
+    for size in sizes:
+        agent_ids = [AgentID(id, 1 + id % 4) for id in range(size)]
+        some_agent_ids = agent_ids[::10]
+
+        def build() -> AgentIDList:
+            agent_id_list = AgentIDList()
+            for agent_id in agent_ids:
+                agent_id_list.add(agent_id)
+            return agent_id_list
+
+        full = build()
+
+        def contains() -> None:
+            for agent_id in some_agent_ids:
+                _ = agent_id in full
+
+        def iterate() -> None:
+            for _ in full:
+                pass
+
+        def remove() -> None:
+            agent_id_list = build()
+            for agent_id in agent_ids:
+                agent_id_list.remove(agent_id)
+
+        def pop_front() -> None:
+            agent_id_list = build()
+            while not agent_id_list.is_empty():
+                _ = agent_id_list.remove_at(0)
+
+        print(f"{size} ids:")
+        for name, ms in [
+            ("add all", best_ms(build)),
+            (f"{len(some_agent_ids)} x in", best_ms(contains)),
+            ("iterate", best_ms(iterate, 10)),
+            ("add all, remove all", best_ms(remove)),
+            ("add all, remove_at(0)", best_ms(pop_front)),
+            ("snapshot", best_ms(full.snapshot, 1000)),
+            ("clone", best_ms(full.clone, 10)),
+        ]:
+            print(f"  {name:<24} {ms:10.4f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        usage()
+        sys.exit(1)
+
+    try:
+        sizes = (
+            [int(size) for size in sys.argv[1].split(",")]
+            if len(sys.argv) > 1
+            else DEFAULT_SIZES
+        )
+    except ValueError:
+        usage()
+        sys.exit(1)
+
+    main(sizes)
@@ -0,0 +1,112 @@
+import contextlib
+import io
+import os
+import platform
+import sys
+import tempfile
+import time
+
+DEFAULT_ROUNDS = 50
+DEFAULT_AGENT_COUNTS = [100, 200, 400, 800]
+# how much more a round may cost per agent at the most agents than at the fewest
+MAX_PER_AGENT_GROWTH = 2.0
+
+
+def usage() -> None:
+    python = "python" if platform.system() == "Windows" else "python3"
+    print(
+        f"Usage: {python} benchmarks/agent_scaling.py [num of rounds] [agent amounts]"
+    )
+    print(f"Example: {python} benchmarks/agent_scaling.py 50 100,200,400,800")
+    print(
+        "Times a round with more and more in-process agents that sleep every round, and fails if the cost of a round grows faster than the number of agents."
+    )
+
+
+def main(rounds: int, agent_counts: list[int]) -> None:
+    curr_dir = os.path.dirname(os.path.realpath(__file__))
+    root_dir = os.path.dirname(curr_dir)
+    sys.path.insert(0, os.path.join(root_dir, "src"))
+    # AEGIS reads its config from sys_files, relative to the repository
+    os.chdir(root_dir)
+
+    from aegis.aegis_main import Aegis
+    from aegis.common.commands.aegis_commands import MOVE_RESULT, SAVE_SURV_RESULT
+    from aegis.common.commands.agent_commands import END_TURN, SLEEP
+    from agent.brain import Brain
+
+    class SleepingAgent(Brain):
+        def handle_move_result(self, mr: MOVE_RESULT) -> None:
+            pass
+
+        def handle_save_surv_result(self, ssr: SAVE_SURV_RESULT) -> None:
+            pass
+
+        def think(self) -> None:
+            self.base_agent.send(SLEEP())
+            self.base_agent.send(END_TURN())
+
+    world_file = os.path.join("worlds", "ver2_1.world")
+    per_agent: list[float] = []
+    for agent_count in agent_counts:
+        with tempfile.TemporaryDirectory() as run_dir:
+            aegis = Aegis()
+            with contextlib.redirect_stdout(io.StringIO()):
+                if not aegis.read_command_line(
+                    [
+                        "-WorldFile",
+                        world_file,
+                        "-NumRound",
+                        str(rounds),
+                        "-Headless",
+                        "true",
+                        "-RunDir",
+                        run_dir,
+                    ]
+                ):
+                    print("Unable to initialize AEGIS.", file=sys.stderr)
+                    sys.exit(1)
+                try:
+                    if not aegis.start_up(listen=False) or not aegis.build_world():
+                        print("Unable to start AEGIS.", file=sys.stderr)
+                        sys.exit(1)
+                    for _ in range(agent_count):
+                        _ = aegis.add_local_agent(SleepingAgent())
+                    aegis.start_running()
+                    start = time.perf_counter()
+                    aegis.run_state()
+                    seconds = time.perf_counter() - start
+                finally:
+                    aegis.shutdown()
+
+        round_ms = seconds / rounds * 1000
+        per_agent.append(round_ms / agent_count)
+        print(
+            f"{agent_count:6} agents: {round_ms:8.2f} ms/round, "
+            + f"{per_agent[-1] * 1000:6.1f} us/agent/round"
+        )
+
+    growth = per_agent[-1] / per_agent[0]
+    print(f"Per agent cost grew {growth:.2f}x from the fewest to the most agents.")
+    if growth > MAX_PER_AGENT_GROWTH:
+        print("The cost of a round grows faster than linearly with the agents.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        usage()
+        sys.exit(1)
+
+    try:
+        rounds = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROUNDS
+        agent_counts = (
+            [int(count) for count in sys.argv[2].split(",")]
+            if len(sys.argv) > 2
+            else DEFAULT_AGENT_COUNTS
+        )
+    except ValueError:
+        usage()
+        sys.exit(1)
+
+    main(rounds, agent_counts)
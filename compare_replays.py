@@ -0,0 +1,38 @@
+import os
+import platform
+import sys
+
+
+def usage() -> None:
+    python = "python" if platform.system() == "Windows" else "python3"
+    print(f"Usage: {python} compare_replays.py <replay file> <replay file>")
+    print(f"Example: {python} compare_replays.py run1/replay.txt run2/replay.txt")
+
+
+def main(replay_a: str, replay_b: str) -> None:
+    curr_dir = os.path.dirname(os.path.realpath(__file__))
+    sys.path.insert(0, os.path.join(curr_dir, "src"))
+    from aegis.assist.replay_diff import find_divergence
+
+    with open(replay_a, "r") as file_a, open(replay_b, "r") as file_b:
+        divergence = find_divergence(file_a, file_b)
+
+    if divergence is None:
+        print("The runs have the same world in every round.")
+        return
+
+    print(f"The runs diverge. {divergence}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        usage()
+        sys.exit(1)
+
+    for replay in sys.argv[1:]:
+        if not os.path.exists(replay):
+            print(f"Cannot find replay file {replay}")
+            sys.exit(1)
+
+    main(sys.argv[1], sys.argv[2])
@@ -2,6 +2,7 @@ import os
 import platform
 import subprocess
 import sys
+import tempfile
 import time
 from concurrent.futures import ThreadPoolExecutor
 
@@ -14,17 +15,33 @@ def usage() -> None:
     print(
         f"Example: {python} run_headless_aegis_with_agents.py 2 50 example_agent ExampleWorld"
     )
+    print(
+        "Every run gets its own port and run directory, so several runs can share a machine."
+    )
 
 
-def run_agent(agent: str) -> None:
+def run_agent(agent: str, port: int) -> None:
     curr_dir = os.path.dirname(os.path.realpath(__file__))
     main = os.path.join(curr_dir, "src", "agents", agent, "main.py")
     python_command = "python" if platform.system() == "Windows" else "python3"
     command = [python_command, main]
-    _ = subprocess.run(command)
+    _ = subprocess.run(command, env={**os.environ, "AEGIS_PORT": str(port)})
+
 
+def wait_for_port(run_dir: str, timeout: float = 10) -> int | None:
+    port_file = os.path.join(run_dir, "agent_port.txt")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(port_file):
+            with open(port_file) as file:
+                return int(file.read())
+        time.sleep(0.05)
+    return None
 
-def run_aegis(curr_dir: str, agent_amount: int, rounds: int, world_file: str) -> None:
+
+def run_aegis(
+    curr_dir: str, agent_amount: int, rounds: int, world_file: str, run_dir: str
+) -> None:
     main = os.path.join(curr_dir, "src", "aegis", "main.py")
     python_command = "python" if platform.system() == "Windows" else "python3"
     command = [
@@ -36,6 +53,12 @@ def run_aegis(curr_dir: str, agent_amount: int, rounds: int, world_file: str) ->
         f"worlds/{world_file}.world",
         "-NumRound",
         str(rounds),
+        "-Headless",
+        "true",
+        "-Port",
+        "0",
+        "-RunDir",
+        run_dir,
     ]
 
     _ = subprocess.run(command)
@@ -49,16 +72,25 @@ def main(agent_amount: int, rounds: int, world_file: str, agentt: str) -> None:
         curr_dir, ".venv", "Lib", "site-packages"
     )
 
+    run_dir = tempfile.mkdtemp(prefix="aegis_run_")
+
     with ThreadPoolExecutor(max_workers=agent_amount + 1) as exec:
-        _ = exec.submit(run_aegis, curr_dir, agent_amount, rounds, world_file)
+        aegis = exec.submit(run_aegis, curr_dir, agent_amount, rounds, world_file, run_dir)
 
-        time.sleep(1)  # Ensure that AEGIS runs before the agents
+        # AEGIS writes its port once it's ready for the agents
+        port = wait_for_port(run_dir)
+        if port is None:
+            print("AEGIS didn't start listening for agents.")
+            aegis.result()
+            sys.exit(1)
 
-        agents = [exec.submit(run_agent, agentt) for _ in range(agent_amount)]
+        agents = [exec.submit(run_agent, agentt, port) for _ in range(agent_amount)]
 
         for agent in agents:
             agent.result()
 
+    print(f"Replay and world info files are in {run_dir}")
+
 
 if __name__ == "__main__":
     if len(sys.argv) != 5:
@@ -67,7 +99,6 @@ if __name__ == "__main__":
 
     try:
         agent_amount = int(sys.argv[1])
-        agent_amount = 1
     except ValueError:
         print("Agent amount must be an integer.")
         sys.exit(1)
@@ -0,0 +1,107 @@
+import importlib
+import inspect
+import os
+import platform
+import sys
+
+
+def usage() -> None:
+    python = "python" if platform.system() == "Windows" else "python3"
+    print(
+        f"Usage: {python} run_local_aegis_with_agents.py <agent amount> <num of rounds> <agent directory> <world file> [AEGIS options]"
+    )
+    print(
+        f"Example: {python} run_local_aegis_with_agents.py 2 50 example_agent ExampleWorld"
+    )
+    print(
+        f"Example: {python} run_local_aegis_with_agents.py 2 50 example_agent ExampleWorld -Seeds 1,2,3"
+    )
+    print(
+        "Runs the agents inside the AEGIS process, the brain is the Brain subclass in src/agents/<agent directory>/<agent directory>.py"
+    )
+
+
+def main(
+    agent_amount: int, rounds: int, world_file: str, agentt: str, options: list[str]
+) -> None:
+    curr_dir = os.path.dirname(os.path.realpath(__file__))
+    sys.path.insert(0, os.path.join(curr_dir, "src"))
+
+    from aegis.aegis_main import Aegis
+    from agent.base_agent import BaseAgent
+    from agent.brain import Brain
+    from agent.log_levels import LogLevels
+
+    module = importlib.import_module(f"agents.{agentt}.{agentt}")
+    brains = [
+        cls
+        for _, cls in inspect.getmembers(module, inspect.isclass)
+        if issubclass(cls, Brain) and cls.__module__ == module.__name__
+    ]
+    if len(brains) != 1:
+        print(f"Expected one Brain subclass in {module.__name__}, found {len(brains)}.")
+        sys.exit(1)
+
+    BaseAgent.set_log_level(LogLevels.Error)
+    aegis = Aegis()
+    try:
+        print("Aegis  : Initializing.")
+        if not aegis.read_command_line(
+            [
+                "-WorldFile",
+                f"worlds/{world_file}.world",
+                "-NumRound",
+                str(rounds),
+                "-Headless",
+                "true",
+                *options,
+            ]
+        ):
+            print("Aegis  : Unable to initialize.")
+            sys.exit(1)
+
+        print("Aegis  : Starting Up.")
+        if not aegis.start_up():
+            print("Aegis  : Unable to start up.")
+            sys.exit(1)
+
+        if not aegis.build_world():
+            print("Aegis  : Error building world.")
+            sys.exit(1)
+
+        for match, seed in enumerate(aegis.get_match_seeds()):
+            if match > 0 and not aegis.reset(seed):
+                print("Aegis  : Error resetting world.")
+                sys.exit(1)
+
+            for _ in range(agent_amount):
+                _ = aegis.add_local_agent(brains[0]())
+
+            aegis.connect_all_agents()
+            aegis.run_state()
+    finally:
+        print("Aegis  : Done.")
+        aegis.shutdown()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 5:
+        usage()
+        sys.exit(1)
+
+    try:
+        agent_amount = int(sys.argv[1])
+    except ValueError:
+        print("Agent amount must be an integer.")
+        sys.exit(1)
+
+    try:
+        rounds = int(sys.argv[2])
+    except ValueError:
+        print("Round amount must be an integer.")
+        sys.exit(1)
+
+    agent = sys.argv[3]
+    world_file = sys.argv[4]
+
+    main(agent_amount, rounds, world_file, agent, sys.argv[5:])
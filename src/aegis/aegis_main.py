@@ -1,13 +1,23 @@
 import base64
+import functools
 import gzip
 import json
+import math
+import os
 import sys
 import time
+from collections.abc import Callable
 from datetime import datetime
 
 from aegis.agent_control.agent_handler import AgentHandler
+from aegis.agent_control.move_plan import MovePlan
 from aegis.agent_control.network.agent_crashed_exception import AgentCrashedException
+from aegis.agent_control.network.agent_socket import AgentSocket
+from aegis.agent_control.network.agent_transport import AgentTransport
+from aegis.agent_control.network.local_agent_socket import LocalAgentSocket
+from aegis.assist.command_log import CommandLog, CommandLogWriter
 from aegis.assist.config_settings import ConfigSettings
+from aegis.assist.output_worker import OutputWorker
 from aegis.assist.parameters import Parameters
 from aegis.assist.replay_file_writer import ReplayFileWriter
 from aegis.assist.state import State
@@ -19,13 +29,17 @@ from aegis.common import (
     Constants,
     Direction,
     LifeSignals,
-    Utility,
+    Location,
+    RandomStream,
+    RandomStreams,
 )
 from aegis.common.commands.agent_command import AgentCommand
 from aegis.common.commands.agent_commands import (
     END_TURN,
     MOVE,
+    MOVE_PLAN,
     OBSERVE,
+    OBSERVE_AREA,
     SAVE_SURV,
     SEND_MESSAGE,
     SLEEP,
@@ -37,15 +51,17 @@ from aegis.common.commands.aegis_commands import (
     DEATH_CARD,
     DISCONNECT,
     FWD_MESSAGE,
+    MOVE_PLAN_RESULT,
     MOVE_RESULT,
+    OBSERVE_AREA_RESULT,
     OBSERVE_RESULT,
     ROUND_END,
-    ROUND_START,
     SAVE_SURV_RESULT,
     SLEEP_RESULT,
     TEAM_DIG_RESULT,
 )
 from aegis.common.network.aegis_socket_exception import AegisSocketException
+from aegis.common.world.agent import Agent
 from aegis.common.world.grid import Grid
 from aegis.common.world.info.grid_info import GridInfo
 from aegis.common.world.objects import Rubble, Survivor, SurvivorGroup, WorldObject
@@ -53,30 +69,53 @@ from aegis.parsers.config_parser import ConfigParser
 from aegis.parsers.world_file_parser import WorldFileParser
 from aegis.server_websocket import WebSocketServer
 from aegis.world.aegis_world import AegisWorld
+from agent.brain import Brain
 
 
 class Aegis:
-    def __init__(self) -> None:
+    def __init__(self, transport: AgentTransport | None = None) -> None:
+        """
+        Args:
+            transport: The transport to drive the agent sockets with, shared with the
+                other sessions in the process. None to give AEGIS its own.
+        """
         self._parameters = Parameters()
+        self._agent_handler = AgentHandler(transport)
+        self._aegis_world = AegisWorld()
+        self._ws_server: WebSocketServer | None = WebSocketServer()
+        self._replay_writer = ReplayFileWriter()
+        self._output_worker: OutputWorker | None = None
+        self._command_log: CommandLogWriter | None = None
+        self._match = 1
+        self._session_id: str | None = None
+        self._init_match_state()
+
+    def _init_match_state(self) -> None:
+        self._match_finished = False
         self._state = State.NONE
         self._started_idling = -1
         self._end = False
-        self._agent_handler = AgentHandler()
         self._agent_commands: list[AgentCommand] = []
+        self._round_commands: dict[AgentID, AgentCommand] = {}
+        self._round_messages: dict[AgentID, list[SEND_MESSAGE]] = {}
         self._command_records: list[str] = []
         self._TEAM_DIG_list: list[TEAM_DIG] = []
         self._SAVE_SURV_list: list[SAVE_SURV] = []
         self._MOVE_list: list[MOVE] = []
         self._SLEEP_list: list[SLEEP] = []
         self._OBSERVE_list: list[OBSERVE] = []
+        self._OBSERVE_AREA_list: list[OBSERVE_AREA] = []
         self._TEAM_DIG_RESULT_list = AgentIDList()
         self._SAVE_SURV_RESULT_list = AgentIDList()
         self._MOVE_RESULT_list = AgentIDList()
         self._SLEEP_RESULT_list = AgentIDList()
         self._OBSERVE_RESULT_list: list[OBSERVE] = []
+        self._OBSERVE_AREA_RESULT_list: list[tuple[AgentID, Location, int, int]] = []
         self._crashed_agents = AgentIDList()
-        self._aegis_world = AegisWorld()
-        self._ws_server = WebSocketServer()
+        self._round = 0
+        self._round_agent_ids: list[AgentID] = []
+        self._move_plans: dict[AgentID, MovePlan] = {}
+        self._planned_moves: dict[AgentID, MOVE] = {}
 
     def read_command_line(self, args: list[str]) -> bool:
         try:
@@ -88,6 +127,18 @@ class Aegis:
                 ("WorldFile", CommandLineReader.STRING, True),
                 ("NumRound", CommandLineReader.INT, True),
                 ("WaitForClient", CommandLineReader.BOOL, False),
+                ("Headless", CommandLineReader.BOOL, False),
+                ("Repeat", CommandLineReader.INT, False),
+                ("Seeds", CommandLineReader.STRING, False),
+                ("Sessions", CommandLineReader.INT, False),
+                ("Port", CommandLineReader.INT, False),
+                ("WsPort", CommandLineReader.INT, False),
+                ("RunDir", CommandLineReader.STRING, False),
+                ("ConnectTimeout", CommandLineReader.INT, False),
+                ("Backlog", CommandLineReader.INT, False),
+                ("OutputQueue", CommandLineReader.INT, False),
+                ("CommandLog", CommandLineReader.STRING, False),
+                ("Resimulate", CommandLineReader.STRING, False),
             ]
 
             for name, value_type, is_required in options:
@@ -101,11 +152,13 @@ class Aegis:
             if not command_line_reader.read_cmd_line_args(args):
                 return False
 
+            wait_for_client = False
+
             for name, value_type, _ in options:
                 option = command_line_reader.get_option(name)
                 if option and option.is_set and option.value:
                     if name == "NoKViewer":
-                        self._parameters.number_of_agents = 1
+                        self._parameters.number_of_agents = int(option.value)
                     elif name == "ProcFile":
                         self._parameters.replay_filename = str(option.value)
                     elif name == "WorldFile":
@@ -113,7 +166,57 @@ class Aegis:
                     elif name == "NumRound":
                         self._parameters.number_of_rounds = int(option.value)
                     elif name == "WaitForClient":
-                        self._ws_server.set_wait_for_client(bool(option.value))
+                        wait_for_client = bool(option.value)
+                    elif name == "Headless":
+                        self._parameters.headless = bool(option.value)
+                    elif name == "Repeat":
+                        self._parameters.number_of_repeats = int(option.value)
+                    elif name == "Seeds":
+                        self._parameters.random_seeds = [
+                            int(seed) for seed in str(option.value).split(",")
+                        ]
+                    elif name == "Sessions":
+                        self._parameters.number_of_sessions = int(option.value)
+                    elif name == "WsPort":
+                        self._parameters.websocket_port = int(option.value)
+                    elif name == "RunDir":
+                        self._parameters.run_directory = str(option.value)
+                    elif name == "ConnectTimeout":
+                        self._parameters.milliseconds_to_wait_for_agents = int(
+                            option.value
+                        )
+                    elif name == "Backlog":
+                        self._parameters.listen_backlog = int(option.value)
+                    elif name == "CommandLog":
+                        self._parameters.command_log_filename = str(option.value)
+                    elif name == "Resimulate":
+                        self._parameters.resimulate_filename = str(option.value)
+
+            # 0 is a valid port, it asks for a free one
+            port_option = command_line_reader.get_option("Port")
+            if port_option and port_option.is_set and port_option.value is not None:
+                self._parameters.agent_port = int(port_option.value)
+
+            # 0 is a valid output queue size, it writes the output in the simulation
+            output_queue_option = command_line_reader.get_option("OutputQueue")
+            if (
+                output_queue_option
+                and output_queue_option.is_set
+                and output_queue_option.value is not None
+            ):
+                self._parameters.output_queue_size = int(output_queue_option.value)
+
+            self._aegis_world.set_agent_world_file(
+                self._get_run_path("WorldInfoFile.out")
+            )
+
+            if self._parameters.headless:
+                if wait_for_client:
+                    print("Aegis  : Running headless, not waiting for a client.")
+                self._ws_server = None
+            elif self._ws_server is not None:
+                self._ws_server.set_wait_for_client(wait_for_client)
+                self._ws_server.set_port(self._parameters.websocket_port)
 
             return True
         except Exception:
@@ -133,20 +236,61 @@ class Aegis:
         s += "\t                          build the world from upon startup.\n"
         s += "\t-NumRound <#>        = Set number of rounds in simulation."
         s += "\t-WaitForClient <bool> = Set to true to wait for client to connect."
+        s += "\t-Headless <bool>      = Set to true to run without building any\n"
+        s += "\t                          events for the viewer.\n"
+        s += "\t                          Not required, default false.\n"
+        s += "\t-Repeat <#>          = Run the simulation the indicated number of\n"
+        s += "\t                          times (for each seed) in this process.\n"
+        s += "\t                          Not required, default 1.\n"
+        s += "\t-Seeds <#,#,...>     = Run the simulation once for each of the\n"
+        s += "\t                          seeds, instead of the world file's seed.\n"
+        s += "\t                          Not required.\n"
+        s += "\t-Sessions <#>        = Run the indicated number of simulations at\n"
+        s += "\t                          the same time, headless, agents pick one\n"
+        s += "\t                          with AEGIS_SESSION. Not required, default 1.\n"
+        s += "\t-Port <#>            = Set the port agents connect to, 0 to use\n"
+        s += "\t                          any free port. Not required, default 6001.\n"
+        s += "\t-WsPort <#>          = Set the port the viewer connects to.\n"
+        s += "\t                          Not required, default 6003.\n"
+        s += "\t-RunDir <dir>        = Write the replay, agent world and agent port\n"
+        s += "\t                          files of this run to the directory.\n"
+        s += "\t                          Not required, default the working directory.\n"
+        s += "\t-ConnectTimeout <ms> = Set the time all agents have to connect.\n"
+        s += "\t                          Not required, default 60000.\n"
+        s += "\t-Backlog <#>         = Set the number of agents that can wait to be\n"
+        s += "\t                          accepted. Not required, default 128.\n"
+        s += "\t-OutputQueue <#>     = Set the number of output writes that can wait\n"
+        s += "\t                          for the background writer, 0 to write them\n"
+        s += "\t                          during the round. Not required, default 256.\n"
+        s += "\t-CommandLog <file>   = Write the commands the agents send to the file,\n"
+        s += "\t                          to run the simulation again with -Resimulate.\n"
+        s += "\t                          Not required.\n"
+        s += "\t-Resimulate <file>   = Run the simulation again from a command log,\n"
+        s += "\t                          with its seed and config, without agents.\n"
+        s += "\t                          Not required.\n"
         return s
 
-    def start_up(self) -> bool:
+    def start_up(self, listen: bool = True) -> bool:
+        """
+        Args:
+            listen: Whether to open the agent port, False when a `SessionServer`
+                accepts the agents for AEGIS.
+        """
         try:
-            self._agent_handler.set_agent_handler_port(Constants.AGENT_PORT)
-            if not ReplayFileWriter.open_replay_file(
-                self._parameters.replay_filename, self._parameters.world_filename
-            ):
-                print(
-                    f"Aegis  : Could not open protocol file: {self._parameters.replay_filename}",
-                    file=sys.stderr,
+            if self._parameters.run_directory is not None:
+                os.makedirs(self._parameters.run_directory, exist_ok=True)
+            if listen:
+                self.report_agent_port(
+                    self._agent_handler.set_agent_handler_port(
+                        self._parameters.agent_port, self._parameters.listen_backlog
+                    )
                 )
+            if self._parameters.output_queue_size > 0:
+                self._output_worker = self._replay_writer.start_output_worker(
+                    self._parameters.output_queue_size
+                )
+            if not self._open_replay_file():
                 return False
-            print(f"Aegis  : Protocol file is: {self._parameters.replay_filename}")
         except AegisSocketException:
             print("Aegis  : Could not open agent port.", file=sys.stderr)
             return False
@@ -200,46 +344,247 @@ class Aegis:
         self._started_idling = 0
         return True
 
+    def _open_replay_file(self) -> bool:
+        replay_filename = self._get_replay_filename()
+        if not self._replay_writer.open_replay_file(
+            replay_filename, self._parameters.world_filename
+        ):
+            print(
+                f"Aegis  : Could not open protocol file: {replay_filename}",
+                file=sys.stderr,
+            )
+            return False
+        print(f"Aegis  : Protocol file is: {replay_filename}")
+        return True
+
+    def _get_replay_filename(self) -> str:
+        return self._get_match_filename(self._parameters.replay_filename)
+
+    def _get_match_filename(self, filename: str) -> str:
+        """Returns the path of an output file of this simulation, named after its session or match."""
+        root, ext = os.path.splitext(filename)
+        if self._session_id is not None:
+            return self._get_run_path(f"{root}_{self._session_id}{ext}")
+        if len(self.get_match_seeds()) == 1:
+            return self._get_run_path(filename)
+        return self._get_run_path(f"{root}_{self._match}{ext}")
+
+    def _open_command_log(self) -> None:
+        if self._parameters.command_log_filename is None:
+            return
+        command_log_filename = self._get_match_filename(
+            self._parameters.command_log_filename
+        )
+        try:
+            self._command_log = CommandLogWriter(command_log_filename)
+        except OSError:
+            print(
+                f"Aegis  : Could not open command log: {command_log_filename}",
+                file=sys.stderr,
+            )
+            return
+
+        self._command_log.write_start(
+            self._parameters.world_filename,
+            self._aegis_world.get_random_seed(),
+            self._parameters.number_of_rounds,
+            self._parameters.config_settings,
+        )
+        for agent in self._agent_handler.agent_list:
+            group = self._agent_handler.get_agent_group(agent.agent_id.gid)
+            if group is not None:
+                self._command_log.write_agent(agent.agent_id, group.name)
+        print(f"Aegis  : Command log is: {command_log_filename}")
+
+    def _get_run_path(self, filename: str) -> str:
+        if self._parameters.run_directory is None:
+            return filename
+        return os.path.join(self._parameters.run_directory, filename)
+
+    def get_agent_port(self) -> int:
+        """Returns the port agents connect to, 0 for any free port."""
+        return self._parameters.agent_port
+
+    def report_agent_port(self, port: int) -> None:
+        """
+        Tells the agents' launcher which port AEGIS listens on, by writing it to
+        the agent port file in the run directory.
+
+        Args:
+            port: The port the agent server socket listens on.
+        """
+        print(f"Aegis  : Agent port is: {port}")
+        if self._parameters.run_directory is None:
+            return
+        port_filename = self._get_run_path(Constants.AGENT_PORT_FILE)
+        # written under another name first, a launcher never reads half a port
+        with open(f"{port_filename}.tmp", "w") as port_file:
+            _ = port_file.write(f"{port}\n")
+        os.replace(f"{port_filename}.tmp", port_filename)
+
+    def get_number_of_sessions(self) -> int:
+        return self._parameters.number_of_sessions
+
+    def get_number_of_agents(self) -> int:
+        """Returns the number of agents the simulation waits for."""
+        return self._parameters.number_of_agents
+
+    def get_connect_timeout(self) -> float:
+        """Returns the time in seconds all agents have to connect."""
+        return self._parameters.milliseconds_to_wait_for_agents / 1000
+
+    def get_handshake_timeout(self) -> float:
+        """Returns the time in seconds an agent has to send its CONNECT once accepted."""
+        return self._parameters.milliseconds_to_wait_for_agent_connect / 1000
+
+    def get_listen_backlog(self) -> int:
+        return self._parameters.listen_backlog
+
+    def set_session(self, session_id: str) -> None:
+        """
+        Makes AEGIS one of several sessions running in the process.
+
+        The session runs headless and writes its own replay and agent world files,
+        named after the session. Call it before starting up.
+
+        Args:
+            session_id: The ID agents connect to the session with.
+        """
+        self._session_id = session_id
+        self._ws_server = None
+        self._aegis_world.set_agent_world_file(
+            self._get_run_path(f"WorldInfoFile_{session_id}.out")
+        )
+
+    def get_match_seeds(self) -> list[int | None]:
+        """
+        Returns the random seed of each simulation to run, None for the world file's seed.
+        """
+        seeds: list[int | None] = [None]
+        if self._parameters.random_seeds:
+            seeds = list(self._parameters.random_seeds)
+        return [seed for seed in seeds for _ in range(self._parameters.number_of_repeats)]
+
     def build_world(self) -> bool:
         return self._aegis_world.build_world_from_file(
-            self._parameters.world_filename, self._ws_server
+            self._parameters.world_filename,
+            self._ws_server,
+            self.get_match_seeds()[0],
         )
 
+    def reset(self, random_seed: int | None = None) -> bool:
+        """
+        Ends the current simulation and gets ready for the next one in this process.
+
+        The agents are disconnected, the world is restored from the world file that
+        was already read, and the next replay file is opened. The server socket stays open.
+        Only the first simulation is shown by the viewer, the ones after it run headless.
+
+        Args:
+            random_seed: The seed for the next simulation, None to use the world file's seed.
+
+        Returns:
+            True if AEGIS is ready to connect agents again.
+        """
+        self._finish_match()
+        self._agent_handler.reset()
+        self._ws_server = None
+        self._match += 1
+        self._init_match_state()
+
+        if not self._open_replay_file():
+            return False
+        if not self._aegis_world.reset(random_seed):
+            return False
+
+        self._state = State.IDLE
+        self._started_idling = 0
+        return True
+
     def shutdown(self) -> None:
+        self._finish_match()
+        self._agent_handler.shutdown()
+
+    def _finish_match(self) -> None:
+        if self._match_finished:
+            return
+        self._match_finished = True
         try:
             self._agent_handler.print_group_survivor_saves()
             self._agent_handler.send_message_to_all(DISCONNECT())
-            self._agent_handler.shutdown()
 
-            ReplayFileWriter.write_string(
+            self._replay_writer.write_string(
                 f"MSG;System Run ended on: {datetime.now()}\n"
             )
-            ReplayFileWriter.write_string("MSG;Kernel Shutting Down;\n")
-            ReplayFileWriter.close_replay_file()
+            self._replay_writer.write_string("MSG;Kernel Shutting Down;\n")
+            self._replay_writer.close_replay_file()
         except AgentCrashedException:
             pass
+        if self._command_log is not None:
+            self._command_log.close()
+            self._command_log = None
 
     def connect_all_agents(self) -> None:
-        connected: bool = False
-        count: int = 0
-        for _ in range(self._parameters.number_of_agents):
-            for _ in range(5):
-                connected = self._connect_agent(
-                    self._parameters.milliseconds_to_wait_for_agent_connect
-                )
-                if connected:
-                    count += 1
-                    break
+        count = self._agent_handler.connect_agents(
+            self._parameters.number_of_agents,
+            self.get_connect_timeout(),
+            self.get_handshake_timeout(),
+            self._add_connected_agent,
+        )
+        self._agent_handler.flush_messages()
         print(
             f"Aegis  : {count} out of {self._parameters.number_of_agents} agents connected to AEGIS."
         )
         self._state = State.RUN_SIMULATION
 
+    def add_local_agent(self, brain: Brain, group_name: str = "test") -> bool:
+        """
+        Adds an agent whose brain runs inside AEGIS, without a socket or its own process.
+
+        Call it after building the world and before running the simulation.
+
+        Args:
+            brain: The agent's brain.
+            group_name: The group the agent joins.
+
+        Returns:
+            True if the agent was added to the world.
+
+        Raises:
+            ValueError: If the brain holds the base agent of another agent.
+        """
+        agent_id = self._agent_handler.add_agent(group_name, LocalAgentSocket(brain))
+        return self._add_connected_agent(agent_id)
+
+    def add_connected_agent(self, group_name: str, agent_socket: AgentSocket) -> bool:
+        """
+        Adds an agent that connected to the `SessionServer` over TCP.
+
+        Args:
+            group_name: The group the agent joins.
+            agent_socket: The agent's connection, its CONNECT already read.
+
+        Returns:
+            True if the agent was added to the world.
+        """
+        agent_id = self._agent_handler.accept_agent(group_name, agent_socket)
+        return self._add_connected_agent(agent_id)
+
+    def start_running(self) -> None:
+        """Stops waiting for agents, used when the agents were added without `connect_all_agents`."""
+        self._agent_handler.flush_messages()
+        print(
+            f"Aegis  : {self._agent_handler.get_number_of_agents()} out of {self._parameters.number_of_agents} agents connected to AEGIS."
+        )
+        self._state = State.RUN_SIMULATION
+
     def _connect_agent(self, timeout: int) -> bool:
         agent_id = self._agent_handler.connect_to_agent(timeout)
         if agent_id is None:
             return False
+        return self._add_connected_agent(agent_id)
 
+    def _add_connected_agent(self, agent_id: AgentID) -> bool:
         try:
             self._aegis_world.add_agent_by_id(agent_id)
             agent = self._aegis_world.get_agent(agent_id)
@@ -255,7 +600,7 @@ class Aegis:
                     self._aegis_world.get_agent_world_filename(),
                 ),
             )
-            ReplayFileWriter.write_string(
+            self._replay_writer.write_string(
                 f"ADD_AGT; Info(ID {agent.agent_id.id}, GID {agent.agent_id.gid}, Eng {agent.get_energy_level()}):Loc(X {agent.location.x}, Y {agent.location.y});\n"
             )
             return True
@@ -265,13 +610,16 @@ class Aegis:
     def _end_simulation(self) -> None:
         print("Aegis  : Simulation Over.")
 
-        game_over_data = {"event_type": "SimulationComplete"}
-        event = json.dumps(game_over_data).encode()
-        self._compress_and_send(event)
+        if self._ws_server is not None:
+            game_over_data = {"event_type": "SimulationComplete"}
+            self._send_event(game_over_data)
 
         self._state = State.SHUT_DOWN
         self._end = True
-        self._ws_server.finish()
+        if self._output_worker is not None:
+            self._output_worker.drain()
+        if self._ws_server is not None:
+            self._ws_server.finish()
 
     def run_state(self) -> None:
         match self._state:
@@ -297,178 +645,362 @@ class Aegis:
                 pass
 
     def _run_simulation(self) -> None:
-        self._ws_server.start()
+        if not self.start_simulation():
+            return
+
+        while self.start_round():
+            self._agent_handler.wait_for_agent_commands()
+            self.end_round()
+
+    def is_resimulating(self) -> bool:
+        """Returns whether AEGIS runs a simulation again from a command log instead of with agents."""
+        return self._parameters.resimulate_filename is not None
+
+    def resimulate(self) -> bool:
+        """
+        Runs a simulation again from the command log given with -Resimulate, see
+        `CommandLogWriter`.
+
+        The world is built with the logged seed, number of rounds and config settings
+        and the logged agents are added without sockets. Every round, the logged commands are
+        received as if the agents had just sent them, and go through the same
+        handling as a live round, so nothing waits on agents. Call it after starting up.
+
+        Returns:
+            False if the log can't be read, was written for another world file or its
+            agents can't be added.
+        """
+        filename = self._parameters.resimulate_filename
+        if filename is None:
+            return False
+        try:
+            command_log = CommandLog.read(filename)
+        except (OSError, ValueError, KeyError, TypeError):
+            print(
+                f'Aegis  : Unable to read command log from "{filename}"',
+                file=sys.stderr,
+            )
+            return False
+
+        if not self._is_logged_world_file(command_log.world_filename):
+            print(
+                f"Aegis  : The command log was written for world file {command_log.world_filename}, not {self._parameters.world_filename}.",
+                file=sys.stderr,
+            )
+            return False
+        self._parameters.random_seeds = [command_log.random_seed]
+        self._parameters.number_of_rounds = command_log.number_of_rounds
+        if command_log.config_settings is not None:
+            self._parameters.config_settings = command_log.config_settings
+            self._agent_handler.send_messages_to_all_groups = (
+                command_log.config_settings.send_messages_to_all_groups
+            )
+        if not self.build_world():
+            print("Aegis  : Error building world.")
+            return False
+
+        for agent_id, group_name in command_log.agents:
+            if self._agent_handler.add_agent(
+                group_name, None
+            ) != agent_id or not self._add_connected_agent(agent_id):
+                print(
+                    f"Aegis  : Unable to add agent {agent_id} from the command log.",
+                    file=sys.stderr,
+                )
+                return False
+        self.start_running()
+
+        if not self.start_simulation():
+            return True
+        while self.start_round():
+            for command in command_log.get_commands(self._round):
+                _ = self._receive_agent_command(command)
+            self._crashed_agents.add_all(command_log.get_crashed_agents(self._round))
+            self.end_round()
+        return True
+
+    def _is_logged_world_file(self, logged_world_filename: str) -> bool:
+        """
+        Returns whether a command log was written for the world file AEGIS runs, by
+        their paths, or only by their names if the logged path isn't found here.
+        """
+        world_filename = self._parameters.world_filename
+        if os.path.exists(logged_world_filename):
+            return os.path.samefile(logged_world_filename, world_filename)
+        return os.path.basename(logged_world_filename) == os.path.basename(
+            world_filename
+        )
+
+    def start_simulation(self) -> bool:
+        """
+        Starts the simulation with the agents that are connected.
+
+        Returns:
+            False if the simulation ended right away.
+        """
+        if self._ws_server is not None:
+            self._ws_server.start()
         print("Aegis  : Running simulation.")
 
         if self._agent_handler.get_number_of_agents() == 0:
             print("Aegis  : No Agents Connected to Aegis!")
-            ReplayFileWriter.write_string("MSG;No Agents Connected to the Kernel;\n")
+            self._replay_writer.write_string("MSG;No Agents Connected to the Kernel;\n")
             self._end_simulation()
-            return
+            return False
 
-        ReplayFileWriter.write_string(
+        self._open_command_log()
+        self._replay_writer.write_string(
             f"#\nWorld File Used : {self._parameters.world_filename};\n"
         )
-        ReplayFileWriter.write_string(
+        self._replay_writer.write_string(
             f"Simulation Start: Number of Rounds {self._parameters.number_of_rounds};\n"
         )
+        # the digests of every grid to start from, the rounds only list the ones that change
+        self._replay_writer.write_string(
+            self._aegis_world.state_digest_message(all_grids=True)
+        )
         print(f"Running for {self._parameters.number_of_rounds} rounds\n")
         print("================================================")
         _ = sys.stdout.flush()
 
-        after_json_world = self.get_aegis_world().convert_to_json()
+        self._round = 0
+        self._send_round_event(0)
+        return True
 
-        round_data = {
-            "event_type": "Round",
-            "round": 0,
-            "after_world": after_json_world,
-        }
-        event = json.dumps(round_data).encode()
-        self._compress_and_send(event)
+    def start_round(self) -> bool:
+        """
+        Starts the next round: sends the agents their messages, the results of their
+        last commands and ROUND_START, and starts reading their commands.
 
-        for round in range(1, self._parameters.number_of_rounds + 1):
-            if self._end:
-                break
+        Agents following a move plan are not sent anything and not waited for, their
+        next move is made for them. If every agent follows a plan, the round is ready
+        right away.
 
-            self._aegis_world.round = round
+        The round is finished by `end_round` once `is_round_ready` returns True.
 
-            if self._state == State.SHUT_DOWN:
-                print("Aegis  : AEGIS has shutdown.")
-                self._end_simulation()
-                return
+        Returns:
+            False if the simulation is over.
+        """
+        if self._end:
+            return False
 
-            if self._agent_handler.get_number_of_agents() <= 0:
-                print("Aegis  : All Agents are Dead !!!")
-                ReplayFileWriter.write_string("MSG;All Agents are Dead !!;\n")
-                self._end_simulation()
-                return
+        round = self._round + 1
+        if round > self._parameters.number_of_rounds:
+            self._replay_writer.write_string("Simulation_Over;\n")
+            self._end_simulation()
+            return False
 
-            survivors_saved = self._aegis_world.get_total_saved_survivors()
-            total_survivors = self._aegis_world.get_num_survivors()
+        self._round = round
+        self._aegis_world.round = round
 
-            if survivors_saved == total_survivors:
-                print("Aegis  : All Survivors Saved")
-                ReplayFileWriter.write_string("MSG;All Survivors Saved !!;\n")
-                self._end_simulation()
-                return
+        if self._state == State.SHUT_DOWN:
+            print("Aegis  : AEGIS has shutdown.")
+            self._end_simulation()
+            return False
 
-            ReplayFileWriter.write_string(f"RS;{round};\n")
+        if self._agent_handler.get_number_of_agents() <= 0:
+            print("Aegis  : All Agents are Dead !!!")
+            self._replay_writer.write_string("MSG;All Agents are Dead !!;\n")
+            self._end_simulation()
+            return False
 
-            self._run_agent_round()
-            for command in self._agent_commands:
-                self._handle_agent_command(command)
-            self._agent_commands.clear()
+        survivors_saved = self._aegis_world.get_total_saved_survivors()
+        total_survivors = self._aegis_world.get_num_survivors()
 
-            agent_commands_message = "Agent_Cmds;{"
-            if len(self._command_records) == 0:
-                agent_commands_message += "None"
-            else:
-                agent_commands_message += "$".join(
-                    f"[{record}]" for record in self._command_records
-                )
-            self._command_records.clear()
-            agent_commands_message += "}\n"
-            ReplayFileWriter.write_string(agent_commands_message)
-
-            self._process_commands()
-            self._create_results()
-            self._run_simulators()
-            self._grim_reaper()
-            self._agent_handler.empty_forward_messages()
-            ReplayFileWriter.write_string("RE;\n")
-            after_json_world = self.get_aegis_world().convert_to_json()
-
-            round_data = {
-                "event_type": "Round",
-                "round": round,
-                "after_world": after_json_world,
-            }
-            event = json.dumps(round_data).encode()
-            self._compress_and_send(event)
+        if survivors_saved == total_survivors:
+            print("Aegis  : All Survivors Saved")
+            self._replay_writer.write_string("MSG;All Survivors Saved !!;\n")
+            self._end_simulation()
+            return False
 
-        ReplayFileWriter.write_string("Simulation_Over;\n")
-        self._end_simulation()
+        self._replay_writer.write_string(f"RS;{round};\n")
 
-    def _run_agent_round(self) -> None:
-        self._agent_handler.reset_current_agent()
-        num_of_agents = self._agent_handler.get_number_of_agents()
+        agent_ids = [agent.agent_id for agent in self._agent_handler.agent_list]
+        self._round_agent_ids = []
+        thinking_agent_ids: list[AgentID] = []
 
-        for _ in range(num_of_agents):
-            try:
-                self._agent_handler.send_forward_messages_to_current()
-                self._agent_handler.send_result_of_command_to_current()
-                self._agent_handler.send_message_to_current(ROUND_START())
+        for agent_id in agent_ids:
+            if agent_id in self._move_plans:
+                move = self._next_planned_move(agent_id, round)
+                if move is not None:
+                    self._planned_moves[agent_id] = move
+                    self._round_agent_ids.append(agent_id)
+                    continue
 
-                command = self._get_agent_command_of_current()
-                if command is not None:
-                    self._agent_commands.append(command)
-                else:
-                    if self._parameters.config_settings is not None:
-                        current_agent = self._agent_handler.get_current_agent()
-                        if (
-                            self._parameters.config_settings.handling_messages
-                            == ConfigSettings.SEND_MESSAGES_AND_PERFORM_ACTION
-                        ):
-                            print(
-                                f"Agent {current_agent.agent_id} sent no action (non-send) command this round."
-                            )
-                        else:
-                            print(
-                                f"Agent {current_agent.agent_id} sent no command this round."
-                            )
-
-                self._agent_handler.send_message_to_current(ROUND_END())
-                self._agent_handler.move_to_next_agent()
+            try:
+                self._agent_handler.send_round_start_to(agent_id)
+                self._round_agent_ids.append(agent_id)
+                thinking_agent_ids.append(agent_id)
             except AgentCrashedException:
-                crashed_agent_id = self._agent_handler.get_current_agent().agent_id
-                self._crashed_agents.add(crashed_agent_id)
-            _ = sys.stdout.flush()
+                self._crashed_agents.add(agent_id)
+
+        self._agent_handler.start_reading_agent_commands(
+            thinking_agent_ids,
+            self._parameters.milliseconds_to_wait_for_agent_command,
+            self._receive_agent_command,
+        )
+        return True
 
-    def _get_agent_command_of_current(self) -> AgentCommand | None:
-        timeout: int = self._parameters.milliseconds_to_wait_for_agent_command
-        initial_time_ms: int = time.time_ns() // 1_000_000
-        last_command: AgentCommand | None = None
+    def is_round_ready(self) -> bool:
+        """Returns whether every agent ended its turn or the round's time is up."""
+        return self._agent_handler.is_done_reading_agent_commands()
 
-        while True:
-            elapsed_time_ms: int = time.time_ns() // 1_000_000 - initial_time_ms
-            if elapsed_time_ms > timeout:
-                break
+    def get_round_deadline(self) -> float:
+        """Returns the `time.monotonic` time the round's time is up at."""
+        return self._agent_handler.get_read_deadline()
 
-            remaining_time_ms: int = max(0, timeout - elapsed_time_ms)
-            if remaining_time_ms == 0:
-                break
+    def end_round(self) -> None:
+        """Applies the commands the agents sent this round and runs the world for the round."""
+        self._end_agent_round()
+        for command in self._agent_commands:
+            self._handle_agent_command(command)
+        self._agent_commands.clear()
 
-            try:
-                temp_command = self._agent_handler.get_agent_command_of_current(
-                    remaining_time_ms
-                )
-            except AgentCrashedException:
-                crashed_agent_id = self._agent_handler.get_current_agent().agent_id
-                self._crashed_agents.add(crashed_agent_id)
-                print(f"Agent {crashed_agent_id} has crashed.")
-                return None
+        self._replay_writer.write_later(
+            functools.partial(self._agent_commands_message, self._command_records)
+        )
+        self._command_records = []
+
+        self._process_commands()
+        self._create_results()
+        self._run_simulators()
+        self._grim_reaper()
+        self._agent_handler.empty_forward_messages()
+        self._replay_writer.write_string(self._aegis_world.state_digest_message())
+        self._replay_writer.write_string("RE;\n")
+        if self._command_log is not None:
+            self._command_log.end_round(self._round)
+        self._send_round_event(self._round)
+
+    @staticmethod
+    def _agent_commands_message(command_records: list[str]) -> str:
+        agent_commands_message = "Agent_Cmds;{"
+        if len(command_records) == 0:
+            agent_commands_message += "None"
+        else:
+            agent_commands_message += "$".join(
+                f"[{record}]" for record in command_records
+            )
+        agent_commands_message += "}\n"
+        return agent_commands_message
+
+    def _end_agent_round(self) -> None:
+        round_agent_ids = self._round_agent_ids
 
-            if temp_command is None:
+        planned_moves = self._planned_moves
+        self._planned_moves = {}
+
+        # Commands are applied in agent order, no matter the order they arrived in
+        for agent_id in round_agent_ids:
+            planned_move = planned_moves.get(agent_id)
+            if planned_move is not None:
+                self._agent_commands.append(planned_move)
                 continue
 
-            if isinstance(temp_command, END_TURN) or isinstance(
-                temp_command, AGENT_UNKNOWN
-            ):
-                break
+            for send_message in self._round_messages.pop(agent_id, []):
+                self._handle_agent_command(send_message)
 
-            if isinstance(temp_command, SEND_MESSAGE):
-                if self._parameters.config_settings is not None:
-                    if (
-                        self._parameters.config_settings.handling_messages
-                        == ConfigSettings.SEND_MESSAGES_AND_PERFORM_ACTION
-                    ):
-                        self._handle_agent_command(temp_command)
-                    else:
-                        last_command = temp_command
+            command = self._round_commands.pop(agent_id, None)
+            if isinstance(command, MOVE_PLAN):
+                # the first move is made this round, the agent thinks again next round
+                # if the plan ends before that
+                self._move_plans[agent_id] = MovePlan(command, self._round)
+                command = self._next_planned_move(agent_id, self._round + 1)
+                if command is not None:
+                    self._agent_commands.append(command)
+            elif command is not None:
+                self._agent_commands.append(command)
+            elif self._parameters.config_settings is not None:
+                if (
+                    self._parameters.config_settings.handling_messages
+                    == ConfigSettings.SEND_MESSAGES_AND_PERFORM_ACTION
+                ):
+                    print(
+                        f"Agent {agent_id} sent no action (non-send) command this round."
+                    )
+                else:
+                    print(f"Agent {agent_id} sent no command this round.")
+
+        for agent_id in round_agent_ids:
+            if agent_id in planned_moves:
+                continue
+            try:
+                self._agent_handler.send_message_to(agent_id, ROUND_END())
+            except AgentCrashedException:
+                self._crashed_agents.add(agent_id)
+        self._agent_handler.flush_messages()
+        _ = sys.stdout.flush()
+
+    def _next_planned_move(self, agent_id: AgentID, wake_round: int) -> MOVE | None:
+        """
+        Returns the next move of an agent's move plan, or ends the plan.
+
+        A plan ends once all of its moves are made, the agent has messages to read,
+        the next move is off the world or onto a grid that kills the agent, or the
+        next move would leave the agent with less than the plan's minimum energy.
+        The agent is then sent a MOVE_PLAN_RESULT when it thinks again.
+
+        Args:
+            agent_id: The agent following the plan.
+            wake_round: The round the agent thinks in again if the plan ends.
+
+        Returns:
+            The move to make this round, None if the plan ended.
+        """
+        plan = self._move_plans[agent_id]
+        agent = self._aegis_world.get_agent(agent_id)
+        if agent is None:
+            del self._move_plans[agent_id]
+            return None
+
+        direction = plan.peek_direction()
+        if direction is None:
+            result = MOVE_PLAN_RESULT.COMPLETED
+        elif self._agent_handler.has_forward_messages(agent_id):
+            result = MOVE_PLAN_RESULT.MESSAGE
+        else:
+            dest_grid = self._aegis_world.get_grid_at(agent.location.add(direction))
+            if dest_grid is None or dest_grid.is_on_fire() or dest_grid.is_killer():
+                result = MOVE_PLAN_RESULT.DANGER
+            elif agent.get_energy_level() - (
+                dest_grid.move_cost
+                if direction != Direction.CENTER
+                else self._parameters.MOVE_ENERGY_COST
+            ) < plan.min_energy:
+                result = MOVE_PLAN_RESULT.LOW_ENERGY
             else:
-                last_command = temp_command
+                move = MOVE(plan.pop_direction())
+                move.set_agent_id(agent_id)
+                return move
+
+        del self._move_plans[agent_id]
+        self._agent_handler.set_result_of_plan(
+            agent_id,
+            MOVE_PLAN_RESULT(
+                result, plan.moves_left(), wake_round - plan.start_round - 1
+            ),
+        )
+        return None
 
-        return last_command
+    def _receive_agent_command(self, command: AgentCommand) -> bool:
+        if isinstance(command, END_TURN) or isinstance(command, AGENT_UNKNOWN):
+            return True
+
+        if self._command_log is not None:
+            self._command_log.add_command(command)
+        agent_id = command.get_agent_id()
+        if isinstance(command, SEND_MESSAGE):
+            if self._parameters.config_settings is not None:
+                if (
+                    self._parameters.config_settings.handling_messages
+                    == ConfigSettings.SEND_MESSAGES_AND_PERFORM_ACTION
+                ):
+                    self._round_messages.setdefault(agent_id, []).append(command)
+                else:
+                    self._round_commands[agent_id] = command
+        else:
+            self._round_commands[agent_id] = command
+        return False
 
     def _handle_agent_command(self, command: AgentCommand) -> None:
         self._command_records.append(command.proc_string())
@@ -487,6 +1019,8 @@ class Aegis:
             self._SLEEP_list.append(command)
         elif isinstance(command, OBSERVE):
             self._OBSERVE_list.append(command)
+        elif isinstance(command, OBSERVE_AREA):
+            self._OBSERVE_AREA_list.append(command)
         elif isinstance(command, SEND_MESSAGE):
             send_message: SEND_MESSAGE = command
             fwd_message = FWD_MESSAGE(
@@ -511,106 +1045,108 @@ class Aegis:
         self._process_MOVE()
         self._process_SLEEP()
         self._process_OBSERVE()
-
-    def _process_TEAM_DIG(self) -> None:
-        temp_agent_list: AgentIDList = AgentIDList()
-        for team_dig in self._TEAM_DIG_list:
-            temp_agent_list.add(team_dig.get_agent_id())
-        self._TEAM_DIG_list.clear()
-
-        temp_grid_agent_list = AgentIDList()
-        while temp_agent_list.size() > 0:
-            temp_grid_agent_list.clear()
-            agent_id = temp_agent_list.remove_at(0)
-            temp_grid_agent_list.add(agent_id)
-
-            agent = self._aegis_world.get_agent(agent_id)
-            if agent is None:
+        self._process_OBSERVE_AREA()
+
+    def _group_agents_by_grid(
+        self, commands: list[TEAM_DIG] | list[SAVE_SURV]
+    ) -> list[tuple[Grid, list[AgentID]]]:
+        """
+        Groups the agents that sent the commands by the grid they are on, in one pass.
+
+        The grids are in the order of the first command sent from them. On every grid
+        the agent that sent that command comes first, followed by the other agents
+        that sent a command in the order they entered the grid.
+
+        Args:
+            commands: The commands, in the order they are handled.
+
+        Returns:
+            Every grid with the agents on it that sent a command.
+        """
+        agents_by_location: dict[Location, list[AgentID]] = {}
+        seen: set[AgentID] = set()
+        for command in commands:
+            agent_id = command.get_agent_id()
+            if agent_id in seen:
                 continue
+            seen.add(agent_id)
 
-            grid = self._aegis_world.get_grid_at(agent.location)
+            agent = self._aegis_world.get_agent(agent_id)
+            if agent is not None:
+                agents_by_location.setdefault(agent.location, []).append(agent_id)
 
+        grids: list[tuple[Grid, list[AgentID]]] = []
+        for location, agent_ids in agents_by_location.items():
+            grid = self._aegis_world.get_grid_at(location)
             if grid is None:
                 continue
 
-            for grid_agent in grid.agent_id_list:
-                if grid_agent in temp_agent_list:
-                    temp_grid_agent_list.add(grid_agent)
-                    temp_agent_list.remove(grid_agent)
+            if len(agent_ids) > 1:
+                others = set(agent_ids[1:])
+                agent_ids = agent_ids[:1] + [
+                    agent_id for agent_id in grid.agent_id_list if agent_id in others
+                ]
+            grids.append((grid, agent_ids))
+        return grids
 
+    def _process_TEAM_DIG(self) -> None:
+        grids = self._group_agents_by_grid(self._TEAM_DIG_list)
+        self._TEAM_DIG_list.clear()
+
+        for grid, grid_agent_ids in grids:
             top_layer = grid.get_top_layer()
             if top_layer is None:
                 self._remove_energy_from_agents(
-                    temp_grid_agent_list, self._parameters.TEAM_DIG_ENERGY_COST
+                    grid_agent_ids, self._parameters.TEAM_DIG_ENERGY_COST
                 )
                 continue
 
             if isinstance(top_layer, Rubble):
-                if top_layer.remove_agents <= temp_grid_agent_list.size():
+                if top_layer.remove_agents <= len(grid_agent_ids):
                     self._aegis_world.remove_layer_from_grid(grid.location)
                     self._remove_energy_from_agents(
-                        temp_grid_agent_list, top_layer.remove_energy
+                        grid_agent_ids, top_layer.remove_energy
                     )
                 else:
                     self._remove_energy_from_agents(
-                        temp_grid_agent_list, self._parameters.TEAM_DIG_ENERGY_COST
+                        grid_agent_ids, self._parameters.TEAM_DIG_ENERGY_COST
                     )
 
-        temp_agent_list.clear()
-
     def _remove_energy_from_agents(
-        self, agent_list: AgentIDList, energy_cost: int
+        self, agent_ids: list[AgentID], energy_cost: int
     ) -> None:
-        for agent_id in agent_list:
+        agents = self._get_agents(agent_ids)
+        self._aegis_world.remove_energy_from_agents(agents, energy_cost)
+        for agent in agents:
+            self._TEAM_DIG_RESULT_list.add(agent.agent_id)
+
+    def _get_agents(self, agent_ids: list[AgentID]) -> list[Agent]:
+        agents: list[Agent] = []
+        for agent_id in agent_ids:
             agent = self._aegis_world.get_agent(agent_id)
             if agent is not None:
-                agent.remove_energy(energy_cost)
-                self._TEAM_DIG_RESULT_list.add(agent_id)
+                agents.append(agent)
+        return agents
 
     def _process_SAVE_SURV(self) -> None:
-        temp_agent_list = AgentIDList()
-        for save_surv in self._SAVE_SURV_list:
-            temp_agent_list.add(save_surv.get_agent_id())
-
+        grids = self._group_agents_by_grid(self._SAVE_SURV_list)
         self._SAVE_SURV_list.clear()
-        temp_grid_agent_list: list[AgentID] = []
-
-        while temp_agent_list.size() > 0:
-            temp_grid_agent_list.clear()
-            gid_counter: list[int] = [0] * 10
-
-            agent_id = temp_agent_list.remove_at(0)
-            temp_grid_agent_list.append(agent_id)
-            gid_counter[agent_id.gid] += 1
-
-            agent = self._aegis_world.get_agent(agent_id)
-            if agent is None:
-                continue
 
-            grid = self._aegis_world.get_grid_at(agent.location)
-
-            if grid is None:
-                continue
-
-            for grid_agent in grid.agent_id_list:
-                if grid_agent in temp_agent_list:
-                    temp_grid_agent_list.append(grid_agent)
-                    temp_agent_list.remove(grid_agent)
-                    gid_counter[grid_agent.gid] += 1
+        for grid, grid_agent_ids in grids:
+            gid_counter: dict[int, int] = {}
+            for agent_id in grid_agent_ids:
+                gid_counter[agent_id.gid] = gid_counter.get(agent_id.gid, 0) + 1
 
             top_layer = grid.get_top_layer()
             if top_layer is None:
-                for agent_on_grid in temp_grid_agent_list:
-                    agent = self._aegis_world.get_agent(agent_on_grid)
-                    if agent is not None:
-                        agent.remove_energy(self._parameters.SAVE_SURV_ENERGY_COST)
-                        self._SAVE_SURV_RESULT_list.add(agent_on_grid)
-            else:
-                self._handle_top_layer(
-                    top_layer, grid, temp_grid_agent_list, gid_counter
+                agents = self._get_agents(grid_agent_ids)
+                self._aegis_world.remove_energy_from_agents(
+                    agents, self._parameters.SAVE_SURV_ENERGY_COST
                 )
-
-        temp_agent_list.clear()
+                for agent in agents:
+                    self._SAVE_SURV_RESULT_list.add(agent.agent_id)
+            else:
+                self._handle_top_layer(top_layer, grid, grid_agent_ids, gid_counter)
 
     def _process_MOVE(self) -> None:
         for move in self._MOVE_list:
@@ -632,44 +1168,84 @@ class Aegis:
         self._MOVE_list.clear()
 
     def _process_SLEEP(self) -> None:
+        config_settings = self._parameters.config_settings
+        sleep_everywhere = (
+            config_settings is not None and config_settings.sleep_everywhere
+        )
+        charging_agents: list[Agent] = []
+
         for sleep in self._SLEEP_list:
             agent = self._aegis_world.get_agent(sleep.get_agent_id())
             if agent is None:
                 continue
 
-            agent_grid = self._aegis_world.get_grid_at(agent.location)
-            config_settings = self._parameters.config_settings
-
-            if (config_settings and config_settings.sleep_everywhere) or (
-                agent_grid and agent_grid.is_charging_grid()
-            ):
-                if (
-                    agent.get_energy_level() + Constants.NORMAL_CHARGE
-                    > Constants.DEFAULT_MAX_ENERGY_LEVEL
-                ):
-                    agent.set_energy_level(Constants.DEFAULT_MAX_ENERGY_LEVEL)
-                else:
-                    agent.add_energy(Constants.NORMAL_CHARGE)
+            if sleep_everywhere:
+                charging_agents.append(agent)
+            else:
+                agent_grid = self._aegis_world.get_grid_at(agent.location)
+                if agent_grid and agent_grid.is_charging_grid():
+                    charging_agents.append(agent)
             self._SLEEP_RESULT_list.add(sleep.get_agent_id())
         self._SLEEP_list.clear()
 
+        self._aegis_world.charge_agents(
+            charging_agents,
+            Constants.NORMAL_CHARGE,
+            Constants.DEFAULT_MAX_ENERGY_LEVEL,
+        )
+
     def _process_OBSERVE(self) -> None:
+        observing_agents: list[Agent] = []
         for observe in self._OBSERVE_list:
             agent = self._aegis_world.get_agent(observe.get_agent_id())
             if agent is None:
                 continue
 
-            agent.remove_energy(self._parameters.OBSERVE_ENERGY_COST)
+            observing_agents.append(agent)
             self._OBSERVE_RESULT_list.append(observe)
         self._OBSERVE_list.clear()
 
+        self._aegis_world.remove_energy_from_agents(
+            observing_agents, self._parameters.OBSERVE_ENERGY_COST
+        )
+
+    def _process_OBSERVE_AREA(self) -> None:
+        max_size = self._parameters.OBSERVE_AREA_MAX_SIZE
+        grids_per_energy_cost = self._parameters.OBSERVE_AREA_GRIDS_PER_ENERGY_COST
+        agents_by_energy_cost: dict[int, list[Agent]] = {}
+
+        for observe_area in self._OBSERVE_AREA_list:
+            agent = self._aegis_world.get_agent(observe_area.get_agent_id())
+            if agent is None:
+                continue
+
+            location, width, height = self._aegis_world.clip_area(
+                observe_area.location,
+                min(observe_area.width, max_size),
+                min(observe_area.height, max_size),
+            )
+            # observing nothing costs as much as observing a few grids
+            energy_cost = self._parameters.OBSERVE_AREA_ENERGY_COST * max(
+                1, math.ceil(width * height / grids_per_energy_cost)
+            )
+            agents_by_energy_cost.setdefault(energy_cost, []).append(agent)
+            self._OBSERVE_AREA_RESULT_list.append(
+                (agent.agent_id, location, width, height)
+            )
+        self._OBSERVE_AREA_list.clear()
+
+        for energy_cost, agents in agents_by_energy_cost.items():
+            self._aegis_world.remove_energy_from_agents(agents, energy_cost)
+
     def _create_results(self) -> None:
         for agent_id in self._TEAM_DIG_RESULT_list:
             agent = self._aegis_world.get_agent(agent_id)
             if agent is None:
                 continue
 
-            surround_info = self._aegis_world.get_surround_info(agent.location)
+            surround_info = self._aegis_world.get_surround_info(
+                agent.location, agent.agent_id
+            )
             if surround_info is None:
                 continue
 
@@ -682,7 +1258,9 @@ class Aegis:
             if agent is None:
                 continue
 
-            surround_info = self._aegis_world.get_surround_info(agent.location)
+            surround_info = self._aegis_world.get_surround_info(
+                agent.location, agent.agent_id
+            )
             if surround_info is None:
                 continue
 
@@ -696,7 +1274,9 @@ class Aegis:
             if agent is None:
                 continue
 
-            surround_info = self._aegis_world.get_surround_info(agent.location)
+            surround_info = self._aegis_world.get_surround_info(
+                agent.location, agent.agent_id
+            )
             if surround_info is None:
                 continue
 
@@ -731,8 +1311,10 @@ class Aegis:
             grid = self._aegis_world.get_grid_at(observe.location)
 
             if grid is not None:
-                grid_info = grid.get_grid_info()
-                life_signals = grid.get_generated_life_signals()
+                grid_info = self._aegis_world.get_grid_info(observe.location)
+                life_signals = self._aegis_world.get_life_signals(
+                    observe.location, agent.agent_id
+                )
             observe_result = OBSERVE_RESULT(
                 agent.get_energy_level(), grid_info, life_signals
             )
@@ -740,11 +1322,29 @@ class Aegis:
             self._agent_handler.set_result_of_command(agent.agent_id, observe_result)
         self._OBSERVE_RESULT_list.clear()
 
+        for agent_id, location, width, height in self._OBSERVE_AREA_RESULT_list:
+            agent = self._aegis_world.get_agent(agent_id)
+            if agent is None:
+                continue
+
+            observe_area_result = OBSERVE_AREA_RESULT(
+                agent.get_energy_level(),
+                location,
+                width,
+                height,
+                self._aegis_world.get_area_info(location, width, height),
+            )
+            self._agent_handler.set_result_of_command(agent_id, observe_area_result)
+        self._OBSERVE_AREA_RESULT_list.clear()
+
     def _run_simulators(self) -> None:
-        ReplayFileWriter.write_string(self._aegis_world.run_simulators())
+        self._replay_writer.write_string(self._aegis_world.run_simulators())
 
     def _grim_reaper(self) -> None:
         dead_agents = self._aegis_world.grim_reaper()
+        if self._command_log is not None:
+            for agent_id in self._crashed_agents:
+                self._command_log.add_crashed_agent(agent_id)
         dead_agents.add_all(self._crashed_agents)
         self._crashed_agents.clear()
 
@@ -756,13 +1356,14 @@ class Aegis:
                 agent = self._aegis_world.get_agent(agent_id)
                 dead_agents_message += f"{agent_id.proc_string()},"
                 self._aegis_world.remove_agent(agent)
+                _ = self._move_plans.pop(agent_id, None)
                 try:
                     self._agent_handler.send_message_to(agent_id, DEATH_CARD())
                     self._agent_handler.remove_agent(agent_id)
                 except AgentCrashedException:
                     pass
         dead_agents_message += " };\n"
-        ReplayFileWriter.write_string(dead_agents_message)
+        self._replay_writer.write_string(dead_agents_message)
 
     def get_aegis_world(self) -> AegisWorld:
         return self._aegis_world
@@ -772,13 +1373,17 @@ class Aegis:
         top_layer: WorldObject,
         grid: Grid,
         temp_grid_agent_list: list[AgentID],
-        gid_counter: list[int],
+        gid_counter: dict[int, int],
     ) -> None:
         if isinstance(top_layer, (Survivor, SurvivorGroup)):
             self._aegis_world.remove_layer_from_grid(grid.location)
             alive_count, dead_count = self._calculate_survivor_stats(top_layer)
             self._assign_points(
-                temp_grid_agent_list, alive_count, dead_count, gid_counter
+                grid.location,
+                temp_grid_agent_list,
+                alive_count,
+                dead_count,
+                gid_counter,
             )
 
         else:
@@ -810,10 +1415,11 @@ class Aegis:
 
     def _assign_points(
         self,
+        location: Location,
         temp_grid_agent_list: list[AgentID],
         alive_count: int,
         dead_count: int,
-        gid_counter: list[int],
+        gid_counter: dict[int, int],
     ) -> None:
         if self._parameters.config_settings is None:
             return
@@ -822,9 +1428,13 @@ class Aegis:
         points_tie_config = (
             self._parameters.config_settings.points_for_saving_survivors_tie
         )
+        # the group rewarded for a save only depends on the round and the grid
+        stream = self._aegis_world.get_random_streams().stream(
+            RandomStreams.POINTS, self._round, location.x, location.y
+        )
 
         if points_config == ConfigSettings.POINTS_FOR_ALL_SAVING_GROUPS:
-            for gid, count in enumerate(gid_counter):
+            for gid, count in sorted(gid_counter.items()):
                 if count > 0:
                     if alive_count > 0:
                         state = Constants.SAVE_STATE_ALIVE
@@ -835,9 +1445,7 @@ class Aegis:
                     self._agent_handler.increase_agent_group_saved(gid, amount, state)
 
         elif points_config == ConfigSettings.POINTS_FOR_RANDOM_SAVING_GROUPS:
-            random_id = temp_grid_agent_list[
-                Utility.next_int() % len(temp_grid_agent_list)
-            ]
+            random_id = stream.choice(temp_grid_agent_list)
             if alive_count > 0:
                 state = Constants.SAVE_STATE_ALIVE
                 amount = alive_count
@@ -850,12 +1458,12 @@ class Aegis:
             max_group_size = 0
             tie = False
 
-            for gid, count in enumerate(gid_counter):
+            for gid, count in sorted(gid_counter.items()):
                 if count > max_group_size:
                     largest_group_gid = gid
                     max_group_size = count
 
-            for gid, count in enumerate(gid_counter):
+            for gid, count in gid_counter.items():
                 if gid != largest_group_gid and count == max_group_size:
                     tie = True
                     break
@@ -875,7 +1483,7 @@ class Aegis:
             else:
                 if points_tie_config == ConfigSettings.POINTS_TIE_RANDOM_SAVING_GROUPS:
                     self._handle_random_tie(
-                        alive_count, dead_count, gid_counter, max_group_size
+                        stream, alive_count, dead_count, gid_counter, max_group_size
                     )
                 elif points_tie_config == ConfigSettings.POINTS_TIE_ALL_SAVING_GROUPS:
                     self._handle_all_tie(
@@ -890,31 +1498,32 @@ class Aegis:
 
     def _handle_random_tie(
         self,
+        stream: RandomStream,
         alive_count: int,
         dead_count: int,
-        gid_counter: list[int],
+        gid_counter: dict[int, int],
         max_group_size: int,
     ) -> None:
-        while True:
-            random_id = Utility.next_int() % len(gid_counter)
-            if gid_counter[random_id] == max_group_size:
-                if alive_count > 0:
-                    state = Constants.SAVE_STATE_ALIVE
-                    amount = alive_count
-                else:
-                    state = Constants.SAVE_STATE_DEAD
-                    amount = dead_count
-                self._agent_handler.increase_agent_group_saved(random_id, amount, state)
-                break
+        tied_gids = [
+            gid for gid, count in sorted(gid_counter.items()) if count == max_group_size
+        ]
+        random_id = stream.choice(tied_gids)
+        if alive_count > 0:
+            state = Constants.SAVE_STATE_ALIVE
+            amount = alive_count
+        else:
+            state = Constants.SAVE_STATE_DEAD
+            amount = dead_count
+        self._agent_handler.increase_agent_group_saved(random_id, amount, state)
 
     def _handle_all_tie(
         self,
         alive_count: int,
         dead_count: int,
-        gid_counter: list[int],
+        gid_counter: dict[int, int],
         max_group_size: int,
     ) -> None:
-        for gid, count in enumerate(gid_counter):
+        for gid, count in sorted(gid_counter.items()):
             if count == max_group_size:
                 if alive_count > 0:
                     state = Constants.SAVE_STATE_ALIVE
@@ -925,7 +1534,51 @@ class Aegis:
 
                 self._agent_handler.increase_agent_group_saved(gid, amount, state)
 
-    def _compress_and_send(self, event: bytes) -> None:
-        compressed_event = gzip.compress(event)
-        encoded_event = base64.b64encode(compressed_event).decode().encode()
-        self._ws_server.add_event(encoded_event)
+    def _send_round_event(self, round: int) -> None:
+        if self._ws_server is None:
+            return
+
+        # only the grids that changed are read now, the output worker turns the
+        # snapshot into JSON while the agents think
+        aegis_world = self.get_aegis_world()
+        world_snapshot = aegis_world.snapshot()
+        state_digest = f"{aegis_world.get_state_digest():016x}"
+
+        def build_round_data() -> object:
+            return {
+                "event_type": "Round",
+                "round": round,
+                "after_world": world_snapshot.convert_to_json(),
+                "state_digest": state_digest,
+            }
+
+        self._send_built_event(build_round_data)
+
+    def _send_event(self, data: object) -> None:
+        # the event data is built for this event only, nothing changes it
+        # while the output worker encodes it
+        self._send_built_event(lambda: data)
+
+    def _send_built_event(self, build_data: Callable[[], object]) -> None:
+        """
+        Sends an event to the viewer, built, encoded and compressed by the output
+        worker if there is one.
+
+        Args:
+            build_data: Returns the data of the event, without reading anything
+                the simulation changes.
+        """
+        ws_server = self._ws_server
+        if ws_server is None:
+            return
+
+        def compress_and_send() -> None:
+            event = json.dumps(build_data()).encode()
+            compressed_event = gzip.compress(event)
+            encoded_event = base64.b64encode(compressed_event).decode().encode()
+            ws_server.add_event(encoded_event)
+
+        if self._output_worker is not None:
+            self._output_worker.submit(compress_and_send)
+        else:
+            compress_and_send()
@@ -1,18 +1,24 @@
-from typing import override
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, override
 
 from aegis.agent_control.network.agent_socket import AgentSocket
 from aegis.common.agent_id import AgentID
 from aegis.common.commands.aegis_command import AegisCommand
 from aegis.common.commands.aegis_commands import FWD_MESSAGE
 
+if TYPE_CHECKING:
+    from aegis.agent_control.network.local_agent_socket import LocalAgentSocket
+
 
 class AgentControl:
     def __init__(self, agent_id: AgentID) -> None:
         self.agent_id: AgentID = agent_id
-        self.agent_socket: AgentSocket | None = None
+        self.agent_socket: AgentSocket | LocalAgentSocket | None = None
         self.mailbox1: list[FWD_MESSAGE] = []
         self.mailbox2: list[FWD_MESSAGE] = []
         self.result_of_command: AegisCommand | None = None
+        self.result_of_plan: AegisCommand | None = None
 
     @override
     def __eq__(self, other: object) -> bool:
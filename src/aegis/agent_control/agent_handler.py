@@ -1,11 +1,21 @@
+from __future__ import annotations
+
+import functools
 import socket
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
 
 from aegis.agent_control.agent_control import AgentControl
 from aegis.agent_control.agent_group import AgentGroup
+from aegis.agent_control.network.agent_acceptor import AgentAcceptor
 from aegis.agent_control.network.agent_crashed_exception import AgentCrashedException
 from aegis.agent_control.network.agent_socket import AgentSocket
 from aegis.agent_control.network.agent_socket_exception import AgentSocketException
+from aegis.agent_control.network.agent_transport import AgentTransport
+from aegis.agent_control.network.round_packet import RoundPacket
 from aegis.common.agent_id import AgentID
+from aegis.common.agent_registry import AgentRegistry
 from aegis.common.commands.agent_command import AgentCommand
 from aegis.common.commands.agent_commands import AGENT_UNKNOWN, CONNECT
 from aegis.common.commands.aegis_command import AegisCommand
@@ -15,6 +25,7 @@ from aegis.common.commands.aegis_commands import (
     FWD_MESSAGE,
     MESSAGES_END,
     MESSAGES_START,
+    ROUND_START,
     SAVE_SURV_RESULT,
 )
 from aegis.common.constants import Constants
@@ -22,44 +33,75 @@ from aegis.common.network.aegis_socket_exception import AegisSocketException
 from aegis.common.parsers.aegis_parser import AegisParser
 from aegis.common.parsers.aegis_parser_exception import AegisParserException
 
+if TYPE_CHECKING:
+    from aegis.agent_control.network.local_agent_socket import LocalAgentSocket
+
 
 class AgentHandler:
-    def __init__(self) -> None:
+    def __init__(self, transport: AgentTransport | None = None) -> None:
+        """
+        Args:
+            transport: The transport to drive the agent sockets with, shared with the
+                other simulations in the process. None to give the handler its own.
+        """
         self.GID_counter: int = 1
-        self.agent_list: list[AgentControl] = []
-        self.current_agent: int = 0
+        self.agent_list: AgentRegistry[AgentControl] = AgentRegistry()
         self.agent_group_list: list[AgentGroup] = []
+        self._groups_by_gid: dict[int, AgentGroup] = {}
+        self._groups_by_name: dict[str, AgentGroup] = {}
         self.current_mailbox: int = 1
         self.forward_message_list: list[FWD_MESSAGE] = []
         self.send_messages_to_all_groups: bool = False
         self.server_socket: socket.socket | None = None
-
-    def set_agent_handler_port(self, port: int) -> None:
+        self.transport: AgentTransport = transport or AgentTransport()
+        self._owns_transport: bool = transport is None
+        self._read_waiting: set[AgentControl] = set()
+        self._read_deadline: float = 0
+        self._read_handle_command: Callable[[AgentCommand], bool] = lambda _: True
+
+    def set_agent_handler_port(self, port: int, backlog: int = 128) -> int:
+        """
+        Opens the server socket agents connect to.
+
+        Args:
+            port: The port to listen on, 0 to let the OS pick a free port.
+            backlog: The number of agents that can wait to be accepted, agents
+                connecting beyond it are refused.
+
+        Returns:
+            The port the server socket listens on.
+        """
         try:
             self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.server_socket.bind(("", port))
-            self.server_socket.listen(5)
+            self.server_socket.listen(backlog)
+            return self.server_socket.getsockname()[1]
         except Exception:
             print(f"Aegis  : Can't create server socket at port: {port}")
             raise AegisSocketException()
 
     def shutdown(self) -> None:
+        self.reset()
+        if self._owns_transport:
+            self.transport.close()
+        if self.server_socket:
+            self.server_socket.close()
+            self.server_socket = None
+
+    def reset(self) -> None:
+        """Disconnects and forgets all agents and groups, the server socket stays open for new agents."""
+        self.flush_messages()
         for agent in self.agent_list:
             if agent.agent_socket:
                 agent.agent_socket.disconnect()
-        self._reset_all()
-
-    def _reset_all(self):
         self.GID_counter = 1
         self.agent_list.clear()
         self.current_mailbox = 1
         self.agent_group_list.clear()
+        self._groups_by_gid.clear()
+        self._groups_by_name.clear()
         self.forward_message_list.clear()
-        self.send_messages_to_all_groups = False
-        if self.server_socket:
-            self.server_socket.close()
-            self.server_socket = None
 
     def connect_to_agent(self, timeout: int) -> AgentID | None:
         if self.server_socket is None:
@@ -80,87 +122,144 @@ class AgentHandler:
                 agent_socket.disconnect()
                 return None
 
-            agent_connect = command
-            group = self.get_group(agent_connect.group_name)
-            if group is None:
-                gid = self.add_group(agent_connect.group_name).GID
-            else:
-                gid = group.GID
+            return self.accept_agent(command.group_name, agent_socket)
+        except AgentSocketException | AegisParserException | AgentCrashedException:
+            return None
 
-            group = self.get_group(agent_connect.group_name)
-            if group is None:
-                return None
+    def connect_agents(
+        self,
+        number_of_agents: int,
+        timeout: float,
+        handshake_timeout: float,
+        handle_agent: Callable[[AgentID], bool],
+    ) -> int:
+        """
+        Accepts agents and reads their CONNECT concurrently, until the given number
+        of agents connected or the deadline passes.
+
+        Args:
+            number_of_agents: The number of agents to wait for.
+            timeout: The time in seconds all agents have to connect.
+            handshake_timeout: The time in seconds an agent has to send its CONNECT.
+            handle_agent: Called with the ID of every agent that connected,
+                returns whether the agent joined the simulation.
+
+        Returns:
+            The number of agents that joined the simulation.
+        """
+        server_socket = self.server_socket
+        if server_socket is None:
+            return 0
 
-            id = group.id_counter
-            agent_control = AgentControl(AgentID(id, group.GID))
-            group.id_counter += 1
+        connected = 0
 
-            agent_control.agent_socket = agent_socket
-            group.agent_list.append(agent_control)
-            self.agent_list.append(agent_control)
-            return AgentID(id, gid)
-        except AgentSocketException | AegisParserException | AgentCrashedException:
-            return None
+        def handle_connect(agent_socket: AgentSocket, command: CONNECT) -> None:
+            nonlocal connected
+            if connected >= number_of_agents:
+                agent_socket.disconnect()
+            elif handle_agent(self.accept_agent(command.group_name, agent_socket)):
+                connected += 1
+
+        acceptor = AgentAcceptor(
+            self.transport, server_socket, handle_connect, handshake_timeout
+        )
+        deadline = time.monotonic() + timeout
+        acceptor.start()
+        try:
+            while connected < number_of_agents:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                poll_deadline = min(deadline, acceptor.get_next_deadline() or deadline)
+                for handle_input in self.transport.poll(poll_deadline - now):
+                    handle_input()
+                acceptor.expire_handshakes()
+        finally:
+            acceptor.stop()
+        return connected
+
+    def accept_agent(self, group_name: str, agent_socket: AgentSocket) -> AgentID:
+        """
+        Adds an agent that connected over TCP and starts driving its socket.
+
+        Args:
+            group_name: The name of the agent's group.
+            agent_socket: The agent's connection, its CONNECT already read.
+
+        Returns:
+            The ID given to the agent.
+        """
+        agent_id = self.add_agent(group_name, agent_socket)
+        agent = self.get_agent(agent_id)
+        if agent is not None:
+            self.transport.register(
+                agent_socket, functools.partial(self.read_agent_commands_of, agent)
+            )
+        return agent_id
+
+    def add_agent(
+        self, group_name: str, agent_socket: AgentSocket | LocalAgentSocket | None
+    ) -> AgentID:
+        """
+        Adds a connected agent to a group, creating the group if it doesn't exist yet.
+
+        Args:
+            group_name: The name of the agent's group.
+            agent_socket: The agent's connection, None for an agent whose commands
+                are replayed from a command log.
+
+        Returns:
+            The ID given to the agent.
+        """
+        group = self.get_group(group_name)
+        if group is None:
+            group = self.add_group(group_name)
+
+        id = group.id_counter
+        agent_control = AgentControl(AgentID(id, group.GID))
+        group.id_counter += 1
+
+        agent_control.agent_socket = agent_socket
+        self.agent_list.add(agent_control)
+        return AgentID(id, group.GID)
 
     def add_group(self, group_name: str) -> AgentGroup:
         group = AgentGroup(self.GID_counter, group_name)
         self.GID_counter += 1
         self.agent_group_list.append(group)
+        self._groups_by_gid[group.GID] = group
+        _ = self._groups_by_name.setdefault(group_name, group)
         return group
 
     def get_group(self, name: str) -> AgentGroup | None:
-        for group in self.agent_group_list:
-            if group.name == name:
-                return group
-        return None
+        return self._groups_by_name.get(name)
 
     def get_agent_group(self, gid: int) -> AgentGroup | None:
-        for group in self.agent_group_list:
-            if group.GID == gid:
-                return group
-        return None
+        return self._groups_by_gid.get(gid)
 
     def get_agent(self, agent_id: AgentID) -> AgentControl | None:
-        for agent in self.agent_list:
-            if agent.agent_id == agent_id:
-                return agent
-        return None
-
-    def get_current_agent(self) -> AgentControl:
-        return self.agent_list[self.current_agent]
-
-    def reset_current_agent(self) -> None:
-        self.current_agent = 0
-
-    def move_to_next_agent(self) -> None:
-        self.current_agent = (self.current_agent + 1) % len(self.agent_list)
+        return self.agent_list.get(agent_id)
 
     def remove_agent(self, agent_id: AgentID) -> None:
-        agent = self.get_agent(agent_id)
+        agent = self.agent_list.remove(agent_id)
         if agent is None:
             return
 
-        self.agent_list.remove(agent)
-        group: AgentGroup | None = self.get_agent_group(agent_id.gid)
-        if group is None:
-            return
-
-        group.agent_list.remove(agent)
+        if isinstance(agent.agent_socket, AgentSocket):
+            # the agent is still owed whatever was sent to it before it was removed
+            self.transport.flush([agent.agent_socket])
+            self.transport.unregister(agent.agent_socket)
 
     def get_number_of_agents(self) -> int:
         return len(self.agent_list)
 
-    def send_message_to_current(self, command: AegisCommand) -> None:
-        agent = self.get_current_agent()
-        self.send_message_to(agent.agent_id, command)
-
     def send_message_to(self, agent_id: AgentID, command: AegisCommand) -> None:
         agent: AgentControl | None = self.get_agent(agent_id)
         if agent is None:
             return
         try:
             if agent.agent_socket is not None:
-                agent.agent_socket.send_message(str(command))
+                agent.agent_socket.send_command(command)
         except AgentCrashedException as e:
             print(
                 f'Aegis  : Exception "{e}" sending message " {command} " to agent {agent_id} !'
@@ -174,51 +273,178 @@ class AgentHandler:
     def send_message_to_all(self, command: AegisCommand) -> None:
         for agent in self.agent_list:
             self.send_message_to(agent.agent_id, command)
+        self.flush_messages()
+
+    def flush_messages(self) -> None:
+        """Waits until the messages sent to the agents are written, or their write deadline has passed."""
+        self.transport.flush(
+            [
+                agent.agent_socket
+                for agent in self.agent_list
+                if isinstance(agent.agent_socket, AgentSocket)
+            ]
+        )
+
+    def get_agent_commands_of_all(
+        self,
+        agent_ids: list[AgentID],
+        timeout: int,
+        handle_command: Callable[[AgentCommand], bool],
+    ) -> None:
+        """
+        Reads the commands of the given agents concurrently until every one of
+        them has ended its turn or the shared deadline expires.
+
+        Args:
+            agent_ids: The agents whose commands should be read.
+            timeout: The time in milliseconds the agents have to end their turn.
+            handle_command: Called with every command read, in the order each agent
+                sent them. Returns True once the agent's turn is over.
+        """
+        self.start_reading_agent_commands(agent_ids, timeout, handle_command)
+        self.wait_for_agent_commands()
+
+    def start_reading_agent_commands(
+        self,
+        agent_ids: list[AgentID],
+        timeout: int,
+        handle_command: Callable[[AgentCommand], bool],
+    ) -> None:
+        """
+        Starts reading the commands of the given agents, see `get_agent_commands_of_all`.
+
+        Commands that were already received are handled straight away, the rest are
+        handled by `read_agent_commands_of` as the agents' input arrives.
+        """
+        self._read_deadline = time.monotonic() + timeout / 1000
+        self._read_handle_command = handle_command
+        self._read_waiting.clear()
+        for agent_id in agent_ids:
+            agent = self.get_agent(agent_id)
+            if agent is None or agent.agent_socket is None:
+                continue
+
+            # messages left over from the last round are read before waiting
+            if not self._read_agent_commands(agent, handle_command):
+                self._read_waiting.add(agent)
+
+    def wait_for_agent_commands(self) -> None:
+        """Handles the agents' input until every agent ended its turn or the deadline expires."""
+        while not self.is_done_reading_agent_commands():
+            remaining = self._read_deadline - time.monotonic()
+            for read_agent_commands in self.transport.poll(remaining):
+                read_agent_commands()
+
+    def read_agent_commands_of(self, agent: AgentControl) -> None:
+        """Handles the commands an agent sent, if its turn isn't over yet."""
+        if agent in self._read_waiting and self._read_agent_commands(
+            agent, self._read_handle_command
+        ):
+            self._read_waiting.remove(agent)
+
+    def is_done_reading_agent_commands(self) -> bool:
+        return not self._read_waiting or time.monotonic() >= self._read_deadline
+
+    def get_read_deadline(self) -> float:
+        """Returns the `time.monotonic` time the agents' turns end at."""
+        return self._read_deadline
+
+    def _read_agent_commands(
+        self,
+        agent: AgentControl,
+        handle_command: Callable[[AgentCommand], bool],
+    ) -> bool:
+        agent_socket = agent.agent_socket
+        if agent_socket is None:
+            return True
 
-    def get_agent_command_of_current(self, timeout: int) -> AgentCommand | None:
         try:
-            agent = self.get_current_agent()
-            if agent.agent_socket is None:
-                return None
-
-            s = agent.agent_socket.read_message(timeout=timeout)
-            if not s:
-                return None
-            command = AegisParser.parse_agent_command(s)
+            while True:
+                command = agent_socket.next_command()
+                if command is None:
+                    # an agent in this process is done once its brain has thought
+                    return agent_socket.is_local
+                command.set_agent_id(agent.agent_id)
+                if handle_command(command):
+                    return True
         except AgentSocketException:
-            print(
-                f"Aegis  : Exception reading message from agent {self.get_current_agent().agent_id} !"
-            )
-            command = AGENT_UNKNOWN()
+            print(f"Aegis  : Exception reading message from agent {agent.agent_id} !")
         except AegisParserException:
-            print(
-                f"Aegis  : Exception parsing message from agent {self.get_current_agent().agent_id} !"
-            )
-            command = AGENT_UNKNOWN()
+            print(f"Aegis  : Exception parsing message from agent {agent.agent_id} !")
+
+        command = AGENT_UNKNOWN()
+        command.set_agent_id(agent.agent_id)
+        _ = handle_command(command)
+        return True
+
+    def set_result_of_command(self, agent_id: AgentID, command: AegisCommand) -> None:
+        agent = self.get_agent(agent_id)
+        if agent is None:
+            return
+        agent.result_of_command = command
+
+    def send_round_start_to(self, agent_id: AgentID) -> None:
+        """
+        Sends an agent its forwarded messages, the result of its last command
+        and ROUND_START, all in a single write.
+
+        Args:
+            agent_id: The agent starting its round.
+        """
+        agent = self.get_agent(agent_id)
+        if agent is None:
+            return
+
+        packet = RoundPacket()
+        self._add_forward_messages(agent, packet)
+        self._add_result_of_command(agent, packet)
+        packet.add(ROUND_START())
+        self.send_packet_to(agent_id, packet)
+
+    def send_packet_to(self, agent_id: AgentID, packet: RoundPacket) -> None:
+        agent: AgentControl | None = self.get_agent(agent_id)
+        if agent is None:
+            return
+        try:
+            if agent.agent_socket is not None:
+                agent.agent_socket.send_packet(packet)
         except AgentCrashedException as e:
             print(
-                f"Aegis  : Agent reset the socket connection (possible crash of agent?) {self.get_current_agent().agent_id} !"
+                f'Aegis  : Exception "{e}" sending message " {packet} " to agent {agent_id} !'
             )
             raise e
-        command.set_agent_id(self.get_current_agent().agent_id)
-        return command
+        except Exception as e:
+            print(
+                f'Aegis  : Exception "{e}" sending message " {packet} " to agent {agent_id} !'
+            )
 
-    def set_result_of_command(self, agent_id: AgentID, command: AegisCommand) -> None:
+    def set_result_of_plan(self, agent_id: AgentID, command: AegisCommand) -> None:
+        """Sets the result of an agent's move plan, sent after the result of its last command."""
         agent = self.get_agent(agent_id)
         if agent is None:
             return
-        agent.result_of_command = command
+        agent.result_of_plan = command
 
-    def send_result_of_command_to_current(self) -> None:
-        agent = self.get_current_agent()
-        if agent.result_of_command is not None:
-            self.send_message_to(agent.agent_id, CMD_RESULT_START(1))
-            self.send_message_to(agent.agent_id, agent.result_of_command)
-            self.send_message_to(agent.agent_id, CMD_RESULT_END())
-            agent.result_of_command = None
-        else:
-            self.send_message_to(agent.agent_id, CMD_RESULT_START(0))
-            self.send_message_to(agent.agent_id, CMD_RESULT_END())
+    def has_forward_messages(self, agent_id: AgentID) -> bool:
+        """Returns whether an agent has messages to read at the start of the round."""
+        agent = self.get_agent(agent_id)
+        if agent is None:
+            return False
+        mailbox = agent.mailbox1 if self.current_mailbox == 1 else agent.mailbox2
+        return len(mailbox) > 0
+
+    def _add_result_of_command(self, agent: AgentControl, packet: RoundPacket) -> None:
+        results = [
+            result
+            for result in (agent.result_of_command, agent.result_of_plan)
+            if result is not None
+        ]
+        packet.add(CMD_RESULT_START(len(results)))
+        for result in results:
+            packet.add(result)
+        packet.add(CMD_RESULT_END())
+        agent.result_of_command = None
+        agent.result_of_plan = None
 
     def forward_message_to_all(self, fwd_message: FWD_MESSAGE) -> None:
         fwd_message.set_number_left_to_read(len(self.agent_list))
@@ -232,9 +458,9 @@ class AgentHandler:
         if group is None:
             return
 
-        fwd_message.set_number_left_to_read(len(group.agent_list))
+        fwd_message.set_number_left_to_read(self.agent_list.get_group_size(gid))
 
-        for agent in group.agent_list:
+        for agent in self.agent_list.get_group(gid):
             self._add_message_to_mailbox(agent, fwd_message)
         self.forward_message_list.append(fwd_message)
 
@@ -263,16 +489,15 @@ class AgentHandler:
                     self._add_message_to_mailbox(agent, fwd_message)
         self.forward_message_list.append(fwd_message)
 
-    def send_forward_messages_to_current(self) -> None:
-        agent = self.get_current_agent()
+    def _add_forward_messages(self, agent: AgentControl, packet: RoundPacket) -> None:
         mailbox = agent.mailbox1 if self.current_mailbox == 1 else agent.mailbox2
 
-        self.send_message_to(agent.agent_id, MESSAGES_START(len(mailbox)))
+        packet.add(MESSAGES_START(len(mailbox)))
         for fwd_message in mailbox:
             fwd_message.decrease_number_left_to_read()
-            self.send_message_to(agent.agent_id, fwd_message)
+            packet.add(fwd_message)
 
-        self.send_message_to(agent.agent_id, MESSAGES_END())
+        packet.add(MESSAGES_END())
         mailbox.clear()
 
     def _add_message_to_mailbox(
@@ -0,0 +1,34 @@
+from collections import deque
+
+from aegis.common import Direction
+from aegis.common.commands.agent_commands import MOVE_PLAN
+
+
+class MovePlan:
+    """
+    The moves of an agent's MOVE_PLAN that AEGIS still has to make for it.
+
+    Attributes:
+        min_energy (int): The least energy the agent must have left after a move.
+        start_round (int): The round the agent sent the plan in.
+    """
+
+    def __init__(self, move_plan: MOVE_PLAN, start_round: int) -> None:
+        """
+        Args:
+            move_plan: The plan the agent sent.
+            start_round: The round the agent sent the plan in.
+        """
+        self._directions: deque[Direction] = deque(move_plan.directions)
+        self.min_energy = move_plan.min_energy
+        self.start_round = start_round
+
+    def peek_direction(self) -> Direction | None:
+        """Returns the direction of the next move, None if the plan is done."""
+        return self._directions[0] if self._directions else None
+
+    def pop_direction(self) -> Direction:
+        return self._directions.popleft()
+
+    def moves_left(self) -> int:
+        return len(self._directions)
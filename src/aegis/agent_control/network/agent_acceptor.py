@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import functools
+import socket
+import time
+from collections.abc import Callable
+
+from aegis.agent_control.network.agent_socket import AgentSocket
+from aegis.agent_control.network.agent_socket_exception import AgentSocketException
+from aegis.agent_control.network.agent_transport import AgentTransport
+from aegis.common.commands.agent_commands import CONNECT
+from aegis.common.parsers.aegis_parser_exception import AegisParserException
+
+
+class AgentAcceptor:
+    """
+    Accepts agents on a listening socket and reads their CONNECT, for any number of
+    agents at once.
+
+    The listening socket and the sockets still waiting for a CONNECT are driven by an
+    `AgentTransport`, so agents are accepted while others are still handshaking. A socket
+    that sends anything but a CONNECT, or sends nothing before its handshake timeout,
+    is disconnected.
+    """
+
+    def __init__(
+        self,
+        transport: AgentTransport,
+        server_socket: socket.socket,
+        handle_connect: Callable[[AgentSocket, CONNECT], None],
+        handshake_timeout: float,
+    ) -> None:
+        """
+        Args:
+            transport: The transport to drive the sockets with.
+            server_socket: The socket agents connect to.
+            handle_connect: Called with the agent's socket and CONNECT once an agent
+                connected. The socket is no longer registered with the transport.
+            handshake_timeout: The time in seconds an agent has to send its CONNECT.
+        """
+        self._transport: AgentTransport = transport
+        self._server_socket: socket.socket = server_socket
+        self._handle_connect: Callable[[AgentSocket, CONNECT], None] = handle_connect
+        self._handshake_timeout: float = handshake_timeout
+        self._handshakes: dict[AgentSocket, float] = {}
+
+    def start(self) -> None:
+        """Starts accepting agents, they are handled while the transport is polled."""
+        self._transport.register_server(self._server_socket, self._accept_agents)
+
+    def stop(self) -> None:
+        """Stops accepting agents, and disconnects the ones that haven't sent a CONNECT yet."""
+        self._transport.unregister_server(self._server_socket)
+        for agent_socket in self._handshakes:
+            agent_socket.disconnect()
+        self._handshakes.clear()
+
+    def get_next_deadline(self) -> float | None:
+        """Returns the `time.monotonic` time the next handshake times out at, None if there is none."""
+        return min(self._handshakes.values(), default=None)
+
+    def expire_handshakes(self) -> None:
+        """Disconnects the agents whose handshake timed out."""
+        now = time.monotonic()
+        for agent_socket, deadline in list(self._handshakes.items()):
+            if now >= deadline:
+                del self._handshakes[agent_socket]
+                agent_socket.disconnect()
+
+    def _accept_agents(self) -> None:
+        while True:
+            agent_socket = AgentSocket()
+            try:
+                agent_socket.connect(self._server_socket)
+            except AgentSocketException:
+                # no more agents are waiting to be accepted
+                return
+            self._handshakes[agent_socket] = time.monotonic() + self._handshake_timeout
+            self._transport.register(
+                agent_socket, functools.partial(self._read_handshake, agent_socket)
+            )
+
+    def _read_handshake(self, agent_socket: AgentSocket) -> None:
+        if agent_socket not in self._handshakes:
+            return
+        try:
+            command = agent_socket.next_command()
+        except AgentSocketException | AegisParserException:
+            del self._handshakes[agent_socket]
+            agent_socket.disconnect()
+            return
+        if command is None:
+            return
+
+        del self._handshakes[agent_socket]
+        self._transport.unregister(agent_socket)
+        if not isinstance(command, CONNECT):
+            agent_socket.disconnect()
+            return
+        self._handle_connect(agent_socket, command)
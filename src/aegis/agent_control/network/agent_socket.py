@@ -1,33 +1,51 @@
 from __future__ import annotations
 
-import io
 import socket
 import struct
-import threading
-from typing import override
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
 
 from aegis.agent_control.network.agent_socket_exception import AgentSocketException
+from aegis.agent_control.network.round_packet import RoundPacket
+from aegis.common.commands.aegis_command import AegisCommand
+from aegis.common.commands.agent_command import AgentCommand
+from aegis.common.parsers.aegis_parser import AegisParser
+
+if TYPE_CHECKING:
+    from aegis.agent_control.network.agent_transport import AgentTransport
+
+MAX_FRAMES_PER_WRITE = 512
 
 
 class AgentSocket:
     """A class to represent the TCP socket connection between the AEGIS server and an Agent client.
 
+    Outgoing messages are framed into an output buffer and written without blocking.
+    Whatever the socket can't take right away is written later by the `AgentTransport`
+    the socket is registered with, which disconnects the agent once the write deadline passes.
+
     Attributes:
         socket (socket.socket | None): The TCP socket on the AEGIS server connected to an Agent client.
-        in_stream (io.BufferedReader | None): The input stream for reading messages from the Agent client.
-        out_stream (io.BufferedWriter | None): The output stream for sending messages to the Agent client.
-        send_cool_message (str | None): The message to send to the Agent client.
-        send_success (bool): Whether the message was successfully sent to the Agent client.
-        send_exception (bool): Whether an exception occurred while sending the message to the Agent client.
+        in_buffer (bytearray): Bytes received from the Agent client that do not yet form a complete message.
+        out_buffer (bytearray): Framed messages that have not been written to the Agent client yet.
+        write_timeout (float): The time in seconds a write may stay blocked before the agent is disconnected.
+        write_deadline (float | None): When the pending output has to be written by, None if nothing is pending.
+        closed_reason (str | None): Why the connection stopped accepting reads, None while it is open.
+        transport (AgentTransport | None): The transport driving the socket, None if it isn't registered.
+        is_local (bool): False, the Agent client runs in another process and may still be sending.
     """
 
-    def __init__(self) -> None:
+    is_local: bool = False
+
+    def __init__(self, write_timeout: float = 0.1) -> None:
         self.socket: socket.socket | None = None
-        self.in_stream: io.BufferedReader | None = None
-        self.out_stream: io.BufferedWriter | None = None
-        self.send_cool_message: str | None = None
-        self.send_success: bool = False
-        self.send_exception: bool = False
+        self.in_buffer: bytearray = bytearray()
+        self.out_buffer: bytearray = bytearray()
+        self.write_timeout: float = write_timeout
+        self.write_deadline: float | None = None
+        self.closed_reason: str | None = None
+        self.transport: AgentTransport | None = None
 
     def connect(self, server_socket: socket.socket) -> None:
         """Connect an agent by accepting connection on the passed server socket
@@ -37,30 +55,34 @@ class AgentSocket:
         """
         try:
             self.socket = server_socket.accept()[0]
-            self.in_stream = self.socket.makefile("rb")
-            self.out_stream = self.socket.makefile("wb")
         except Exception as e:
             raise AgentSocketException(f"Unable to connect AEGIS to agent: {str(e)}")
 
     def disconnect(self):
         """Disconnect from the Agent client"""
+        if self.transport is not None:
+            self.transport.unregister(self)
         try:
-            if (
-                self.socket is not None
-                and self.in_stream is not None
-                and self.out_stream is not None
-            ):
-                self.in_stream.close()
-                self.out_stream.close()
+            if self.socket is not None:
                 self.socket.close()
                 self.socket = None
         except Exception:
             pass
+        self.out_buffer.clear()
+        self.write_deadline = None
+        if self.closed_reason is None:
+            self.closed_reason = "Socket is not connected"
 
     def __del__(self):
         """Finalize the AgentSocket (attemtping same functionality as Java finalize method)"""
         self.disconnect()
 
+    def fileno(self) -> int:
+        """Returns the file descriptor of the socket, or -1 if not connected."""
+        if self.socket is None:
+            return -1
+        return self.socket.fileno()
+
     def read_message(self, timeout: int) -> str | None:
         """Read a message from the Agent client
 
@@ -85,95 +107,199 @@ class AgentSocket:
             str | None: The message read from the Agent client.
         """
         try:
-            if self.in_stream is None:
-                raise AgentSocketException("Input stream is not initialized")
-            size_buffer = self.in_stream.read(4)
-            if len(size_buffer) != 4:
-                raise AgentSocketException("Couldn't read message length.")
+            while True:
+                message = self._next_buffered_message()
+                if message is not None:
+                    return message
+                self._receive()
+        except socket.timeout:
+            return None
+        except AgentSocketException:
+            raise
+        except Exception as e:
+            raise AgentSocketException(str(e))
+
+    def receive(self) -> None:
+        """Read the data that is waiting on the socket into the input buffer.
+
+        Only call this once a selector has reported the socket as readable,
+        otherwise the call will block until the Agent client sends something.
+        Complete messages can then be taken with `next_message`.
+        """
+        try:
+            self._receive()
+        except BlockingIOError:
+            pass
+        except AgentSocketException as e:
+            self.closed_reason = str(e)
+            raise
+        except Exception as e:
+            self.closed_reason = str(e)
+            raise AgentSocketException(str(e))
 
-            # -1 is for the null byte
-            size: int = struct.unpack("I", size_buffer)[0] - 1
+    def next_message(self) -> str | None:
+        """Remove and return the next complete message that has already been received.
 
-            message_buffer = self.in_stream.read(size)
-            if len(message_buffer) < size:
-                raise AgentSocketException("Message is shorter than expected.")
+        Returns:
+            str | None: The message, or None if no complete message is buffered.
 
-            _ = self.in_stream.read(1)  # read the null byte
+        Raises:
+            AgentSocketException: If no message is buffered and the connection was closed.
+        """
+        message = self._next_buffered_message()
+        if message is None and self.closed_reason is not None:
+            raise AgentSocketException(self.closed_reason)
+        return message
 
-            return message_buffer.decode("ascii").strip()
-        except socket.timeout:
+    def next_command(self) -> AgentCommand | None:
+        """Remove, parse and return the next complete command that has already been received.
+
+        Returns:
+            AgentCommand | None: The command, or None if no complete message is buffered.
+
+        Raises:
+            AgentSocketException: If no message is buffered and the connection was closed.
+            AegisParserException: If the message isn't a valid agent command.
+        """
+        while True:
+            message = self.next_message()
+            if message is None:
+                return None
+            if message:
+                return AegisParser.parse_agent_command(message)
+
+    def _receive(self) -> None:
+        """Append the next chunk of data from the socket to the input buffer."""
+        if self.socket is None:
+            raise AgentSocketException("Socket is not connected")
+        data = self.socket.recv(65536)
+        if not data:
+            raise AgentSocketException("Connection closed by agent.")
+        self.in_buffer += data
+
+    def _next_buffered_message(self) -> str | None:
+        """Remove and return the first complete message in the input buffer, if any."""
+        if len(self.in_buffer) < 4:
             return None
-        except Exception as e:
-            raise AgentSocketException(str(e))
+
+        # the size includes the trailing null byte
+        size: int = struct.unpack_from("I", self.in_buffer)[0]
+        if size < 1:
+            raise AgentSocketException("Couldn't read message length.")
+        if len(self.in_buffer) < 4 + size:
+            return None
+
+        message_buffer = bytes(self.in_buffer[4 : 4 + size - 1])
+        del self.in_buffer[: 4 + size]
+        return message_buffer.decode("ascii").strip()
+
+    def send_command(self, command: AegisCommand) -> None:
+        """Send a command to the Agent client
+
+        Args:
+            command (AegisCommand): The command to send to the Agent client.
+        """
+        self._send_encoded(command.encode())
 
     def send_message(self, message: str) -> None:
         """Send a message to the Agent client
 
+        The message is written straight away if the socket can take it, anything
+        left over stays buffered until the transport flushes it.
+
         Args:
             message (str): The message to send to the Agent client.
+
+        Raises:
+            AgentSocketException: If the socket failed, in which case the agent is disconnected.
         """
+        self._send_encoded(message.encode("ascii"))
+
+    def _send_encoded(self, message_encoded: bytes) -> None:
         if self.socket is not None:
-            self.send_cool_message = message
-            self.send_success = False
-            self.send_exception = False
-
-            sender = self._Sender(self)
-            sender.start()
-
-            sender.join(0.1)
-
-            if sender.is_alive():
-                sender.interrupt()
-
-            if self.send_exception:
-                self.disconnect()
-                raise AgentSocketException(
-                    "Unable to send message to agent due to terminal exception, disconnecting from agent."
-                )
-            if not self.send_success:
-                self.disconnect()
-                raise AgentSocketException(
-                    "Unable to send message to agent due to terminal TCP buffer output stream write block, disconnecting from agent."
-                )
-
-    class _Sender(threading.Thread):
+            self.out_buffer += struct.pack("I", len(message_encoded) + 1)
+            self.out_buffer += message_encoded
+            self.out_buffer += b"\x00"
+            self.flush_output()
+
+    def send_packet(self, packet: RoundPacket) -> None:
+        """Send all messages of a packet to the Agent client with a single write.
+
+        Args:
+            packet (RoundPacket): The messages to send to the Agent client.
+
+        Raises:
+            AgentSocketException: If the socket failed, in which case the agent is disconnected.
+        """
+        if self.socket is None or not packet.commands:
+            return
+
+        frames = packet.frames()
+        if self.out_buffer or len(frames) > MAX_FRAMES_PER_WRITE:
+            # keep the messages behind the output that is still pending,
+            # and stay under the system's limit on buffers per sendmsg call
+            for frame in frames:
+                self.out_buffer += frame
+            self.flush_output()
+            return
+
+        sent = self._send(lambda s: s.sendmsg(frames))
+        for frame in frames:
+            if sent >= len(frame):
+                sent -= len(frame)
+                continue
+            self.out_buffer += frame[sent:]
+            sent = 0
+        self._update_write_deadline(False)
+
+    def has_pending_output(self) -> bool:
+        """Returns whether there is output that has not been written yet."""
+        return self.socket is not None and len(self.out_buffer) > 0
+
+    def flush_output(self) -> None:
         """
-        Send a message to the Agent client
+        Write as much of the pending output as the socket takes without blocking.
 
-        A threaded send for an agent_socket is the same as a send in the aegis_socket class.
+        Raises:
+            AgentSocketException: If the write failed or stayed blocked past the
+                write deadline, in which case the agent is disconnected.
         """
+        if self.socket is None or not self.out_buffer:
+            return
 
-        def __init__(self, agent_socket: AgentSocket) -> None:
-            threading.Thread.__init__(self)
-            self.agent_socket = agent_socket
-            self._stop_event = threading.Event()
+        sent = self._send(lambda s: s.send(self.out_buffer))
+        del self.out_buffer[:sent]
+        self._update_write_deadline(sent > 0)
 
-        @override
-        def run(self) -> None:
-            try:
-                if (
-                    self.agent_socket.out_stream is not None
-                    and self.agent_socket.send_cool_message is not None
-                ):
-                    size_buffer = struct.pack(
-                        "I", len(self.agent_socket.send_cool_message) + 1
-                    )
-                    _ = self.agent_socket.out_stream.write(size_buffer)
-                    _ = self.agent_socket.out_stream.write(
-                        self.agent_socket.send_cool_message.encode("ascii")
-                    )
-                    _ = self.agent_socket.out_stream.write(b"\x00")
-                    self.agent_socket.out_stream.flush()
-                    self.agent_socket.send_success = True
-            except Exception as e:
-                print(f"error in sender thread: {e}")
-                self.agent_socket.send_exception = True
-
-        def interrupt(self) -> None:
-            self._stop_event.set()
-
-        def is_interrupted(self) -> bool:
-            return self._stop_event.is_set()
+    def _send(self, write: Callable[[socket.socket], int]) -> int:
+        """Call a non-blocking write on the socket, disconnecting if it fails."""
+        if self.socket is None:
+            return 0
+        try:
+            return write(self.socket)
+        except BlockingIOError:
+            return 0
+        except Exception as e:
+            self.disconnect()
+            raise AgentSocketException(
+                f"Unable to send message to agent due to terminal exception, disconnecting from agent: {e}"
+            )
+
+    def _update_write_deadline(self, progressed: bool) -> None:
+        """Start, reset or enforce the write deadline after a write."""
+        now = time.monotonic()
+        if not self.out_buffer or progressed:
+            self.write_deadline = None
+
+        if not self.out_buffer:
+            return
+        if self.write_deadline is None:
+            self.write_deadline = now + self.write_timeout
+        elif now >= self.write_deadline:
+            self.disconnect()
+            raise AgentSocketException(
+                "Unable to send message to agent due to terminal TCP buffer output stream write block, disconnecting from agent."
+            )
 
     def reset_timeout(self):
         if self.socket is not None:
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import selectors
+import socket
+import time
+from typing import Any
+
+from aegis.agent_control.network.agent_socket import AgentSocket
+from aegis.agent_control.network.agent_socket_exception import AgentSocketException
+
+
+class AgentTransport:
+    """
+    Drives the non-blocking I/O of every connected agent socket from one selector.
+
+    Listening sockets can be watched too, `poll` reports them once an agent is
+    waiting to be accepted.
+
+    Sockets are always watched for reads. While a socket has output that could not
+    be written straight away it is watched for writes too, and the output is written
+    as soon as the socket can take it. A socket whose output stays blocked past its
+    write deadline is disconnected.
+    """
+
+    def __init__(self) -> None:
+        self._selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self._fds: dict[AgentSocket, int] = {}
+
+    def register(self, agent_socket: AgentSocket, data: Any) -> None:
+        """
+        Start driving the I/O of a connected agent socket.
+
+        Args:
+            agent_socket: The socket to register, it is switched to non-blocking mode.
+            data: Returned by `poll` when the socket has data to read.
+        """
+        if agent_socket.socket is None:
+            return
+        agent_socket.socket.setblocking(False)
+        agent_socket.transport = self
+        self._fds[agent_socket] = agent_socket.fileno()
+        _ = self._selector.register(
+            self._fds[agent_socket],
+            self._events_of(agent_socket),
+            (agent_socket, data),
+        )
+
+    def register_server(self, server_socket: socket.socket, data: Any) -> None:
+        """
+        Start watching a listening socket for agents connecting.
+
+        Args:
+            server_socket: The socket to watch, it is switched to non-blocking mode.
+            data: Returned by `poll` when an agent is waiting to be accepted.
+        """
+        server_socket.setblocking(False)
+        _ = self._selector.register(server_socket, selectors.EVENT_READ, (None, data))
+
+    def unregister_server(self, server_socket: socket.socket) -> None:
+        """Stop watching a listening socket, the socket itself stays open."""
+        try:
+            _ = self._selector.unregister(server_socket)
+        except (KeyError, ValueError):
+            pass
+
+    def unregister(self, agent_socket: AgentSocket) -> None:
+        """Stop driving the I/O of an agent socket, the socket itself stays open."""
+        agent_socket.transport = None
+        fd = self._fds.pop(agent_socket, None)
+        if fd is not None:
+            _ = self._selector.unregister(fd)
+
+    def close(self) -> None:
+        """Unregister every socket and listening socket, the sockets themselves stay open."""
+        for agent_socket in self._fds:
+            agent_socket.transport = None
+        self._fds.clear()
+        self._selector.close()
+        self._selector = selectors.DefaultSelector()
+
+    def poll(self, timeout: float | None) -> list[Any]:
+        """
+        Wait for registered sockets to become readable, writing pending output meanwhile.
+
+        Args:
+            timeout: The longest time in seconds to wait, None to wait until a socket is ready.
+
+        Returns:
+            The data of every socket that received data or lost its connection,
+            and of every listening socket with an agent waiting to be accepted.
+            The messages received can be taken with `AgentSocket.next_message`.
+        """
+        ready: list[Any] = []
+        for key, events in self._select(timeout):
+            if self._service(key, events):
+                ready.append(key.data[1])
+        self._expire_write_deadlines()
+        return ready
+
+    def flush(self, agent_sockets: list[AgentSocket] | None = None) -> None:
+        """
+        Write the pending output of the given sockets, or of every registered socket,
+        until it is all written or its write deadline has passed.
+
+        Args:
+            agent_sockets: The sockets to flush, None to flush every registered socket.
+        """
+        if agent_sockets is None:
+            agent_sockets = list(self._fds)
+
+        while True:
+            pending = [s for s in agent_sockets if s.has_pending_output()]
+            if not pending:
+                return
+
+            now = time.monotonic()
+            deadline = min(s.write_deadline or now for s in pending)
+            for key, events in self._select(max(deadline - now, 0)):
+                _ = self._service(key, events)
+            self._expire_write_deadlines()
+
+    def _select(
+        self, timeout: float | None
+    ) -> list[tuple[selectors.SelectorKey, int]]:
+        if not self._selector.get_map():
+            if timeout is not None and timeout > 0:
+                time.sleep(timeout)
+            return []
+
+        for key in list(self._selector.get_map().values()):
+            if key.data[0] is None:
+                continue
+            events = self._events_of(key.data[0])
+            if key.events != events:
+                _ = self._selector.modify(key.fd, events, key.data)
+        return self._selector.select(timeout)
+
+    def _service(self, key: selectors.SelectorKey, events: int) -> bool:
+        agent_socket: AgentSocket | None = key.data[0]
+        if agent_socket is None:
+            return True
+        if events & selectors.EVENT_WRITE:
+            self._write(agent_socket)
+        if agent_socket.socket is None:
+            return True
+        if events & selectors.EVENT_READ:
+            try:
+                agent_socket.receive()
+            except AgentSocketException:
+                # the reason is kept on the socket for whoever reads it next
+                self.unregister(agent_socket)
+            return True
+        return False
+
+    def _write(self, agent_socket: AgentSocket) -> None:
+        try:
+            agent_socket.flush_output()
+        except AgentSocketException as e:
+            print(f"Aegis  : {e}")
+
+    def _expire_write_deadlines(self) -> None:
+        now = time.monotonic()
+        for agent_socket in list(self._fds):
+            if (
+                agent_socket.write_deadline is not None
+                and now >= agent_socket.write_deadline
+            ):
+                self._write(agent_socket)
+
+    @staticmethod
+    def _events_of(agent_socket: AgentSocket) -> int:
+        if agent_socket.has_pending_output():
+            return selectors.EVENT_READ | selectors.EVENT_WRITE
+        return selectors.EVENT_READ
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+from aegis.agent_control.network.agent_socket_exception import AgentSocketException
+from aegis.agent_control.network.round_packet import RoundPacket
+from aegis.common.commands.aegis_command import AegisCommand
+from aegis.common.commands.agent_command import AgentCommand
+from aegis.common.network.local_aegis_socket import LocalAegisSocket
+from aegis.common.parsers.aegis_parser_exception import AegisParserException
+from agent.base_agent import BaseAgent
+
+if TYPE_CHECKING:
+    from aegis.agent_control.network.agent_transport import AgentTransport
+    from agent.brain import Brain
+
+
+class LocalAgentSocket:
+    """
+    An in-memory stand-in for `AgentSocket`, connecting AEGIS to a brain running in the AEGIS process.
+
+    Commands are passed as objects in both directions, nothing is framed or parsed.
+    Commands sent to the agent are queued, and handed to its brain the next time AEGIS
+    reads from the agent, so the brain thinks while AEGIS collects the round's commands.
+    A brain can't be timed out, its turn is over once it returns from thinking.
+
+    Attributes:
+        base_agent (BaseAgent): The agent's own base agent, activated whenever its brain runs.
+        aegis_socket (LocalAegisSocket): The agent's end of the connection.
+        transport (AgentTransport | None): Always None, the socket has no I/O to drive.
+        closed_reason (str | None): Why the agent stopped, None while it is running.
+        is_local (bool): True, once the brain has thought nothing more will arrive.
+    """
+
+    is_local: bool = True
+
+    def __init__(self, brain: Brain) -> None:
+        self.base_agent: BaseAgent = BaseAgent()
+        self.aegis_socket: LocalAegisSocket = LocalAegisSocket()
+        self.transport: AgentTransport | None = None
+        self.closed_reason: str | None = None
+        self._inbox: deque[AegisCommand] = deque()
+        self.base_agent.start_local(self.aegis_socket, brain)
+
+    def disconnect(self) -> None:
+        """Hand the agent the commands still queued for it and close the connection."""
+        self._dispatch()
+        self._close("Socket is not connected")
+
+    def send_command(self, command: AegisCommand) -> None:
+        """Queue a command for the agent."""
+        if self.closed_reason is None:
+            self._inbox.append(command)
+
+    def send_packet(self, packet: RoundPacket) -> None:
+        """Queue all commands of a packet for the agent."""
+        if self.closed_reason is None:
+            self._inbox.extend(packet.commands)
+
+    def has_pending_output(self) -> bool:
+        return False
+
+    def next_command(self) -> AgentCommand | None:
+        """
+        Hand the agent the commands queued for it, then remove and return the next
+        command it sent.
+
+        Returns:
+            AgentCommand | None: The command, or None if the agent has sent nothing more.
+
+        Raises:
+            AgentSocketException: If the agent sent nothing more and has stopped.
+            AegisParserException: If the agent sent something that isn't an agent command.
+        """
+        self._dispatch()
+
+        outbox = self.aegis_socket.outbox
+        if outbox:
+            command = outbox.popleft()
+            if not isinstance(command, AgentCommand):
+                raise AegisParserException(f"Not an agent command: {command}")
+            return command
+
+        if self.closed_reason is not None:
+            raise AgentSocketException(self.closed_reason)
+        return None
+
+    def _dispatch(self) -> None:
+        if not self._inbox:
+            return
+
+        self.base_agent.activate()
+        try:
+            while self._inbox:
+                if self.base_agent.handle_aegis_command(self._inbox.popleft()):
+                    self._close("Agent shut down.")
+        except Exception as e:
+            print(f"Aegis  : Agent {self.base_agent.get_agent_id()} crashed: {e}")
+            self._close(f"Agent crashed: {e}")
+
+    def _close(self, reason: str) -> None:
+        if self.closed_reason is None:
+            self.closed_reason = reason
+        self._inbox.clear()
+        self.aegis_socket.disconnect()
@@ -0,0 +1,41 @@
+import struct
+
+from aegis.common.commands.aegis_command import AegisCommand
+
+
+class RoundPacket:
+    """
+    Collects the messages AEGIS sends an agent at the start of a round,
+    so they can be written to the agent's socket with a single call.
+
+    Attributes:
+        commands (list[AegisCommand]): The commands to send, in the order they were added.
+    """
+
+    def __init__(self) -> None:
+        self.commands: list[AegisCommand] = []
+
+    def add(self, command: AegisCommand) -> None:
+        """
+        Adds a command to the packet.
+
+        Args:
+            command: The command to send to the agent.
+        """
+        self.commands.append(command)
+
+    def frames(self) -> list[bytes]:
+        """Returns the commands as length-prefixed and null-terminated messages."""
+        frames: list[bytes] = []
+        for command in self.commands:
+            message_encoded = command.encode()
+            frames.append(
+                struct.pack("I", len(message_encoded) + 1) + message_encoded + b"\x00"
+            )
+        return frames
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def __str__(self) -> str:
+        return f"ROUND_PACKET ( {len(self.commands)} )"
@@ -0,0 +1,167 @@
+import json
+from typing import TextIO
+
+from aegis.assist.config_settings import ConfigSettings
+from aegis.common import AgentID
+from aegis.common.commands.agent_command import AgentCommand
+from aegis.common.parsers.aegis_parser import AegisParser
+
+_CONFIG_FIELDS = (
+    "points_for_saving_survivors",
+    "points_for_saving_survivors_tie",
+    "handling_messages",
+    "send_messages_to_all_groups",
+    "sleep_everywhere",
+)
+
+
+class CommandLogWriter:
+    """
+    Writes the commands agents send in a simulation to a command log, so the
+    simulation can be run again without the agents, see `CommandLog`.
+
+    The log is JSON Lines: a START record with the world file, seed, number of
+    rounds and config settings, an AGENT record for every agent in the order they
+    were added, then a ROUND record for every round with the commands in the order
+    AEGIS received them and the agents that crashed. Commands are written in the
+    text agents send them in, which unlike the replay's `proc_string` can be parsed back.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Args:
+            filename: The file to write the log to.
+        """
+        self._file: TextIO = open(filename, "w")
+        self._commands: list[list[int | str]] = []
+        self._crashed: list[list[int]] = []
+
+    def _write(self, record: dict[str, object]) -> None:
+        _ = self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def write_start(
+        self,
+        world_filename: str,
+        random_seed: int,
+        number_of_rounds: int,
+        config_settings: ConfigSettings | None,
+    ) -> None:
+        config = None
+        if config_settings is not None:
+            config = {name: getattr(config_settings, name) for name in _CONFIG_FIELDS}
+        self._write(
+            {
+                "type": "START",
+                "world_file": world_filename,
+                "seed": random_seed,
+                "rounds": number_of_rounds,
+                "config": config,
+            }
+        )
+
+    def write_agent(self, agent_id: AgentID, group_name: str) -> None:
+        self._write(
+            {"type": "AGENT", "id": agent_id.id, "gid": agent_id.gid, "group": group_name}
+        )
+
+    def add_command(self, command: AgentCommand) -> None:
+        """Adds a command received this round, written by `end_round`."""
+        agent_id = command.get_agent_id()
+        self._commands.append([agent_id.id, agent_id.gid, str(command)])
+
+    def add_crashed_agent(self, agent_id: AgentID) -> None:
+        """Adds an agent that crashed this round, written by `end_round`."""
+        self._crashed.append([agent_id.id, agent_id.gid])
+
+    def end_round(self, round: int) -> None:
+        self._write(
+            {
+                "type": "ROUND",
+                "round": round,
+                "commands": self._commands,
+                "crashed": self._crashed,
+            }
+        )
+        self._commands = []
+        self._crashed = []
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CommandLog:
+    """
+    A command log read back, see `CommandLogWriter`.
+
+    Attributes:
+        world_filename (str): The world file of the logged simulation.
+        random_seed (int): The seed the world was built with.
+        number_of_rounds (int): The number of rounds the simulation was run for.
+        config_settings (ConfigSettings | None): The config settings of the simulation.
+        agents (list[tuple[AgentID, str]]): The agents and their group names, in the
+            order they were added.
+    """
+
+    def __init__(self) -> None:
+        self.world_filename = ""
+        self.random_seed = 0
+        self.number_of_rounds = 0
+        self.config_settings: ConfigSettings | None = None
+        self.agents: list[tuple[AgentID, str]] = []
+        self._commands: dict[int, list[AgentCommand]] = {}
+        self._crashed: dict[int, list[AgentID]] = {}
+
+    def get_commands(self, round: int) -> list[AgentCommand]:
+        """Returns the commands received in a round, in the order they were received."""
+        return self._commands.get(round, [])
+
+    def get_crashed_agents(self, round: int) -> list[AgentID]:
+        return self._crashed.get(round, [])
+
+    @staticmethod
+    def read(filename: str) -> "CommandLog":
+        """
+        Reads a command log.
+
+        Args:
+            filename: The file the log was written to.
+
+        Raises:
+            ValueError: If the log isn't a command log.
+        """
+        command_log = CommandLog()
+        with open(filename, "r") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                record_type = record.get("type")
+                if record_type == "START":
+                    command_log.world_filename = record["world_file"]
+                    command_log.random_seed = int(record["seed"])
+                    command_log.number_of_rounds = int(record["rounds"])
+                    config = record.get("config")
+                    if config is not None:
+                        config_settings = ConfigSettings()
+                        for name in _CONFIG_FIELDS:
+                            if name in config:
+                                setattr(config_settings, name, config[name])
+                        command_log.config_settings = config_settings
+                elif record_type == "AGENT":
+                    command_log.agents.append(
+                        (AgentID(record["id"], record["gid"]), record["group"])
+                    )
+                elif record_type == "ROUND":
+                    commands: list[AgentCommand] = []
+                    for id, gid, text in record["commands"]:
+                        command = AegisParser.parse_agent_command(text)
+                        command.set_agent_id(AgentID(id, gid))
+                        commands.append(command)
+                    round = int(record["round"])
+                    command_log._commands[round] = commands
+                    command_log._crashed[round] = [
+                        AgentID(id, gid) for id, gid in record["crashed"]
+                    ]
+                else:
+                    raise ValueError(f"Unknown command log record: {record_type}")
+        return command_log
@@ -0,0 +1,64 @@
+import queue
+import threading
+from collections.abc import Callable
+
+
+class OutputWorker:
+    """
+    Runs the output of the simulation on a background thread, so writing the replay
+    and building the viewer's events overlaps with the agents thinking in the next round.
+
+    Tasks run one at a time, in the order they were submitted. At most `max_pending`
+    tasks wait to run, submitting another one blocks until the worker catches up, so
+    the simulation can't get ahead of its output by more than that.
+    """
+
+    def __init__(self, max_pending: int) -> None:
+        """
+        Args:
+            max_pending: The number of tasks that can wait to run.
+        """
+        self._tasks: queue.Queue[Callable[[], None] | None] = queue.Queue(max_pending)
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def submit(self, task: Callable[[], None]) -> None:
+        """
+        Hands a task to the worker, or runs it right away if the worker isn't running.
+
+        Args:
+            task: The task, it must only use data the simulation doesn't change anymore.
+        """
+        if self._thread is None:
+            task()
+        else:
+            self._tasks.put(task)
+
+    def drain(self) -> None:
+        """Waits until every task submitted so far ran."""
+        if self._thread is not None:
+            self._tasks.join()
+
+    def stop(self) -> None:
+        """Runs the tasks still waiting and stops the worker."""
+        if self._thread is None:
+            return
+        self._tasks.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            task = self._tasks.get()
+            try:
+                if task is None:
+                    return
+                task()
+            except Exception as e:
+                print(f"Aegis  : Error writing output: {e}")
+            finally:
+                self._tasks.task_done()
@@ -1,4 +1,5 @@
 from aegis.assist.config_settings import ConfigSettings
+from aegis.common.constants import Constants
 
 
 class Parameters:
@@ -6,13 +7,33 @@ class Parameters:
     DEFAULT_TEAM_DIG_ENERGY_COST = 1
     DEFAULT_MOVE_ENERGY_COST = 1
     DEFAULT_OBSERVE_ENERGY_COST = 1
+    DEFAULT_OBSERVE_AREA_ENERGY_COST = 1
+    DEFAULT_OBSERVE_AREA_GRIDS_PER_ENERGY_COST = 9
+    DEFAULT_OBSERVE_AREA_MAX_SIZE = 11
     milliseconds_to_wait_for_agent_command = int(1.25 * 1000)
     milliseconds_to_wait_for_agent_connect = 5 * 1000
+    milliseconds_to_wait_for_agents = 60 * 1000
+    listen_backlog = 128
+    output_queue_size = 256
     number_of_rounds = 500
     number_of_agents = 0
     replay_filename = "replay.txt"
     world_filename = "ExampleWorld.world"
+    headless = False
+    number_of_repeats = 1
+    number_of_sessions = 1
+    agent_port = Constants.AGENT_PORT
+    websocket_port = 6003
+    run_directory: str | None = None
+    random_seeds: list[int] = []
+    command_log_filename: str | None = None
+    resimulate_filename: str | None = None
     OBSERVE_ENERGY_COST = DEFAULT_OBSERVE_ENERGY_COST
+    # OBSERVE_AREA costs OBSERVE_AREA_ENERGY_COST for every OBSERVE_AREA_GRIDS_PER_ENERGY_COST
+    # grids observed, or part of it, and observes at most OBSERVE_AREA_MAX_SIZE grids along X and Y
+    OBSERVE_AREA_ENERGY_COST = DEFAULT_OBSERVE_AREA_ENERGY_COST
+    OBSERVE_AREA_GRIDS_PER_ENERGY_COST = DEFAULT_OBSERVE_AREA_GRIDS_PER_ENERGY_COST
+    OBSERVE_AREA_MAX_SIZE = DEFAULT_OBSERVE_AREA_MAX_SIZE
     SAVE_SURV_ENERGY_COST = DEFAULT_SAVE_SURV_ENERGY_COST
     TEAM_DIG_ENERGY_COST = DEFAULT_TEAM_DIG_ENERGY_COST
     MOVE_ENERGY_COST = DEFAULT_MOVE_ENERGY_COST
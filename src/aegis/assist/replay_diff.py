@@ -0,0 +1,140 @@
+import re
+from collections.abc import Iterator
+from typing import TextIO
+
+from aegis.common import Location
+
+_CELL = re.compile(r"\((\d+),(\d+),([0-9a-f]+)\)")
+_AGENT = re.compile(r"\((-?\d+),(-?\d+),(-?\d+),(-?\d+),(-?\d+)\)")
+_WORLD = re.compile(r"WORLD ([0-9a-f]+)")
+
+
+class Divergence:
+    """
+    Where two runs stopped having the same world.
+
+    Attributes:
+        round (int): The first round the worlds differ after, 0 if they differ from the start.
+        location (Location | None): The first grid that differs, ordered by X then Y,
+            None if only the agents differ.
+        agent (tuple[int, int] | None): The ID and GID of the first agent that differs,
+            if no grid differs.
+        reason (str): What differs.
+    """
+
+    def __init__(
+        self,
+        round: int,
+        reason: str,
+        location: Location | None = None,
+        agent: tuple[int, int] | None = None,
+    ) -> None:
+        self.round = round
+        self.reason = reason
+        self.location = location
+        self.agent = agent
+
+    def __str__(self) -> str:
+        s = f"Round {self.round}: {self.reason}"
+        if self.location is not None:
+            s += f" at grid {self.location}"
+        if self.agent is not None:
+            s += f" for agent {self.agent}"
+        return s
+
+
+class _Round:
+    def __init__(self, round: int, digest: str, agents: str) -> None:
+        self.round = round
+        self.digest = digest
+        self.agents = agents
+
+
+def _read_world(replay: TextIO) -> str:
+    length = int(replay.readline())
+    return replay.read(length)
+
+
+def _rounds(replay: TextIO) -> Iterator[_Round]:
+    """Yields the digest and agents of every round, round 0 being the start of the run."""
+    round = 0
+    agents = ""
+    for line in replay:
+        if line.startswith("RS;"):
+            round = int(line[3:].split(";")[0])
+        elif line.startswith("Agents_Information;"):
+            agents = line
+        elif line.startswith("State_Digest;"):
+            yield _Round(round, line, agents)
+
+
+def _world_digest(digest_line: str) -> str:
+    match = _WORLD.search(digest_line)
+    return match.group(1) if match else ""
+
+
+def _update_cells(
+    cells: dict[tuple[int, int], str], digest_line: str
+) -> list[tuple[int, int]]:
+    changed: list[tuple[int, int]] = []
+    for x, y, digest in _CELL.findall(digest_line):
+        location = (int(x), int(y))
+        cells[location] = digest
+        changed.append(location)
+    return changed
+
+
+def _first_agent_difference(agents_a: str, agents_b: str) -> tuple[int, int] | None:
+    states_a = {(int(s[0]), int(s[1])): s for s in _AGENT.findall(agents_a)}
+    states_b = {(int(s[0]), int(s[1])): s for s in _AGENT.findall(agents_b)}
+    for agent in sorted(states_a.keys() | states_b.keys()):
+        if states_a.get(agent) != states_b.get(agent):
+            return agent
+    return None
+
+
+def find_divergence(replay_a: TextIO, replay_b: TextIO) -> Divergence | None:
+    """
+    Finds the first round two runs have different worlds after, from the state
+    digests in their replays, without simulating the runs again.
+
+    Both replays are read once, round by round, and only the digests of the grids
+    are kept, so it takes time in the length of the replays.
+
+    Args:
+        replay_a: The replay of the first run.
+        replay_b: The replay of the second run.
+
+    Returns:
+        Where the runs diverge, None if their worlds are the same in every round.
+    """
+    if _read_world(replay_a) != _read_world(replay_b):
+        return Divergence(0, "the world files differ")
+
+    cells_a: dict[tuple[int, int], str] = {}
+    cells_b: dict[tuple[int, int], str] = {}
+    rounds_a = _rounds(replay_a)
+    rounds_b = _rounds(replay_b)
+    while True:
+        round_a = next(rounds_a, None)
+        round_b = next(rounds_b, None)
+        if round_a is None or round_b is None:
+            if round_a is not None:
+                return Divergence(round_a.round, "the second run ended before it")
+            if round_b is not None:
+                return Divergence(round_b.round, "the first run ended before it")
+            return None
+
+        changed = _update_cells(cells_a, round_a.digest)
+        changed += _update_cells(cells_b, round_b.digest)
+        if _world_digest(round_a.digest) == _world_digest(round_b.digest):
+            continue
+
+        for x, y in sorted(set(changed)):
+            if cells_a.get((x, y)) != cells_b.get((x, y)):
+                return Divergence(round_a.round, "the grids differ", Location(x, y))
+
+        agent = _first_agent_difference(round_a.agents, round_b.agents)
+        if agent is None:
+            return Divergence(round_a.round, "the world digests differ")
+        return Divergence(round_a.round, "the agents differ", agent=agent)
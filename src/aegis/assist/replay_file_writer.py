@@ -1,16 +1,50 @@
 import os
+from collections.abc import Callable
 from datetime import datetime
+from io import TextIOWrapper
+
+from aegis.assist.output_worker import OutputWorker
 
 
 class ReplayFileWriter:
-    replay_file = None
+    """
+    Writes the replay of a simulation, every simulation in the process has its own.
+
+    Attributes:
+        replay_file (TextIOWrapper | None): The replay file, None if it isn't open.
+        output_worker (OutputWorker | None): The worker the replay is written on,
+            None to write it right away.
+    """
+
+    # writes the replays on a background thread, shared by every simulation
+    _shared_output_worker: OutputWorker | None = None
+
+    def __init__(self) -> None:
+        self.replay_file: TextIOWrapper | None = None
+        self.output_worker: OutputWorker | None = None
+
+    def start_output_worker(self, max_pending: int) -> OutputWorker:
+        """
+        Starts writing the replay on a background thread, the worker is shared by
+        every simulation in the process.
 
-    @staticmethod
-    def open_replay_file(filename: str, world_filename: str) -> bool:
+        Args:
+            max_pending: The number of writes that can wait for the worker.
+
+        Returns:
+            The worker, to run other output on in order with the replay.
+        """
+        if ReplayFileWriter._shared_output_worker is None:
+            ReplayFileWriter._shared_output_worker = OutputWorker(max_pending)
+            ReplayFileWriter._shared_output_worker.start()
+        self.output_worker = ReplayFileWriter._shared_output_worker
+        return self.output_worker
+
+    def open_replay_file(self, filename: str, world_filename: str) -> bool:
         try:
-            if ReplayFileWriter.replay_file is not None:
-                ReplayFileWriter.close_replay_file()
-            ReplayFileWriter.replay_file = open(filename, "w")
+            if self.replay_file is not None:
+                self.close_replay_file()
+            self.replay_file = open(filename, "w")
 
             if not os.path.exists(world_filename):
                 print(f"Cannot find world file {world_filename}")
@@ -18,12 +52,10 @@ class ReplayFileWriter:
 
             with open(world_filename, "r") as world_file:
                 world_file_content = world_file.read()
-                _ = ReplayFileWriter.replay_file.write(f"{len(world_file_content)}\n")
-                _ = ReplayFileWriter.replay_file.write(world_file_content + "\n")
-                _ = ReplayFileWriter.replay_file.write(
-                    f"System Run date: {datetime.now()}\n"
-                )
-                ReplayFileWriter.replay_file.flush()
+                _ = self.replay_file.write(f"{len(world_file_content)}\n")
+                _ = self.replay_file.write(world_file_content + "\n")
+                _ = self.replay_file.write(f"System Run date: {datetime.now()}\n")
+                self.replay_file.flush()
 
         except FileNotFoundError:
             print(f"Cannot find/open replay file {filename}")
@@ -33,17 +65,32 @@ class ReplayFileWriter:
             return False
         return True
 
-    @staticmethod
-    def close_replay_file() -> None:
-        if ReplayFileWriter.replay_file is not None:
-            ReplayFileWriter.replay_file.close()
+    def close_replay_file(self) -> None:
+        if self.output_worker is not None:
+            self.output_worker.drain()
+        if self.replay_file is not None:
+            self.replay_file.close()
+            self.replay_file = None
+
+    def write_string(self, string: str) -> None:
+        self.write_later(lambda: string)
+
+    def write_later(self, build_string: Callable[[], str]) -> None:
+        """
+        Writes a string to the replay, built and written by the output worker if there is one.
+
+        Args:
+            build_string: Builds the string, from data the simulation doesn't change anymore.
+        """
+        replay_file = self.replay_file
+        if replay_file is None:
+            return
 
-    @staticmethod
-    def write_string(string: str) -> None:
-        if ReplayFileWriter.replay_file is not None:
-            _ = ReplayFileWriter.replay_file.write(string)
-            ReplayFileWriter.replay_file.flush()
+        def write() -> None:
+            _ = replay_file.write(build_string())
+            replay_file.flush()
 
-    @classmethod
-    def __del__(cls) -> None:
-        cls.close_replay_file()
+        if self.output_worker is not None:
+            self.output_worker.submit(write)
+        else:
+            write()
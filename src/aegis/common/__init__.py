@@ -1,18 +1,23 @@
 __all__ = [
     "AgentID",
     "AgentIDList",
+    "AgentRegistry",
     "Constants",
     "Direction",
     "LifeSignals",
     "Location",
+    "RandomStream",
+    "RandomStreams",
     "Utility",
     "GridType",
 ]
 
 from aegis.common.agent_id import AgentID
 from aegis.common.agent_id_list import AgentIDList
+from aegis.common.agent_registry import AgentRegistry
 from aegis.common.constants import Constants
 from aegis.common.direction import Direction
 from aegis.common.life_signals import LifeSignals
 from aegis.common.location import Location
+from aegis.common.random_streams import RandomStream, RandomStreams
 from aegis.common.utility import GridType, Utility
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from collections.abc import Iterator
 from typing import override
 
@@ -7,7 +8,12 @@ from aegis.common.agent_id import AgentID
 
 
 class AgentIDList:
-    """Represents a list of AgentID instances."""
+    """
+    Represents a list of AgentID instances, without duplicates.
+
+    The AgentIDs are kept in an insertion ordered hash set, so adding, removing,
+    checking membership and removing the first AgentID take constant time.
+    """
 
     def __init__(self, agent_id_list: list[AgentID] | None = None) -> None:
         """
@@ -16,7 +22,17 @@ class AgentIDList:
         Args:
             agent_id_list: An optional list of AgentID instances.
         """
-        self._agent_id_list = agent_id_list or []
+        self._agent_ids: OrderedDict[AgentID, None] = OrderedDict.fromkeys(
+            agent_id_list or []
+        )
+        # set while the AgentIDs are shared with a snapshot, see `snapshot`
+        self._shared: bool = False
+
+    def _own(self) -> OrderedDict[AgentID, None]:
+        if self._shared:
+            self._agent_ids = self._agent_ids.copy()
+            self._shared = False
+        return self._agent_ids
 
     def add(self, agent_id: AgentID) -> None:
         """
@@ -25,8 +41,8 @@ class AgentIDList:
         Args:
             agent_id: An AgentID instance.
         """
-        if agent_id not in self._agent_id_list:
-            self._agent_id_list.append(agent_id)
+        if agent_id not in self._agent_ids:
+            self._own()[agent_id] = None
 
     def add_all(self, agent_id_list: list[AgentID] | AgentIDList) -> None:
         """
@@ -44,8 +60,13 @@ class AgentIDList:
 
         Args:
             agent_id: The AgentID instance to remove.
+
+        Raises:
+            ValueError: If the AgentID isn't in the list.
         """
-        self._agent_id_list.remove(agent_id)
+        if agent_id not in self._agent_ids:
+            raise ValueError(f"{agent_id} is not in the list")
+        del self._own()[agent_id]
 
     def remove_all(self, agent_id_list: list[AgentID]) -> None:
         """
@@ -59,7 +80,7 @@ class AgentIDList:
 
     def size(self) -> int:
         """Returns the number of AgentID instances in the list."""
-        return len(self._agent_id_list)
+        return len(self._agent_ids)
 
     def clone(self) -> AgentIDList:
         """
@@ -69,24 +90,42 @@ class AgentIDList:
             A new AgentIDList object with same AgentID instances as the current instance.
         """
         copy = AgentIDList()
-        for agent in self._agent_id_list:
-            copy.add(agent.clone())
+        copy._agent_ids = OrderedDict.fromkeys(
+            agent_id.clone() for agent_id in self._agent_ids
+        )
+        return copy
+
+    def snapshot(self) -> AgentIDList:
+        """
+        Returns a copy of the list in constant time.
+
+        The copy shares the AgentID instances, which are never changed, and the
+        underlying set until either list is changed.
+        """
+        copy = AgentIDList()
+        copy._agent_ids = self._agent_ids
+        copy._shared = self._shared = True
         return copy
 
     @override
     def __str__(self) -> str:
-        if not self._agent_id_list:
+        if not self._agent_ids:
             return "( )"
-        return f"( {' , '.join(str(agent_id) for agent_id in self._agent_id_list)} )"
+        return f"( {' , '.join(str(agent_id) for agent_id in self._agent_ids)} )"
 
     def proc_string(self) -> str:
         """Returns a string representation of the AgentIDList in a procedular format."""
-        if not self._agent_id_list:
+        if not self._agent_ids:
             return "all"
-        return f"({', '.join(str(agent_id.proc_string()) for agent_id in self._agent_id_list)})"
+        return f"({', '.join(str(agent_id.proc_string()) for agent_id in self._agent_ids)})"
 
     def __iter__(self) -> Iterator[AgentID]:
-        return iter(self._agent_id_list)
+        # the list must not be changed while iterating it, iterate a `snapshot` of it
+        # to change it
+        return iter(self._agent_ids)
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._agent_ids
 
     def is_empty(self) -> bool:
         """
@@ -95,11 +134,12 @@ class AgentIDList:
         Returns:
             True if the AgentIDList is empty, False otherwise.
         """
-        return not self._agent_id_list
+        return not self._agent_ids
 
     def clear(self) -> None:
         """Clears all AgentID instances from the list."""
-        self._agent_id_list.clear()
+        self._agent_ids = OrderedDict()
+        self._shared = False
 
     def remove_at(self, index: int) -> AgentID:
         """
@@ -110,5 +150,18 @@ class AgentIDList:
 
         Returns:
             The AgentID instance at the given index.
+
+        Raises:
+            IndexError: If the index is out of range.
         """
-        return self._agent_id_list.pop(index)
+        size = len(self._agent_ids)
+        if not -size <= index < size:
+            raise IndexError("AgentIDList index out of range")
+        if index in (0, -size):
+            return self._own().popitem(last=False)[0]
+        if index in (-1, size - 1):
+            return self._own().popitem()[0]
+
+        agent_id = list(self._agent_ids)[index]
+        del self._own()[agent_id]
+        return agent_id
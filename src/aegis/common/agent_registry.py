@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Protocol
+
+from aegis.common.agent_id import AgentID
+
+
+class HasAgentID(Protocol):
+    agent_id: AgentID
+
+
+class AgentRegistry[T: HasAgentID]:
+    """
+    Holds agents indexed by their AgentID and by the GID of their group.
+
+    Adding, removing and looking up an agent take constant time, and the agents
+    are iterated in the order they were added. Iterating works on a copy, so
+    agents can be removed while iterating.
+    """
+
+    def __init__(self) -> None:
+        self._agents: dict[AgentID, T] = {}
+        self._groups: dict[int, dict[AgentID, T]] = {}
+
+    def add(self, agent: T) -> None:
+        """
+        Adds an agent, replacing the agent with the same AgentID.
+
+        Args:
+            agent: The agent to add.
+        """
+        agent_id = agent.agent_id
+        self._agents[agent_id] = agent
+        self._groups.setdefault(agent_id.gid, {})[agent_id] = agent
+
+    def remove(self, agent_id: AgentID) -> T | None:
+        """
+        Removes an agent.
+
+        Args:
+            agent_id: The AgentID of the agent to remove.
+
+        Returns:
+            The agent removed, None if there is no agent with the AgentID.
+        """
+        agent = self._agents.pop(agent_id, None)
+        if agent is not None:
+            group = self._groups[agent_id.gid]
+            del group[agent_id]
+            if not group:
+                del self._groups[agent_id.gid]
+        return agent
+
+    def get(self, agent_id: AgentID) -> T | None:
+        """Returns the agent with the AgentID, None if there is none."""
+        return self._agents.get(agent_id)
+
+    def get_group(self, gid: int) -> list[T]:
+        """Returns the agents of a group, in the order they were added."""
+        return list(self._groups.get(gid, {}).values())
+
+    def get_group_size(self, gid: int) -> int:
+        return len(self._groups.get(gid, ()))
+
+    def clear(self) -> None:
+        self._agents.clear()
+        self._groups.clear()
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._agents
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(list(self._agents.values()))
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __bool__(self) -> bool:
+        return bool(self._agents)
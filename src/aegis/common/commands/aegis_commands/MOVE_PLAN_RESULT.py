@@ -0,0 +1,37 @@
+from typing import override
+
+from aegis.common.commands.aegis_command import AegisCommand
+
+
+class MOVE_PLAN_RESULT(AegisCommand):
+    """
+    Represents the end of an agent's move plan.
+
+    Attributes:
+        result (str): Why the plan ended, one of COMPLETED, DANGER (the next move
+            was off the world or onto a fire or killer grid), LOW_ENERGY or MESSAGE.
+        moves_left (int): The number of moves of the plan that were not made.
+        rounds (int): The number of rounds the agent did not think during the plan.
+    """
+
+    COMPLETED = "COMPLETED"
+    DANGER = "DANGER"
+    LOW_ENERGY = "LOW_ENERGY"
+    MESSAGE = "MESSAGE"
+
+    def __init__(self, result: str, moves_left: int, rounds: int) -> None:
+        """
+        Initializes a MOVE_PLAN_RESULT instance.
+
+        Args:
+            result: Why the plan ended.
+            moves_left: The number of moves of the plan that were not made.
+            rounds: The number of rounds the agent did not think during the plan.
+        """
+        self.result = result
+        self.moves_left = moves_left
+        self.rounds = rounds
+
+    @override
+    def __str__(self) -> str:
+        return f"{self.STR_MOVE_PLAN_RESULT} ( RESULT {self.result} , MOVES_LEFT {self.moves_left} , ROUNDS {self.rounds} )"
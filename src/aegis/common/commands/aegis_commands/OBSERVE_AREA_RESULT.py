@@ -0,0 +1,63 @@
+from typing import override
+
+from aegis.common import Location
+from aegis.common.commands.aegis_command import AegisCommand
+from aegis.common.world.info import GridInfo
+
+
+class OBSERVE_AREA_RESULT(AegisCommand):
+    """
+    Represents the result of observing a rectangle of grids.
+
+    Attributes:
+        energy_level (int): The energy_level of the agent.
+        location (Location): The location of the corner of the rectangle observed with the lowest X and Y.
+        width (int): The number of grids observed along X.
+        height (int): The number of grids observed along Y.
+        grid_infos (list[GridInfo]): The information of the grids observed, ordered by X then Y.
+    """
+
+    def __init__(
+        self,
+        energy_level: int,
+        location: Location,
+        width: int,
+        height: int,
+        grid_infos: list[GridInfo],
+    ) -> None:
+        """
+        Initializes an OBSERVE_AREA_RESULT instance.
+
+        Args:
+            energy_level: The energy_level of the agent.
+            location: The location of the corner of the rectangle observed with the lowest X and Y.
+            width: The number of grids observed along X.
+            height: The number of grids observed along Y.
+            grid_infos: The information of the grids observed, ordered by X then Y.
+        """
+        self.energy_level = energy_level
+        self.location = location
+        self.width = width
+        self.height = height
+        self.grid_infos = grid_infos
+
+    def get_grid_info(self, location: Location) -> GridInfo | None:
+        """Returns the information of an observed grid, None if it wasn't observed."""
+        x = location.x - self.location.x
+        y = location.y - self.location.y
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.grid_infos[x * self.height + y]
+        return None
+
+    def _header(self) -> str:
+        return f"{self.STR_OBSERVE_AREA_RESULT} ( ENG_LEV {self.energy_level} , X {self.location.x} , Y {self.location.y} , WIDTH {self.width} , HEIGHT {self.height} , GRIDS ( "
+
+    @override
+    def __str__(self) -> str:
+        grids = " , ".join(str(grid_info) for grid_info in self.grid_infos)
+        return f"{self._header()}{grids} ) )"
+
+    @override
+    def encode(self) -> bytes:
+        grids = b" , ".join(grid_info.encode() for grid_info in self.grid_infos)
+        return self._header().encode("ascii") + grids + b" ) )"
@@ -1,3 +1,4 @@
+import copy
 from typing import override
 
 from aegis.common import LifeSignals
@@ -34,8 +35,16 @@ class OBSERVE_RESULT(AegisCommand):
     def __str__(self) -> str:
         return f"{self.STR_OBSERVE_RESULT} ( ENG_LEV {self.energy_level} , GRID_INFO ( {self.grid_info} ) , NUM_SIG {self.life_signals.size()} , LIFE_SIG {self.life_signals} )"
 
+    @override
+    def encode(self) -> bytes:
+        header = f"{self.STR_OBSERVE_RESULT} ( ENG_LEV {self.energy_level} , GRID_INFO ( "
+        footer = f" ) , NUM_SIG {self.life_signals.size()} , LIFE_SIG {self.life_signals} )"
+        return header.encode("ascii") + self.grid_info.encode() + footer.encode("ascii")
+
     def distort(self, factor: float) -> None:
         if factor <= 0:
             return
         self.life_signals.distort(int(factor))
+        # the GridInfo is shared with the other results of the round
+        self.grid_info = copy.deepcopy(self.grid_info)
         self.grid_info.distort_info(int(factor))
@@ -31,3 +31,8 @@ class SAVE_SURV_RESULT(AegisCommand):
     @override
     def __str__(self) -> str:
         return f"{self.STR_SAVE_SURV_RESULT} ( ENG_LEV {self.energy_level} , SUR_INFO {self.surround_info} )"
+
+    @override
+    def encode(self) -> bytes:
+        header = f"{self.STR_SAVE_SURV_RESULT} ( ENG_LEV {self.energy_level} , SUR_INFO "
+        return header.encode("ascii") + self.surround_info.encode() + b" )"
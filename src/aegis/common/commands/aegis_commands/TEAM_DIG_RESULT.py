@@ -27,3 +27,8 @@ class TEAM_DIG_RESULT(AegisCommand):
     @override
     def __str__(self) -> str:
         return f"{self.STR_TEAM_DIG_RESULT} ( ENG_LEV {self.energy_level} , {self.surround_info} )"
+
+    @override
+    def encode(self) -> bytes:
+        header = f"{self.STR_TEAM_DIG_RESULT} ( ENG_LEV {self.energy_level} , "
+        return header.encode("ascii") + self.surround_info.encode() + b" )"
@@ -8,7 +8,9 @@ __all__ = [
     "FWD_MESSAGE",
     "MESSAGES_END",
     "MESSAGES_START",
+    "MOVE_PLAN_RESULT",
     "MOVE_RESULT",
+    "OBSERVE_AREA_RESULT",
     "OBSERVE_RESULT",
     "ROUND_END",
     "ROUND_START",
@@ -26,7 +28,9 @@ from aegis.common.commands.aegis_commands.DISCONNECT import DISCONNECT
 from aegis.common.commands.aegis_commands.FWD_MESSAGE import FWD_MESSAGE
 from aegis.common.commands.aegis_commands.MESSAGES_END import MESSAGES_END
 from aegis.common.commands.aegis_commands.MESSAGES_START import MESSAGES_START
+from aegis.common.commands.aegis_commands.MOVE_PLAN_RESULT import MOVE_PLAN_RESULT
 from aegis.common.commands.aegis_commands.MOVE_RESULT import MOVE_RESULT
+from aegis.common.commands.aegis_commands.OBSERVE_AREA_RESULT import OBSERVE_AREA_RESULT
 from aegis.common.commands.aegis_commands.OBSERVE_RESULT import OBSERVE_RESULT
 from aegis.common.commands.aegis_commands.ROUND_END import ROUND_END
 from aegis.common.commands.aegis_commands.ROUND_START import ROUND_START
@@ -9,20 +9,26 @@ class CONNECT(AgentCommand):
 
     Attributes:
         group_name (str): The group name for the agent.
+        session (str | None): The session the agent joins, when AEGIS hosts several
+            simulations, None to join the only one.
     """
 
-    def __init__(self, group_name: str) -> None:
+    def __init__(self, group_name: str, session: str | None = None) -> None:
         """
         Initializes a CONNECT instance.
 
         Args:
             group_name: The group name for the agent.
+            session: The session the agent joins, None to join the only one.
         """
         self.group_name = group_name
+        self.session = session
 
     @override
     def __str__(self) -> str:
-        return f"{self.STR_CONNECT} ( {self.group_name} )"
+        if self.session is None:
+            return f"{self.STR_CONNECT} ( {self.group_name} )"
+        return f"{self.STR_CONNECT} ( {self.group_name} , SESSION {self.session} )"
 
     @override
     def proc_string(self) -> str:
@@ -0,0 +1,41 @@
+from typing import override
+
+from aegis.common import Direction
+from aegis.common.commands.agent_command import AgentCommand
+
+
+class MOVE_PLAN(AgentCommand):
+    """
+    Represents a command for an agent to move along a path over several rounds.
+
+    AEGIS makes one move of the plan every round, starting in the round the plan
+    is sent, without waiting for the agent. The agent does not get to think again
+    until the plan is done, the next move would be dangerous, the next move would
+    leave the agent with less than `min_energy` energy, or it gets a message.
+    It is then sent the result of its last move and a MOVE_PLAN_RESULT.
+
+    Attributes:
+        directions (list[Direction]): The directions to move in, in order.
+        min_energy (int): The least energy the agent must have left after a move.
+    """
+
+    def __init__(self, directions: list[Direction], min_energy: int = 1) -> None:
+        """
+        Initializes a MOVE_PLAN instance.
+
+        Args:
+            directions: The directions to move in, in order.
+            min_energy: The least energy the agent must have left after a move.
+        """
+        self.directions = directions
+        self.min_energy = min_energy
+
+    @override
+    def __str__(self) -> str:
+        directions = " , ".join(str(direction) for direction in self.directions)
+        return f"{self.STR_MOVE_PLAN} ( MIN_ENG {self.min_energy} , NUM_DIRS {len(self.directions)} , DIRS ( {directions} ) )"
+
+    @override
+    def proc_string(self) -> str:
+        directions = " ".join(str(direction) for direction in self.directions)
+        return f"{self._agent_id.proc_string()}#Move_Plan {directions}"
@@ -0,0 +1,39 @@
+from typing import override
+
+from aegis.common import Location
+from aegis.common.commands.agent_command import AgentCommand
+
+
+class OBSERVE_AREA(AgentCommand):
+    """
+    Represents a command for an agent to observe a rectangle of grids in the world.
+
+    The rectangle is cut down to the world and to the largest size AEGIS allows.
+    Unlike OBSERVE, no life signals are returned.
+
+    Attributes:
+        location (Location): The location of the corner of the rectangle with the lowest X and Y.
+        width (int): The number of grids along X.
+        height (int): The number of grids along Y.
+    """
+
+    def __init__(self, location: Location, width: int, height: int) -> None:
+        """
+        Initializes a OBSERVE_AREA instance.
+
+        Args:
+            location: The location of the corner of the rectangle with the lowest X and Y.
+            width: The number of grids along X.
+            height: The number of grids along Y.
+        """
+        self.location = location
+        self.width = width
+        self.height = height
+
+    @override
+    def __str__(self) -> str:
+        return f"{self.STR_OBSERVE_AREA} ( X {self.location.x} , Y {self.location.y} , WIDTH {self.width} , HEIGHT {self.height} )"
+
+    @override
+    def proc_string(self) -> str:
+        return f"{self._agent_id.proc_string()}#Observe_Area {self.location.proc_string()} {self.width}x{self.height}"
@@ -3,7 +3,9 @@ __all__ = [
     "CONNECT",
     "END_TURN",
     "MOVE",
+    "MOVE_PLAN",
     "OBSERVE",
+    "OBSERVE_AREA",
     "SAVE_SURV",
     "SEND_MESSAGE",
     "SLEEP",
@@ -15,7 +17,9 @@ from aegis.common.commands.agent_commands.AGENT_UNKNOWN import AGENT_UNKNOWN
 from aegis.common.commands.agent_commands.CONNECT import CONNECT
 from aegis.common.commands.agent_commands.END_TURN import END_TURN
 from aegis.common.commands.agent_commands.MOVE import MOVE
+from aegis.common.commands.agent_commands.MOVE_PLAN import MOVE_PLAN
 from aegis.common.commands.agent_commands.OBSERVE import OBSERVE
+from aegis.common.commands.agent_commands.OBSERVE_AREA import OBSERVE_AREA
 from aegis.common.commands.agent_commands.SAVE_SURV import SAVE_SURV
 from aegis.common.commands.agent_commands.SEND_MESSAGE import SEND_MESSAGE
 from aegis.common.commands.agent_commands.SLEEP import SLEEP
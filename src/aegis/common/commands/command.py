@@ -8,7 +8,9 @@ class Command(ABC):
     STR_CONNECT = "CONNECT"
     STR_END_TURN = "END_TURN"
     STR_MOVE = "MOVE"
+    STR_MOVE_PLAN = "MOVE_PLAN"
     STR_OBSERVE = "OBSERVE"
+    STR_OBSERVE_AREA = "OBSERVE_AREA"
     STR_SAVE_SURV = "SAVE_SURV"
     STR_SEND_MESSAGE = "SEND_MESSAGE"
     STR_SLEEP = "SLEEP"
@@ -23,6 +25,8 @@ class Command(ABC):
     STR_MESSAGES_END = "MESSAGES_END"
     STR_MESSAGES_START = "MESSAGES_START"
     STR_MOVE_RESULT = "MOVE_RESULT"
+    STR_MOVE_PLAN_RESULT = "MOVE_PLAN_RESULT"
+    STR_OBSERVE_AREA_RESULT = "OBSERVE_AREA_RESULT"
     STR_OBSERVE_RESULT = "OBSERVE_RESULT"
     STR_ROUND_END = "ROUND_END"
     STR_ROUND_START = "ROUND_START"
@@ -34,3 +38,7 @@ class Command(ABC):
     @override
     def __str__(self) -> str:
         pass
+
+    def encode(self) -> bytes:
+        """Returns the command as it is sent over the network."""
+        return str(self).encode("ascii")
@@ -7,6 +7,7 @@ class Constants:
         LOW_CHARGE (int): Currently not used.
         SUPER_CHARGE (int): Currently not used.
         AGENT_PORT (int): The default port used for agent and AEGIS communication.
+        AGENT_PORT_FILE (str): The file in the run directory AEGIS writes the agent port to.
         DEPTH_LOW_START (int): The low bound used for life signal distortion.
         DEPTH_HIGH_START (int): The upper bound used for life signal distortion.
         DEPTH_LOW_INC (int): The increment value for low distortion.
@@ -24,6 +25,7 @@ class Constants:
     LOW_CHARGE = 1
     SUPER_CHARGE = 20
     AGENT_PORT = 6001
+    AGENT_PORT_FILE = "agent_port.txt"
     DEPTH_LOW_START = 0
     DEPTH_HIGH_START = 5
     DEPTH_LOW_INC = 4
@@ -1,6 +1,8 @@
 import io
 import socket
+import struct
 
+from aegis.common.commands.command import Command
 from aegis.common.network.aegis_socket_exception import AegisSocketException
 
 
@@ -10,7 +12,7 @@ class AegisSocket:
     def __init__(self) -> None:
         """Initializes a AegisSocket instance."""
         self._socket: socket.socket | None = None
-        self._in_stream: io.BufferedReader | None = None
+        self._in_buffer: bytearray = bytearray()
         self._out_stream: io.BufferedWriter | None = None
 
     def connect(self, host: str, port: int) -> None:
@@ -26,7 +28,6 @@ class AegisSocket:
         """
         try:
             self._socket = socket.create_connection((host, port))
-            self._in_stream = self._socket.makefile("rb")
             self._out_stream = self._socket.makefile("wb")
         except Exception:
             raise AegisSocketException("Unable to connect to AEGIS.")
@@ -39,8 +40,7 @@ class AegisSocket:
         resources are released. It does nothing if the socket is already closed or not connected.
         """
         try:
-            if self._socket and self._in_stream and self._out_stream:
-                self._in_stream.close()
+            if self._socket and self._out_stream:
                 self._out_stream.close()
                 self._socket.close()
                 self._socket = None
@@ -66,25 +66,20 @@ class AegisSocket:
             AegisSocketException: If an error occurs while reading the message, such as an incomplete
                                  message or missing null byte.
         """
-        if self._socket and self._in_stream and self._out_stream:
+        if self._socket and self._out_stream:
             self._socket.settimeout(timeout)
             try:
-                size_data = self._in_stream.read(4)
-                if len(size_data) < 4:
-                    raise AegisSocketException("Couldn't read message length.")
-
-                size = int.from_bytes(size_data, "little")
-                size -= 1
-
-                message_data = self._in_stream.read(size)
-                if len(message_data) < size:
-                    raise AegisSocketException("Message is shorter than expected.")
-
-                null_byte = self._in_stream.read(1)
-                if len(null_byte) < 1:
-                    raise AegisSocketException("Null byte is missing.")
-
-                return message_data.decode("ascii").strip()
+                # AEGIS sends all of a round's messages at once, so they are
+                # received in one go and handed out from the buffer
+                while True:
+                    message = self._next_buffered_message()
+                    if message is not None:
+                        return message
+
+                    data = self._socket.recv(65536)
+                    if not data:
+                        raise AegisSocketException("Couldn't read message length.")
+                    self._in_buffer += data
 
             except socket.timeout:
                 return None
@@ -93,6 +88,41 @@ class AegisSocket:
             finally:
                 self._socket.settimeout(None)
 
+    def _next_buffered_message(self) -> str | None:
+        """
+        Removes the first complete message from the input buffer.
+
+        Returns:
+            The message, or None if the buffer doesn't hold a complete message yet.
+        """
+        if len(self._in_buffer) < 4:
+            return None
+
+        size = struct.unpack_from("<I", self._in_buffer)[0]
+        if size < 1:
+            raise AegisSocketException("Couldn't read message length.")
+        if len(self._in_buffer) < 4 + size:
+            return None
+
+        if self._in_buffer[4 + size - 1] != 0:
+            raise AegisSocketException("Null byte is missing.")
+
+        message_data = bytes(self._in_buffer[4 : 4 + size - 1])
+        del self._in_buffer[: 4 + size]
+        return message_data.decode("ascii").strip()
+
+    def send_command(self, command: Command) -> None:
+        """
+        Sends a command to AEGIS.
+
+        Args:
+            command: The command to be sent to AEGIS.
+
+        Raises:
+            AegisSocketException: If an error occurs while sending the command.
+        """
+        self.send_message(str(command))
+
     def send_message(self, message: str) -> None:
         """
         Sends a message to AEGIS.
@@ -0,0 +1,38 @@
+from collections import deque
+
+from aegis.common.commands.command import Command
+from aegis.common.network.aegis_socket_exception import AegisSocketException
+
+
+class LocalAegisSocket:
+    """
+    Represents an in-memory connection to AEGIS, for agents running inside the AEGIS process.
+
+    Commands are handed to AEGIS as objects, so they are never turned into text and parsed.
+
+    Attributes:
+        outbox: The commands sent by the agent that AEGIS hasn't read yet.
+    """
+
+    def __init__(self) -> None:
+        """Initializes a connected LocalAegisSocket instance."""
+        self.outbox: deque[Command] = deque()
+        self._connected: bool = True
+
+    def disconnect(self) -> None:
+        """Disconnects from AEGIS, commands sent afterwards are rejected."""
+        self._connected = False
+
+    def send_command(self, command: Command) -> None:
+        """
+        Sends a command to AEGIS.
+
+        Args:
+            command: The command to be sent to AEGIS.
+
+        Raises:
+            AegisSocketException: If the connection has been closed.
+        """
+        if not self._connected:
+            raise AegisSocketException("Unable to send message to AEGIS.")
+        self.outbox.append(command)
@@ -23,7 +23,9 @@ from aegis.common.commands.aegis_commands import (
     FWD_MESSAGE,
     MESSAGES_END,
     MESSAGES_START,
+    MOVE_PLAN_RESULT,
     MOVE_RESULT,
+    OBSERVE_AREA_RESULT,
     OBSERVE_RESULT,
     ROUND_END,
     ROUND_START,
@@ -37,7 +39,9 @@ from aegis.common.commands.agent_commands import (
     CONNECT,
     END_TURN,
     MOVE,
+    MOVE_PLAN,
     OBSERVE,
+    OBSERVE_AREA,
     SAVE_SURV,
     SEND_MESSAGE,
     SLEEP,
@@ -217,6 +221,20 @@ class AegisParser:
                 AegisParser.close_round_bracket(tokens)
                 AegisParser.done(tokens)
                 return MESSAGES_START(messages)
+            elif string.startswith(Command.STR_MOVE_PLAN_RESULT):
+                AegisParser.text(tokens, Command.STR_MOVE_PLAN_RESULT)
+                AegisParser.open_round_bracket(tokens)
+                AegisParser.text(tokens, "RESULT")
+                result = next(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "MOVES_LEFT")
+                moves_left = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "ROUNDS")
+                rounds = AegisParser.integer(tokens)
+                AegisParser.close_round_bracket(tokens)
+                AegisParser.done(tokens)
+                return MOVE_PLAN_RESULT(result, moves_left, rounds)
             elif string.startswith(Command.STR_MOVE_RESULT):
                 AegisParser.text(tokens, Command.STR_MOVE_RESULT)
                 AegisParser.open_round_bracket(tokens)
@@ -227,6 +245,37 @@ class AegisParser:
                 AegisParser.close_round_bracket(tokens)
                 AegisParser.done(tokens)
                 return MOVE_RESULT(energy_level, surround_information)
+            elif string.startswith(Command.STR_OBSERVE_AREA_RESULT):
+                AegisParser.text(tokens, Command.STR_OBSERVE_AREA_RESULT)
+                AegisParser.open_round_bracket(tokens)
+                AegisParser.text(tokens, "ENG_LEV")
+                energy_level = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "X")
+                x = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "Y")
+                y = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "WIDTH")
+                width = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "HEIGHT")
+                height = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "GRIDS")
+                AegisParser.open_round_bracket(tokens)
+                grid_infos: list[GridInfo] = []
+                for i in range(width * height):
+                    grid_infos.append(AegisParser.grid_info(tokens))
+                    if i < width * height - 1:
+                        AegisParser.comma(tokens)
+                AegisParser.close_round_bracket(tokens)
+                AegisParser.close_round_bracket(tokens)
+                AegisParser.done(tokens)
+                return OBSERVE_AREA_RESULT(
+                    energy_level, Location(x, y), width, height, grid_infos
+                )
             elif string.startswith(Command.STR_OBSERVE_RESULT):
                 AegisParser.text(tokens, Command.STR_OBSERVE_RESULT)
                 AegisParser.open_round_bracket(tokens)
@@ -301,13 +350,37 @@ class AegisParser:
                 AegisParser.text(tokens, Command.STR_CONNECT)
                 AegisParser.open_round_bracket(tokens)
                 group_name = next(tokens)
-                AegisParser.close_round_bracket(tokens)
+                session = None
+                token = next(tokens)
+                if token == ",":
+                    AegisParser.text(tokens, "SESSION")
+                    session = next(tokens)
+                    AegisParser.close_round_bracket(tokens)
+                elif token != ")":
+                    raise AegisParserException(f"Expected: ')', found: {token}")
                 AegisParser.done(tokens)
-                return CONNECT(group_name)
+                return CONNECT(group_name, session)
             elif string.startswith(Command.STR_END_TURN):
                 AegisParser.text(tokens, Command.STR_END_TURN)
                 AegisParser.done(tokens)
                 return END_TURN()
+            # MOVE is a prefix of MOVE_PLAN, so MOVE_PLAN is checked first
+            elif string.startswith(Command.STR_MOVE_PLAN):
+                AegisParser.text(tokens, Command.STR_MOVE_PLAN)
+                AegisParser.open_round_bracket(tokens)
+                AegisParser.text(tokens, "MIN_ENG")
+                min_energy = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "NUM_DIRS")
+                num_dirs = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "DIRS")
+                AegisParser.open_round_bracket(tokens)
+                directions = AegisParser.direction_list(tokens, num_dirs)
+                AegisParser.close_round_bracket(tokens)
+                AegisParser.close_round_bracket(tokens)
+                AegisParser.done(tokens)
+                return MOVE_PLAN(directions, min_energy)
             elif string.startswith(Command.STR_MOVE):
                 AegisParser.text(tokens, Command.STR_MOVE)
                 AegisParser.open_round_bracket(tokens)
@@ -315,6 +388,24 @@ class AegisParser:
                 AegisParser.close_round_bracket(tokens)
                 AegisParser.done(tokens)
                 return MOVE(dir)
+            # OBSERVE is a prefix of OBSERVE_AREA, so OBSERVE_AREA is checked first
+            elif string.startswith(Command.STR_OBSERVE_AREA):
+                AegisParser.text(tokens, Command.STR_OBSERVE_AREA)
+                AegisParser.open_round_bracket(tokens)
+                AegisParser.text(tokens, "X")
+                x = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "Y")
+                y = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "WIDTH")
+                width = AegisParser.integer(tokens)
+                AegisParser.comma(tokens)
+                AegisParser.text(tokens, "HEIGHT")
+                height = AegisParser.integer(tokens)
+                AegisParser.close_round_bracket(tokens)
+                AegisParser.done(tokens)
+                return OBSERVE_AREA(Location(x, y), width, height)
             elif string.startswith(Command.STR_OBSERVE):
                 AegisParser.text(tokens, Command.STR_OBSERVE)
                 AegisParser.open_round_bracket(tokens)
@@ -411,6 +502,15 @@ class AegisParser:
         except Exception:
             raise AegisParserException(f"Expected: <Direction>, found: {token} ")
 
+    @staticmethod
+    def direction_list(tokens: Iterator[str], num_dirs: int) -> list[Direction]:
+        directions: list[Direction] = []
+        for i in range(num_dirs):
+            directions.append(AegisParser.direction(tokens))
+            if i < num_dirs - 1:
+                AegisParser.comma(tokens)
+        return directions
+
     @staticmethod
     def id_list(tokens: Iterator[str], number_left_to_read: int) -> AgentIDList:
         id_list = AgentIDList()
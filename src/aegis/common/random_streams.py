@@ -0,0 +1,181 @@
+from collections.abc import Iterable, Sequence
+
+_MASK = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _mix(z: int) -> int:
+    """The SplitMix64 finalizer, scrambles a 64-bit number."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+class RandomStream:
+    """
+    A stream of random numbers for one key, see `RandomStreams.stream`.
+
+    The numbers are generated in blocks, of `FIRST_BLOCK_SIZE` numbers first as
+    most streams are only drawn from a few times, then of `BLOCK_SIZE`. The n-th
+    number of a stream only depends on its key and n.
+    """
+
+    FIRST_BLOCK_SIZE = 4
+    BLOCK_SIZE = 32
+
+    def __init__(self, key: int) -> None:
+        """
+        Args:
+            key: The key of the stream.
+        """
+        self._key = key
+        self._counter = 0
+        self._block: list[int] = []
+        self._index = 0
+
+    def _next(self) -> int:
+        if self._index == len(self._block):
+            self._block = self.block(
+                self.BLOCK_SIZE if self._counter else self.FIRST_BLOCK_SIZE
+            )
+            self._index = 0
+        value = self._block[self._index]
+        self._index += 1
+        return value
+
+    def block(self, count: int) -> list[int]:
+        """
+        Returns the next `count` numbers of the stream, between 0 and 2^64 - 1.
+
+        Args:
+            count: The number of numbers.
+        """
+        key = self._key
+        start = self._counter + 1
+        self._counter += count
+        return [
+            _mix((key + counter * _GOLDEN_GAMMA) & _MASK)
+            for counter in range(start, start + count)
+        ]
+
+    def random_in_range(self, low: int, high: int) -> int:
+        """
+        Returns a random number between low and high, both included.
+
+        Args:
+            low: The lower bound of the range.
+            high: The upper bound of the range.
+        """
+        return low + ((self._next() * (high - low + 1)) >> 64)
+
+    def randoms_in_range(self, low: int, high: int, count: int) -> list[int]:
+        """
+        Returns `count` random numbers between low and high, both included.
+
+        Args:
+            low: The lower bound of the range.
+            high: The upper bound of the range.
+            count: The number of numbers.
+        """
+        size = high - low + 1
+        return [low + ((value * size) >> 64) for value in self.block(count)]
+
+    def next_boolean(self) -> bool:
+        """Returns a random boolean value."""
+        return self._next() >> 63 == 1
+
+    def choice[T](self, seq: Sequence[T]) -> T:
+        """
+        Returns a random element of a sequence.
+
+        Args:
+            seq: The sequence, it must not be empty.
+        """
+        return seq[self.random_in_range(0, len(seq) - 1)]
+
+
+class RandomStreams:
+    """
+    The random numbers of a world, split into independent streams.
+
+    A stream is picked by a subsystem, a round and the entity that draws from it,
+    like a survivor or a grid. The numbers of a stream only depend on the seed and
+    that key, not on what was drawn before from other streams, so subsystems and
+    entities can be run in any order, or in parallel, and still draw the same
+    numbers for the same seed.
+
+    Attributes:
+        seed (int): The seed of the streams.
+    """
+
+    FIRE = 1
+    SURVIVORS = 2
+    SURVIVOR_GROUPS = 3
+    LIFE_SIGNALS = 4
+    SPAWN = 5
+    WORLD_INFO = 6
+    POINTS = 7
+
+    def __init__(self, seed: int) -> None:
+        """
+        Args:
+            seed: The seed of the streams.
+        """
+        self.seed = seed
+        self._seed_key = _mix(seed & _MASK)
+
+    def stream(self, subsystem: int, round: int, *entity: int) -> RandomStream:
+        """
+        Returns the stream of a subsystem for an entity in a round.
+
+        Args:
+            subsystem: The subsystem, one of the constants of this class.
+            round: The round, 0 for draws that don't belong to a round.
+            *entity: The numbers that identify the entity, like its ID or location.
+        """
+        key = _mix(self._seed_key ^ subsystem)
+        for part in (round, *entity):
+            key = _mix(((key ^ (part & _MASK)) + _GOLDEN_GAMMA) & _MASK)
+        return RandomStream(key)
+
+    def stream_keys(
+        self, subsystem: int, round: int, entities: Iterable[int]
+    ) -> list[int]:
+        """
+        Returns the keys of the streams of many entities of a subsystem in a round,
+        to draw from them at once with `numbers_in_range`.
+
+        Args:
+            subsystem: The subsystem, one of the constants of this class.
+            round: The round, 0 for draws that don't belong to a round.
+            entities: The IDs of the entities.
+
+        Returns:
+            The key of `stream(subsystem, round, entity)` for every entity.
+        """
+        key = _mix(self._seed_key ^ subsystem)
+        round_key = _mix(((key ^ (round & _MASK)) + _GOLDEN_GAMMA) & _MASK)
+        return [
+            _mix(((round_key ^ (entity & _MASK)) + _GOLDEN_GAMMA) & _MASK)
+            for entity in entities
+        ]
+
+    @staticmethod
+    def numbers_in_range(
+        keys: Iterable[int], n: int, low: int, high: int
+    ) -> list[int]:
+        """
+        Returns the n-th number of many streams, between low and high, both included.
+
+        The numbers are the ones the n-th `RandomStream.random_in_range(low, high)`
+        of each stream returns.
+
+        Args:
+            keys: The keys of the streams, see `stream_keys`.
+            n: The number of the draw, 1 for the first.
+            low: The lower bound of the range.
+            high: The upper bound of the range.
+        """
+        size = high - low + 1
+        step = (n * _GOLDEN_GAMMA) & _MASK
+        return [low + ((_mix((key + step) & _MASK) * size) >> 64) for key in keys]
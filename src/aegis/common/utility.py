@@ -1,3 +1,4 @@
+import hashlib
 import random
 import sys
 from enum import Enum
@@ -39,6 +40,33 @@ class Utility:
         """
         random.seed(seed)
 
+    @staticmethod
+    def get_random_state() -> object:
+        """Returns the state of the random number generator, see `set_random_state`."""
+        return random.getstate()
+
+    @staticmethod
+    def set_random_state(state: object) -> None:
+        """
+        Restores the random number generator to a state returned by `get_random_state`.
+
+        Args:
+            state: The state to restore.
+        """
+        random.setstate(state)  # pyright: ignore[reportArgumentType]
+
+    @staticmethod
+    def digest(text: str) -> int:
+        """
+        Returns a 64-bit digest of a text, the same on every platform and Python version.
+
+        Args:
+            text: The text to digest.
+        """
+        return int.from_bytes(
+            hashlib.blake2b(text.encode(), digest_size=8).digest(), "little"
+        )
+
     @staticmethod
     def next_int() -> int:
         """Returns a random number between 0 and sys.maxsize."""
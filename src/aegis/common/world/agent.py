@@ -3,12 +3,16 @@ from __future__ import annotations
 from typing import override
 
 from aegis.common import AgentID, Constants, Direction, Location
+from aegis.common.world.agent_store import AgentStore
 
 
 class Agent:
     """
     Represents an agent in the simulation.
 
+    The energy level and location of the agent are kept in an `AgentStore`, the agent
+    is a view of its slot. An agent that isn't in a world has a store of its own.
+
     Attributes:
         agent_id (AgentID): The unique AgentID of the agent.
         location (Location): The starting location of the agent.
@@ -22,6 +26,8 @@ class Agent:
         agent_id: AgentID,
         location: Location,
         energy_level: int = Constants.DEFAULT_MAX_ENERGY_LEVEL,
+        store: AgentStore | None = None,
+        slot: int | None = None,
     ) -> None:
         """
         Initializes an Agent instance.
@@ -30,17 +36,55 @@ class Agent:
             agent_id: The unique AgentID of the agent.
             location: The starting location of the agent.
             energy_level: The starting energy level of the agent.
+            store: The store to keep the agent's state in, None for a store of its own.
+            slot: The slot of the store the agent's state is already kept in, None
+                to add the agent to the store.
         """
         self.agent_id = agent_id
-        self.location = location
-        self._energy_level = energy_level
+        self._store = store if store is not None else AgentStore()
+        if slot is None:
+            self._slot = self._store.add(agent_id, location, energy_level)
+        else:
+            self._slot = slot
         self.orientation = Direction.CENTER
         self.command_sent = "None"
         self.steps_taken = 0
 
+    @property
+    def store(self) -> AgentStore:
+        """The store the agent's state is kept in."""
+        return self._store
+
+    @property
+    def slot(self) -> int:
+        """The agent's slot in its store."""
+        return self._slot
+
+    @property
+    def location(self) -> Location:
+        return self._store.get_location(self._slot)
+
+    @location.setter
+    def location(self, location: Location) -> None:
+        self._store.set_location(self._slot, location)
+
+    def move_to_store(self, store: AgentStore) -> None:
+        """
+        Moves the agent's state into another store.
+
+        Args:
+            store: The store to keep the agent's state in from now on.
+        """
+        if store is self._store:
+            return
+        slot = store.add(self.agent_id, self.location, self.get_energy_level())
+        self._store.remove(self._slot)
+        self._store = store
+        self._slot = slot
+
     def get_energy_level(self) -> int:
         """Returns the energy level of the agent."""
-        return self._energy_level
+        return self._store.get_energy_level(self._slot)
 
     def set_energy_level(self, energy_level: int) -> None:
         """
@@ -52,7 +96,7 @@ class Agent:
         Args:
             energy_level: The new energy level of the agent.
         """
-        self._energy_level = energy_level
+        self._store.set_energy_level(self._slot, energy_level)
 
     def add_energy(self, energy: int) -> None:
         """
@@ -65,7 +109,7 @@ class Agent:
             energy: The amount of energy to add.
         """
         if energy >= 0:
-            self._energy_level += energy
+            self.set_energy_level(self.get_energy_level() + energy)
 
     def remove_energy(self, energy: int) -> None:
         """
@@ -77,10 +121,7 @@ class Agent:
         Args:
             energy: The amount of energy to remove.
         """
-        if energy < self._energy_level:
-            self._energy_level -= energy
-        else:
-            self._energy_level = 0
+        self._store.remove_energy((self._slot,), energy)
             
     def add_step_taken(self) -> None:
         """Increments the number of steps taken by the agent."""
@@ -99,19 +140,26 @@ class Agent:
         return [
             f"AgentID       = {self.agent_id}",
             f"Location      = {self.location}",
-            f"Energy Level  = {self._energy_level}",
+            f"Energy Level  = {self.get_energy_level()}",
             f"Command Sent  = {self.command_sent}",
             f"Steps Taken   = {self.steps_taken}",
         ]
 
-    def clone(self) -> Agent:
+    def clone(self, store: AgentStore | None = None) -> Agent:
         """
         Creates and returns a new Agent instance with the same attributes as the current instance.
 
+        Args:
+            store: A copy of the agent's store for the new agent to view the same slot
+                of, None to give the new agent a store of its own.
+
         Returns:
             Agent: A new Agent object with the same ID, location, energy level, state, orientation, and command history.
         """
-        agent = Agent(self.agent_id, self.location, self._energy_level)
+        if store is not None:
+            agent = Agent(self.agent_id, self.location, store=store, slot=self._slot)
+        else:
+            agent = Agent(self.agent_id, self.location, self.get_energy_level())
         agent.orientation = self.orientation
         agent.command_sent = self.command_sent
         agent.steps_taken = self.steps_taken
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from itertools import compress
+
+from aegis.common import AgentID, Location, Utility
+
+
+class AgentStore:
+    """
+    Holds the state of agents in columns, one slot per agent.
+
+    The IDs, GIDs, locations and energy levels of the agents are kept in `array`
+    columns, and an `Agent` is a view of its slot. Energy costs and charges are
+    applied to many slots at once, without going through every `Agent`.
+
+    The store remembers the slots whose energy level or location changed since they
+    were last taken, so the agents that could have died in a round are found without
+    checking every agent. Slots are handed out in the order agents are added and are
+    not reused, so they are ordered like the agents were added.
+
+    It also keeps a digest of the state of every agent in it, updated with every
+    change to a slot.
+    """
+
+    def __init__(self) -> None:
+        self._ids: array[int] = array("q")
+        self._gids: array[int] = array("q")
+        self._x: array[int] = array("q")
+        self._y: array[int] = array("q")
+        self._energy: array[int] = array("q")
+        self._in_use: bytearray = bytearray()
+        self._changed: set[int] = set()
+        self._digests: array[int] = array("Q")
+        self._digest: int = 0
+
+    def add(self, agent_id: AgentID, location: Location, energy_level: int) -> int:
+        """
+        Adds an agent, the new slot counts as changed.
+
+        Args:
+            agent_id: The AgentID of the agent.
+            location: The location of the agent.
+            energy_level: The energy level of the agent.
+
+        Returns:
+            The slot of the agent.
+        """
+        slot = len(self._energy)
+        self._ids.append(agent_id.id)
+        self._gids.append(agent_id.gid)
+        self._x.append(location.x)
+        self._y.append(location.y)
+        self._energy.append(energy_level)
+        self._in_use.append(1)
+        self._changed.add(slot)
+        self._digests.append(0)
+        self._update_digest(slot)
+        return slot
+
+    def copy(self) -> AgentStore:
+        """Returns a copy of the store, with the same slots."""
+        store = AgentStore()
+        store._ids = array("q", self._ids)
+        store._gids = array("q", self._gids)
+        store._x = array("q", self._x)
+        store._y = array("q", self._y)
+        store._energy = array("q", self._energy)
+        store._in_use = bytearray(self._in_use)
+        store._changed = set(self._changed)
+        store._digests = array("Q", self._digests)
+        store._digest = self._digest
+        return store
+
+    def remove(self, slot: int) -> None:
+        """Frees a slot, it is never handed out again."""
+        self._in_use[slot] = 0
+        self._changed.discard(slot)
+        self._digest ^= self._digests[slot]
+        self._digests[slot] = 0
+
+    def _update_digest(self, slot: int) -> None:
+        digest = Utility.digest(
+            f"{self._ids[slot]},{self._gids[slot]},{self._energy[slot]},"
+            f"{self._x[slot]},{self._y[slot]}"
+        )
+        self._digest ^= self._digests[slot] ^ digest
+        self._digests[slot] = digest
+
+    def get_digest(self) -> int:
+        """Returns the digest of the state of the agents in the store, XOR of their digests."""
+        return self._digest
+
+    def get_location(self, slot: int) -> Location:
+        return Location(self._x[slot], self._y[slot])
+
+    def set_location(self, slot: int, location: Location) -> None:
+        self._x[slot] = location.x
+        self._y[slot] = location.y
+        self._changed.add(slot)
+        self._update_digest(slot)
+
+    def get_energy_level(self, slot: int) -> int:
+        return self._energy[slot]
+
+    def set_energy_level(self, slot: int, energy_level: int) -> None:
+        self._energy[slot] = energy_level
+        self._changed.add(slot)
+        self._update_digest(slot)
+
+    def remove_energy(self, slots: Iterable[int], energy: int) -> None:
+        """
+        Removes energy from agents, an agent doesn't go below zero energy.
+
+        Args:
+            slots: The slots of the agents.
+            energy: The amount of energy to remove from every agent.
+        """
+        column = self._energy
+        for slot in slots:
+            energy_level = column[slot]
+            column[slot] = energy_level - energy if energy < energy_level else 0
+            self._changed.add(slot)
+            self._update_digest(slot)
+
+    def add_energy(self, slots: Iterable[int], energy: int, max_energy: int) -> None:
+        """
+        Adds energy to agents, an agent doesn't go above the maximum energy.
+
+        Args:
+            slots: The slots of the agents.
+            energy: The amount of energy to add to every agent.
+            max_energy: The most energy an agent can have.
+        """
+        column = self._energy
+        for slot in slots:
+            column[slot] = min(column[slot] + energy, max_energy)
+            self._changed.add(slot)
+            self._update_digest(slot)
+
+    def touch(self, slot: int) -> None:
+        """Counts a slot as changed, so it is checked again."""
+        if self._in_use[slot]:
+            self._changed.add(slot)
+
+    def get_states(self) -> list[tuple[int, int, int, int, int]]:
+        """
+        Returns the state of every agent, in the order the agents were added.
+
+        Returns:
+            The ID, GID, energy level, x and y of every agent.
+        """
+        return list(
+            compress(
+                zip(self._ids, self._gids, self._energy, self._x, self._y),
+                self._in_use,
+            )
+        )
+
+    def take_changed_states(self) -> list[tuple[int, int, int, int, int]]:
+        """
+        Returns the state of the agents that changed since the last call, in the
+        order the agents were added.
+
+        Returns:
+            The ID, GID, energy level, x and y of every agent that changed.
+        """
+        ids, gids, energy, x, y = self._ids, self._gids, self._energy, self._x, self._y
+        states = [
+            (ids[slot], gids[slot], energy[slot], x[slot], y[slot])
+            for slot in sorted(self._changed)
+        ]
+        self._changed.clear()
+        return states
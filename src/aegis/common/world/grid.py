@@ -8,6 +8,7 @@ from aegis.common import (
     GridType,
     LifeSignals,
     Location,
+    RandomStream,
     Utility,
 )
 from aegis.common.world.info import NoLayersInfo, GridInfo, WorldObjectInfo
@@ -150,6 +151,18 @@ class Grid:
         """Sets the grid state to KILLER_GRID."""
         self._state = _State.KILLER_GRID
 
+    def digest(self) -> int:
+        """
+        Returns a digest of the state of the grid: its type, fire, move cost,
+        layers and agents.
+        """
+        layers = ";".join(f"{layer.id}{layer.json()}" for layer in self._grid_layer_list)
+        agents = sorted((agent_id.id, agent_id.gid) for agent_id in self.agent_id_list)
+        return Utility.digest(
+            f"{self.location.proc_string()}{self._type.value},{self._state.value},"
+            f"{self._on_fire},{self.move_cost}|{layers}|{agents}"
+        )
+
     def get_grid_layers(self) -> list[WorldObject]:
         """Returns the list of grid layers."""
         return self._grid_layer_list
@@ -163,6 +176,19 @@ class Grid:
         """
         self._grid_layer_list.append(layer)
 
+    def replace_layer(self, layer: WorldObject, new_layer: WorldObject) -> None:
+        """
+        Replaces a layer of the grid, if it is in the grid.
+
+        Args:
+            layer: The layer to replace.
+            new_layer: The layer to put in its place.
+        """
+        for i, grid_layer in enumerate(self._grid_layer_list):
+            if grid_layer is layer:
+                self._grid_layer_list[i] = new_layer
+                return
+
     def remove_top_layer(self) -> WorldObject | None:
         """
         Removes and returns the top layer from the grid.
@@ -240,7 +266,7 @@ class Grid:
             self.location.clone(),
             self._on_fire,
             self.move_cost,
-            self.agent_id_list.clone(),
+            self.agent_id_list.snapshot(),
             self.top_layer_info(),
         )
 
@@ -262,8 +288,13 @@ class Grid:
                 count += layer.number_of_survivors
         return count
 
-    def get_generated_life_signals(self) -> LifeSignals:
-        """Returns the generated life signals based on the layers in the grid."""
+    def get_generated_life_signals(self, stream: RandomStream) -> LifeSignals:
+        """
+        Returns the generated life signals based on the layers in the grid.
+
+        Args:
+            stream: The stream to draw the distortion of the deeper layers from.
+        """
         layer = self.number_of_layers() - 1
         i = 0
         if not self._grid_layer_list:
@@ -277,7 +308,7 @@ class Grid:
         high_range = Constants.DEPTH_HIGH_START
         while layer >= 0:
             lss = self._grid_layer_list[layer].get_life_signal()
-            distortion = Utility.random_in_range(low_range, high_range)
+            distortion = stream.random_in_range(low_range, high_range)
             if distortion > lss:
                 lss = 0
             else:
@@ -298,10 +329,15 @@ class Grid:
         s += "\t\t}\n\n"
         return s
 
-    def clone(self) -> Grid:
+    def clone(self, clone_layers: bool = True) -> Grid:
         """
         Creates and returns a copy of the grid.
 
+        Args:
+            clone_layers: False to share the layers and the agent IDs with the copy,
+                only the list of layers is copied and the list of agent IDs is
+                copied on write.
+
         Returns:
             Grid: A new Grid instance with the same attributes.
         """
@@ -309,9 +345,14 @@ class Grid:
         grid._type = self._type
         grid._state = self._state
         grid.location = self.location
-        grid.agent_id_list = self.agent_id_list.clone()
-        grid._grid_layer_list = [layer.clone() for layer in self._grid_layer_list]
+        if clone_layers:
+            grid.agent_id_list = self.agent_id_list.clone()
+            grid._grid_layer_list = [layer.clone() for layer in self._grid_layer_list]
+        else:
+            grid.agent_id_list = self.agent_id_list.snapshot()
+            grid._grid_layer_list = list(self._grid_layer_list)
         grid._on_fire = self._on_fire
         grid.move_cost = self.move_cost
         grid.percent_chance = self.percent_chance
+        grid.stored_life_signals = self.stored_life_signals
         return grid
@@ -48,9 +48,22 @@ class GridInfo:
         self.top_layer_info = (
             top_layer_info if top_layer_info is not None else NoLayersInfo()
         )
+        self._encoded: bytes | None = None
 
     def distort_info(self, factor: int) -> None:
         self.top_layer_info.distort_info(factor)
+        self._encoded = None
+
+    def encode(self) -> bytes:
+        """
+        Returns the GridInfo as it is sent over the network.
+
+        The bytes are built once and kept, a GridInfo is shared by every result
+        built from it and is not changed after being sent.
+        """
+        if self._encoded is None:
+            self._encoded = str(self).encode("ascii")
+        return self._encoded
 
     @override
     def __str__(self) -> str:
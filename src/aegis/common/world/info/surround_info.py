@@ -3,6 +3,17 @@ from typing import override
 from aegis.common import Direction, LifeSignals
 from aegis.common.world.info.grid_info import GridInfo
 
+_SURROUND_DIRECTIONS = [
+    (b" , NORTH_WEST ( ", Direction.NORTH_WEST),
+    (b" ) , NORTH ( ", Direction.NORTH),
+    (b" ) , NORTH_EAST ( ", Direction.NORTH_EAST),
+    (b" ) , EAST ( ", Direction.EAST),
+    (b" ) , SOUTH_EAST ( ", Direction.SOUTH_EAST),
+    (b" ) , SOUTH ( ", Direction.SOUTH),
+    (b" ) , SOUTH_WEST ( ", Direction.SOUTH_WEST),
+    (b" ) , WEST ( ", Direction.WEST),
+]
+
 
 class SurroundInfo:
     """
@@ -12,14 +23,28 @@ class SurroundInfo:
         life_signals (LifeSignals): The life signals in each surrounding grid.
     """
 
-    def __init__(self) -> None:
-        """Initializes a new instance of SurroundInfo."""
-        self.life_signals = LifeSignals()
-        self._surround_info = [[GridInfo() for _ in range(3)] for _ in range(3)]
+    def __init__(
+        self,
+        life_signals: LifeSignals | None = None,
+        grid_infos: dict[Direction, GridInfo] | None = None,
+    ) -> None:
+        """
+        Initializes a new instance of SurroundInfo.
+
+        Args:
+            life_signals: The life signals of the current grid cell.
+            grid_infos: The grid info in every direction, including CENTER.
+        """
+        self.life_signals = life_signals if life_signals is not None else LifeSignals()
+        self._surround_info = (
+            grid_infos
+            if grid_infos is not None
+            else {direction: GridInfo() for direction in Direction}
+        )
 
     def get_current_info(self) -> GridInfo:
         """Returns the grid info for the current grid cell."""
-        return self._surround_info[Direction.CENTER.dx][Direction.CENTER.dy]
+        return self._surround_info[Direction.CENTER]
 
     def set_current_info(self, current_info: GridInfo) -> None:
         """
@@ -28,7 +53,7 @@ class SurroundInfo:
         Args:
             current_info: The grid info for the current cell.
         """
-        self._surround_info[Direction.CENTER.dx][Direction.CENTER.dy] = current_info
+        self._surround_info[Direction.CENTER] = current_info
 
     def get_surround_info(self, dir: Direction) -> GridInfo | None:
         """
@@ -37,7 +62,7 @@ class SurroundInfo:
         Args:
             dir: The direction for which to get the surrounding grid information.
         """
-        return self._surround_info[dir.dx][dir.dy]
+        return self._surround_info[dir]
 
     def set_surround_info(self, dir: Direction, grid_info: GridInfo) -> None:
         """
@@ -47,7 +72,7 @@ class SurroundInfo:
             dir: The direction for which to set the surrounding grid information.
             grid_info: The grid info to be set for the specified direction.
         """
-        self._surround_info[dir.dx][dir.dy] = grid_info
+        self._surround_info[dir] = grid_info
 
     @override
     def __str__(self) -> str:
@@ -62,3 +87,13 @@ class SurroundInfo:
             f"SOUTH_WEST ( {self.get_surround_info(Direction.SOUTH_WEST)} ) , "
             f"WEST ( {self.get_surround_info(Direction.WEST)} )"
         )
+
+    def encode(self) -> bytes:
+        """Returns the SurroundInfo as it is sent over the network, joined from the encoded GridInfos."""
+        signals = f" ) , NUM_SIG {self.life_signals.size()} , LIFE_SIG {self.life_signals}"
+        parts = [b"CURR_GRID ( ", self.get_current_info().encode(), signals.encode("ascii")]
+        for separator, direction in _SURROUND_DIRECTIONS:
+            parts.append(separator)
+            parts.append(self._surround_info[direction].encode())
+        parts.append(b" )")
+        return b"".join(parts)
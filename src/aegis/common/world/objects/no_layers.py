@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import cast, override
+from typing import override
 
 from aegis.common.world.info import NoLayersInfo, WorldObjectInfo
 from aegis.common.world.objects.world_object import WorldObject
@@ -46,4 +46,7 @@ class NoLayers(WorldObject):
 
     @override
     def clone(self) -> NoLayers:
-        return cast(NoLayers, super().clone())
+        no_layers = NoLayers()
+        no_layers._state = self._state
+        no_layers.id = self.id
+        return no_layers
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import cast, override
+from typing import override
 
 from aegis.common.world.info import RubbleInfo, WorldObjectInfo
 from aegis.common.world.objects.world_object import WorldObject
@@ -62,9 +62,8 @@ class Rubble(WorldObject):
 
     @override
     def clone(self) -> Rubble:
-        rubble = cast(Rubble, super().clone())
-        rubble.remove_energy = self.remove_energy
-        rubble.remove_agents = self.remove_agents
+        rubble = Rubble(self.id, self.remove_energy, self.remove_agents)
+        rubble._state = self._state
         return rubble
 
     @override
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-from typing import cast, override
+from typing import override
 
 from aegis.common.world.info import SurvivorInfo, WorldObjectInfo
 from aegis.common.world.objects.world_object import WorldObject
+from aegis.common.world.survivor_store import SurvivorStore
 from aegis.parsers.helper.world_file_type import StackContent
 
+_STATES = {state.value: state for state in WorldObject.State}
+
 
 class Survivor(WorldObject):
     """
     Represents a survivor layer in a grid.
 
+    The state of the survivor is kept in a `SurvivorStore`, the survivor is a view
+    of its slot. A survivor that isn't in a world has a store of its own.
+
     Attributes:
         id (int): The id of the survivor.
         damage_factor (int): The damage factor of the survivor.
@@ -25,6 +31,8 @@ class Survivor(WorldObject):
         damage_factor: int = 0,
         body_mass: int = 0,
         mental_state: int = 0,
+        store: SurvivorStore | None = None,
+        slot: int | None = None,
     ) -> None:
         """
         Initializes a Survivor instance.
@@ -35,15 +43,99 @@ class Survivor(WorldObject):
             damage_factor: The damage factor of the survivor.
             body_mass: The body mass of the survivor.
             mental_state: The mental state of the survivor.
+            store: The store to keep the survivor's state in, None for a store of its
+                own.
+            slot: The slot of the store the survivor's state is already kept in, None
+                to add the survivor to the store.
         """
+        self._store = store if store is not None else SurvivorStore()
+        if slot is not None:
+            self._slot = slot
+            self.id = id
+            return
+
+        self._slot = self._store.add(
+            id,
+            energy_level,
+            damage_factor,
+            body_mass,
+            mental_state,
+            self.State.ALIVE.value,
+        )
         super().__init__()
         self._state = self.State.ALIVE
         self.id = id
-        self.damage_factor = damage_factor
-        self.body_mass = body_mass
-        self.mental_state = mental_state
         self.set_energy_level(energy_level)
 
+    @property
+    def store(self) -> SurvivorStore:
+        """The store the survivor's state is kept in."""
+        return self._store
+
+    @property
+    def slot(self) -> int:
+        """The survivor's slot in its store."""
+        return self._slot
+
+    @property
+    def _state(self) -> WorldObject.State:  # pyright: ignore[reportIncompatibleVariableOverride]
+        return _STATES[self._store.states[self._slot]]
+
+    @_state.setter
+    def _state(self, state: WorldObject.State) -> None:
+        self._store.states[self._slot] = state.value
+
+    @property
+    def _energy_level(self) -> int:
+        return self._store.energy[self._slot]
+
+    @_energy_level.setter
+    def _energy_level(self, energy_level: int) -> None:
+        self._store.energy[self._slot] = energy_level
+
+    @property
+    def damage_factor(self) -> int:
+        return self._store.damage_factor[self._slot]
+
+    @damage_factor.setter
+    def damage_factor(self, damage_factor: int) -> None:
+        self._store.damage_factor[self._slot] = damage_factor
+
+    @property
+    def body_mass(self) -> int:
+        return self._store.body_mass[self._slot]
+
+    @body_mass.setter
+    def body_mass(self, body_mass: int) -> None:
+        self._store.body_mass[self._slot] = body_mass
+
+    @property
+    def mental_state(self) -> int:
+        return self._store.mental_state[self._slot]
+
+    @mental_state.setter
+    def mental_state(self, mental_state: int) -> None:
+        self._store.mental_state[self._slot] = mental_state
+
+    def move_to_store(self, store: SurvivorStore) -> None:
+        """
+        Moves the survivor's state into another store.
+
+        Args:
+            store: The store to keep the survivor's state in from now on.
+        """
+        if store is self._store:
+            return
+        self._slot = store.add(
+            self.id,
+            self._energy_level,
+            self.damage_factor,
+            self.body_mass,
+            self.mental_state,
+            self._store.states[self._slot],
+        )
+        self._store = store
+
     def get_energy_level(self) -> int:
         """Returns the energy level of the survivor."""
         return self._energy_level
@@ -118,12 +210,24 @@ class Survivor(WorldObject):
         return string_information
 
     @override
-    def clone(self) -> Survivor:
-        survivor = cast(Survivor, super().clone())
-        survivor._energy_level = self._energy_level
-        survivor.damage_factor = self.damage_factor
-        survivor.body_mass = self.body_mass
-        survivor.mental_state = self.mental_state
+    def clone(self, store: SurvivorStore | None = None) -> Survivor:
+        """
+        Returns a copy of the survivor.
+
+        Args:
+            store: A copy of the survivor's store, to return a view of the survivor's
+                slot in it. None for a copy with a store of its own.
+        """
+        if store is not None:
+            return Survivor(self.id, store=store, slot=self._slot)
+        survivor = Survivor(
+            self.id,
+            self._energy_level,
+            self.damage_factor,
+            self.body_mass,
+            self.mental_state,
+        )
+        survivor._state = self._state
         return survivor
 
     @override
@@ -1,4 +1,6 @@
-from typing import cast, override
+from __future__ import annotations
+
+from typing import override
 
 from aegis.common.world.info import SurvivorGroupInfo, WorldObjectInfo
 from aegis.common.world.objects.world_object import WorldObject
@@ -86,10 +88,11 @@ class SurvivorGroup(WorldObject):
         return string_information
 
     @override
-    def clone(self) -> WorldObject:
-        survivor_group = cast(SurvivorGroup, super().clone())
-        survivor_group._energy_level = self._energy_level
-        survivor_group.number_of_survivors = self.number_of_survivors
+    def clone(self) -> SurvivorGroup:
+        survivor_group = SurvivorGroup(
+            self.id, self._energy_level, self.number_of_survivors
+        )
+        survivor_group._state = self._state
         return survivor_group
 
     @override
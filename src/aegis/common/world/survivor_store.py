@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from array import array
+
+
+class SurvivorStore:
+    """
+    Holds the state of survivors in columns, one slot per survivor.
+
+    The IDs, energy levels, damage factors, body masses, mental states and states
+    of the survivors are kept in `array` columns, and a `Survivor` is a view of its
+    slot. The survivor simulator drains the energy of many slots at once from the
+    columns, without going through every `Survivor`.
+
+    Slots are handed out in the order survivors are added and are not reused. A
+    copy of a store has the same slots, so a survivor has the same slot in a copy.
+
+    Attributes:
+        ids (array[int]): The ID of the survivor in every slot.
+        energy (array[int]): The energy level of the survivor in every slot.
+        damage_factor (array[int]): The damage factor of the survivor in every slot.
+        body_mass (array[int]): The body mass of the survivor in every slot.
+        mental_state (array[int]): The mental state of the survivor in every slot.
+        states (bytearray): The value of the `WorldObject.State` of the survivor in
+            every slot.
+    """
+
+    def __init__(self) -> None:
+        self.ids: array[int] = array("q")
+        self.energy: array[int] = array("q")
+        self.damage_factor: array[int] = array("q")
+        self.body_mass: array[int] = array("q")
+        self.mental_state: array[int] = array("q")
+        self.states: bytearray = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.energy)
+
+    def add(
+        self,
+        id: int,
+        energy_level: int,
+        damage_factor: int,
+        body_mass: int,
+        mental_state: int,
+        state: int,
+    ) -> int:
+        """
+        Adds a survivor.
+
+        Args:
+            id: The ID of the survivor.
+            energy_level: The energy level of the survivor.
+            damage_factor: The damage factor of the survivor.
+            body_mass: The body mass of the survivor.
+            mental_state: The mental state of the survivor.
+            state: The value of the survivor's state.
+
+        Returns:
+            The slot of the survivor.
+        """
+        slot = len(self.energy)
+        self.ids.append(id)
+        self.energy.append(energy_level)
+        self.damage_factor.append(damage_factor)
+        self.body_mass.append(body_mass)
+        self.mental_state.append(mental_state)
+        self.states.append(state)
+        return slot
+
+    def copy(self) -> SurvivorStore:
+        """Returns a copy of the store, with the same slots."""
+        store = SurvivorStore()
+        store.ids = array("q", self.ids)
+        store.energy = array("q", self.energy)
+        store.damage_factor = array("q", self.damage_factor)
+        store.body_mass = array("q", self.body_mass)
+        store.mental_state = array("q", self.mental_state)
+        store.states = bytearray(self.states)
+        return store
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from aegis.common import Constants, Location
 from aegis.common.world.grid import Grid
 
@@ -31,6 +33,8 @@ class World:
         Raises:
             ValueError: If both initializing methods are None or both were passed.
         """
+        # the columns that are not shared with a fork, None if nothing is shared
+        self._owned_columns: set[int] | None = None
         if world is not None and (width == 0 and height == 0):
             self.height = len(world[0])
             self.width = len(world)
@@ -79,6 +83,24 @@ class World:
         self.height = len(world[0])
         self.width = len(world)
         self._world = world
+        self._owned_columns = None
+
+    def fork(self) -> World:
+        """
+        Returns a copy of the world that shares its grids and columns with this one.
+
+        Only the list of columns is copied. A column is copied by the first
+        `set_grid_at` in it on either side, so neither world sees grids the other
+        one sets afterwards. The grids themselves are shared, they must be
+        replaced with `set_grid_at` rather than changed.
+
+        Returns:
+            The copy of the world.
+        """
+        world = World(list(self._world))
+        world._owned_columns = set()
+        self._owned_columns = set()
+        return world
 
     def on_map(self, location: Location) -> bool:
         """
@@ -106,6 +128,10 @@ class World:
             grid: The grid to set at the given location.
         """
         if self.on_map(location):
+            owned_columns = self._owned_columns
+            if owned_columns is not None and location.x not in owned_columns:
+                self._world[location.x] = list(self._world[location.x])
+                owned_columns.add(location.x)
             self._world[location.x][location.y] = grid
 
     def get_grid_at(self, location: Location) -> Grid | None:
@@ -1,6 +1,22 @@
 import sys
 
 from aegis.aegis_main import Aegis
+from aegis.session_server import SessionServer
+
+
+def run_sessions(args: list[str]) -> None:
+    server = SessionServer()
+    try:
+        print("Aegis  : Starting Up.")
+        if not server.start_up(args):
+            print("Aegis  : Unable to start up.")
+            sys.exit(1)
+
+        print("Aegis  : Waiting for agents.")
+        _ = sys.stdout.flush()
+        server.run()
+    finally:
+        server.shutdown()
 
 
 def main() -> None:
@@ -12,6 +28,21 @@ def main() -> None:
             print("Aegis  : Unable to initialize.")
             sys.exit(1)
 
+        if aegis.get_number_of_sessions() > 1:
+            run_sessions(sys.argv[1:])
+            return
+
+        if aegis.is_resimulating():
+            print("Aegis  : Starting Up.")
+            if not aegis.start_up(listen=False):
+                print("Aegis  : Unable to start up.")
+                sys.exit(1)
+
+            if not aegis.resimulate():
+                print("Aegis  : Unable to resimulate.")
+                sys.exit(1)
+            return
+
         print("Aegis  : Starting Up.")
         if not aegis.start_up():
             print("Aegis  : Unable to start up.")
@@ -21,11 +52,16 @@ def main() -> None:
             print("Aegis  : Error building world.")
             sys.exit(1)
 
-        print("Aegis  : Waiting for agents.")
-        _ = sys.stdout.flush()
+        for match, seed in enumerate(aegis.get_match_seeds()):
+            if match > 0 and not aegis.reset(seed):
+                print("Aegis  : Error resetting world.")
+                sys.exit(1)
+
+            print("Aegis  : Waiting for agents.")
+            _ = sys.stdout.flush()
 
-        aegis.connect_all_agents()
-        aegis.run_state()
+            aegis.connect_all_agents()
+            aegis.run_state()
 
     except Exception as e:
         print(f"Exception: {e}")
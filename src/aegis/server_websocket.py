@@ -126,6 +126,15 @@ class WebSocketServer:
         except Exception as e:
             print(f"Error shutting down server: {e}")
 
+    def set_port(self, port: int) -> None:
+        """
+        Sets the port the server listens on, call it before starting the server.
+
+        Args:
+            port: The port for clients to connect to.
+        """
+        self._port = port
+
     def set_wait_for_client(self, wait_for_client: bool) -> None:
         """
         Set whether to wait for the client to connect to AEGIS.
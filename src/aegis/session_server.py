@@ -0,0 +1,201 @@
+import socket
+import time
+
+from aegis.aegis_main import Aegis
+from aegis.agent_control.network.agent_acceptor import AgentAcceptor
+from aegis.agent_control.network.agent_socket import AgentSocket
+from aegis.agent_control.network.agent_transport import AgentTransport
+from aegis.common.commands.agent_commands import CONNECT
+
+
+class Session:
+    """
+    One of the simulations hosted by a `SessionServer`.
+
+    Attributes:
+        session_id (str): The ID agents connect to the session with.
+        aegis (Aegis): The simulation.
+        agents_connected (int): The number of agents that joined the session.
+        connect_deadline (float): The `time.monotonic` time the session stops waiting for agents at,
+            and starts with the agents that connected.
+        running (bool): Whether the simulation started.
+        done (bool): Whether the simulation is over.
+    """
+
+    def __init__(self, session_id: str, aegis: Aegis) -> None:
+        self.session_id: str = session_id
+        self.aegis: Aegis = aegis
+        self.agents_connected: int = 0
+        self.connect_deadline: float = time.monotonic() + aegis.get_connect_timeout()
+        self.running: bool = False
+        self.done: bool = False
+
+    def is_waiting_for_agents(self) -> bool:
+        return (
+            not self.running
+            and not self.done
+            and self.agents_connected < self.aegis.get_number_of_agents()
+        )
+
+
+class SessionServer:
+    """
+    Hosts several simulations in one process, behind one agent port.
+
+    Agents pick the session to join with the SESSION in their CONNECT, agents without
+    one join the first session still waiting for agents. The sessions share one event
+    loop: a session runs its next round as soon as its agents have ended their turns,
+    while the other sessions keep waiting for theirs.
+
+    Every session has its own world, with its own random number streams, and its own
+    replay writer, only the output worker writing them is shared. Every session gets
+    the results it would get running on its own.
+    """
+
+    def __init__(self) -> None:
+        self._transport: AgentTransport = AgentTransport()
+        self._server_socket: socket.socket | None = None
+        self._sessions: dict[str, Session] = {}
+        self._acceptor: AgentAcceptor | None = None
+
+    def start_up(self, args: list[str]) -> bool:
+        """
+        Opens the agent port and builds the world of every session.
+
+        Args:
+            args: The AEGIS command line, `-Sessions` gives the number of sessions.
+
+        Returns:
+            True if every session is waiting for its agents.
+        """
+        aegis = Aegis(self._transport)
+        if not aegis.read_command_line(args):
+            return False
+        if len(aegis.get_match_seeds()) > 1:
+            print("Aegis  : -Repeat and -Seeds are ignored when running sessions.")
+
+        for number in range(1, aegis.get_number_of_sessions() + 1):
+            if number > 1:
+                aegis = Aegis(self._transport)
+                if not aegis.read_command_line(args):
+                    return False
+
+            session = Session(str(number), aegis)
+            self._sessions[session.session_id] = session
+            aegis.set_session(session.session_id)
+            if not aegis.start_up(listen=False):
+                return False
+            if not aegis.build_world():
+                print(f"Aegis  : Error building world of session {session.session_id}.")
+                return False
+
+        port = aegis.get_agent_port()
+        try:
+            self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._server_socket.bind(("", port))
+            self._server_socket.listen(aegis.get_listen_backlog())
+        except Exception:
+            print(f"Aegis  : Can't create server socket at port: {port}")
+            return False
+        aegis.report_agent_port(self._server_socket.getsockname()[1])
+        self._acceptor = AgentAcceptor(
+            self._transport,
+            self._server_socket,
+            self._handle_connect,
+            aegis.get_handshake_timeout(),
+        )
+        self._acceptor.start()
+        return True
+
+    def run(self) -> None:
+        """Runs the event loop until every session is over."""
+        print(f"Aegis  : Hosting {len(self._sessions)} sessions.")
+        while not all(session.done for session in self._sessions.values()):
+            timeout = self._next_deadline() - time.monotonic()
+            for handle_input in self._transport.poll(max(timeout, 0)):
+                handle_input()
+            if self._acceptor is not None:
+                self._acceptor.expire_handshakes()
+            self._step_sessions()
+
+    def shutdown(self) -> None:
+        for session in self._sessions.values():
+            if not session.done:
+                self._finish(session)
+        if self._acceptor is not None:
+            self._acceptor.stop()
+            self._acceptor = None
+        self._transport.close()
+        if self._server_socket is not None:
+            self._server_socket.close()
+            self._server_socket = None
+
+    def _next_deadline(self) -> float:
+        deadlines: list[float] = []
+        if self._acceptor is not None:
+            handshake_deadline = self._acceptor.get_next_deadline()
+            if handshake_deadline is not None:
+                deadlines.append(handshake_deadline)
+        for session in self._sessions.values():
+            if session.done:
+                continue
+            if session.running:
+                deadlines.append(session.aegis.get_round_deadline())
+            else:
+                deadlines.append(session.connect_deadline)
+        return min(deadlines, default=time.monotonic() + 1)
+
+    def _handle_connect(self, agent_socket: AgentSocket, command: CONNECT) -> None:
+        session = self._find_session(command.session)
+        if session is None:
+            print(f"Aegis  : No session {command.session} is waiting for agents.")
+            agent_socket.disconnect()
+            return
+
+        if session.aegis.add_connected_agent(command.group_name, agent_socket):
+            session.agents_connected += 1
+
+    def _find_session(self, session_id: str | None) -> Session | None:
+        if session_id is None:
+            for session in self._sessions.values():
+                if session.is_waiting_for_agents():
+                    return session
+            return None
+
+        session = self._sessions.get(session_id)
+        if session is None or not session.is_waiting_for_agents():
+            return None
+        return session
+
+    def _step_sessions(self) -> None:
+        for session in self._sessions.values():
+            if session.done:
+                continue
+            if not session.running:
+                if (
+                    not session.is_waiting_for_agents()
+                    or time.monotonic() >= session.connect_deadline
+                ):
+                    self._start(session)
+            elif session.aegis.is_round_ready():
+                session.aegis.end_round()
+                self._start_round(session)
+
+    def _start(self, session: Session) -> None:
+        session.running = True
+        print(f"Aegis  : Starting session {session.session_id}.")
+        session.aegis.start_running()
+        if not session.aegis.start_simulation():
+            self._finish(session)
+            return
+        self._start_round(session)
+
+    def _start_round(self, session: Session) -> None:
+        if not session.aegis.start_round():
+            self._finish(session)
+
+    def _finish(self, session: Session) -> None:
+        session.aegis.shutdown()
+        session.done = True
+        print(f"Aegis  : Session {session.session_id} is over.")
@@ -1,17 +1,32 @@
 import base64
 import gzip
+import io
 import json
 import os
 import queue
-import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import TypedDict, cast
 
 from aegis.assist.state import State
-from aegis.common import AgentID, AgentIDList, Constants, Direction, Location, Utility
+from aegis.common import (
+    AgentID,
+    AgentIDList,
+    AgentRegistry,
+    Constants,
+    Direction,
+    LifeSignals,
+    Location,
+    RandomStream,
+    RandomStreams,
+    Utility,
+)
 from aegis.common.world.agent import Agent
+from aegis.common.world.agent_store import AgentStore
 from aegis.common.world.grid import Grid
 from aegis.common.world.info import GridInfo, SurroundInfo
-from aegis.common.world.objects import Survivor, SurvivorGroup
+from aegis.common.world.objects import Survivor, SurvivorGroup, WorldObject
+from aegis.common.world.survivor_store import SurvivorStore
 from aegis.common.world.world import World
 from aegis.parsers.aegis_world_file import AegisWorldFile
 from aegis.parsers.helper.world_file_type import StackContent, WorldFileType
@@ -24,8 +39,13 @@ from aegis.world.object_handlers import (
     SurvivorGroupHandler,
     SurvivorHandler,
 )
-from aegis.world.simulators.fire_simulator import FireSimulator
-from aegis.world.simulators.survivor_simulator import SurvivorSimulator
+from aegis.world.simulators import (
+    FireSimulator,
+    Simulator,
+    SimulatorEvent,
+    SimulatorTiming,
+    SurvivorSimulator,
+)
 
 
 class LocationDict(TypedDict):
@@ -66,41 +86,125 @@ class WorldDict(TypedDict):
     number_of_survivors_saved_dead: int
 
 
+class WorldSnapshot:
+    """
+    What the viewer is sent of the world at one point, turned into JSON later so
+    it can be done on another thread while the world changes.
+
+    Attributes:
+        grid_cells (tuple[tuple[GridCellDict, tuple[tuple[int, int], ...]], ...]):
+            The JSON of every grid, ordered by X then Y, with the IDs and GIDs of
+            the agents on it. Nothing changes them once they are built.
+        agent_states (dict[tuple[int, int], tuple[int, str]]): The energy level
+            and last command of every agent, by ID and GID.
+        world_dict (WorldDict): The JSON of the world without its grids and agents.
+    """
+
+    def __init__(
+        self,
+        grid_cells: tuple[tuple[GridCellDict, tuple[tuple[int, int], ...]], ...],
+        agent_states: dict[tuple[int, int], tuple[int, str]],
+        world_dict: WorldDict,
+    ) -> None:
+        self.grid_cells = grid_cells
+        self.agent_states = agent_states
+        self.world_dict = world_dict
+
+    def convert_to_json(self) -> WorldDict:
+        """Returns the JSON of the world, the grids and the agents on them included."""
+        grid_data: list[GridCellDict] = []
+        agent_data: list[AgentInfoDict] = []
+        for grid_dict, agent_keys in self.grid_cells:
+            grid_data.append(grid_dict)
+            grid_loc = grid_dict["stack"]["grid_loc"]
+            for key in agent_keys:
+                agent_state = self.agent_states.get(key)
+                if agent_state is not None:
+                    agent_dict: AgentInfoDict = {
+                        "id": key[0],
+                        "gid": key[1],
+                        "x": grid_loc["x"],
+                        "y": grid_loc["y"],
+                        "energy_level": agent_state[0],
+                        "command_sent": agent_state[1],
+                    }
+                    agent_data.append(agent_dict)
+
+        world_dict = self.world_dict.copy()
+        world_dict["grid_data"] = grid_data
+        world_dict["agent_data"] = agent_data
+        return world_dict
+
+
 MOVE_COST_TOGGLE: bool = json.load(open("sys_files/aegis_config.json"))[
     "Enable_Move_Cost"
 ]
 
 
 class AegisWorld:
+    # runs the parallel safe simulators, shared by every world in the process
+    _simulator_pool: ThreadPoolExecutor | None = None
+
     def __init__(self) -> None:
         self._object_handlers: dict[str, ObjectHandler] = {}
         self.install_object_handler(NoLayersHandler())
         self.install_object_handler(RubbleHandler())
         self.install_object_handler(SurvivorGroupHandler())
         self.install_object_handler(SurvivorHandler())
+        self._aegis_world_file: AegisWorldFile | None = None
+        self._agent_world_filename: str = ""
+        self._agent_world_file_text: str = ""
+        self._agent_world_file: str = "WorldInfoFile.out"
+        self._installed_simulators: list[Simulator] = []
+        self._init_state()
+
+    def _init_state(self) -> None:
         self._agent_locations: dict[AgentID, Location] = {}
         self._agent_spawn_locations: dict[tuple[Location, int | None], int] = {}
         self._low_survivor_level: int = 0
         self._mid_survivor_level: int = 0
         self._high_survivor_level: int = 0
         self._random_seed: int = 0
+        self._random: RandomStreams = RandomStreams(self._random_seed)
         self.round: int = 0
         self._world: World | None = None
-        self._agents: list[Agent] = []
+        self._agents: AgentRegistry[Agent] = AgentRegistry()
+        self._agent_store: AgentStore = AgentStore()
         self._safe_grid_list: list[Grid] = []
-        self._fire_grids_list: list[Grid] = []
-        self._non_fire_grids_list: list[Grid] = []
         self._survivors_list: dict[int, Survivor] = {}
+        self._survivor_store: SurvivorStore = SurvivorStore()
         self._survivor_groups_list: dict[int, SurvivorGroup] = {}
         self._top_layer_removed_grid_list: list[Location] = []
-        self._fire_simulator = FireSimulator(
-            self._fire_grids_list, self._non_fire_grids_list, self._world
-        )
+        self._grid_info_cache: dict[Location, GridInfo] = {}
+        self._grid_cells: dict[
+            Location, tuple[GridCellDict, tuple[tuple[int, int], ...]]
+        ] = {}
+        self._unsent_grids: set[Location] = set()
+        self._grid_digests: dict[Location, int] = {}
+        self._grids_digest: int = 0
+        self._changed_grids: set[Location] = set()
+        self._unreported_grids: set[Location] = set()
+        self._survivor_locations: dict[int, Location] = {}
+        self._survivor_group_locations: dict[int, Location] = {}
+        # what the world doesn't share with its forks, None if it has none
+        self._owned_grids: set[Location] | None = None
+        self._owned_survivors: set[int] | None = None
+        self._owned_survivor_groups: set[int] | None = None
+        self._fire_simulator = FireSimulator()
         self._survivor_simulator = SurvivorSimulator(
-            self._survivors_list, self._survivor_groups_list
+            self._survivors_list,
+            self._survivor_groups_list,
+            self._own_survivor,
+            self._own_survivor_group,
+            self._survivor_store,
         )
+        self._simulators: list[Simulator] = [
+            self._fire_simulator,
+            self._survivor_simulator,
+            *self._installed_simulators,
+        ]
+        self._simulator_timings: dict[str, SimulatorTiming] = {}
         self._initial_agent_energy: int = Constants.DEFAULT_MAX_ENERGY_LEVEL
-        self._agent_world_filename: str = ""
         self._number_of_survivors: int = 0
         self._number_of_alive_agents: int = 0
         self._number_of_dead_agents: int = 0
@@ -111,10 +215,17 @@ class AegisWorld:
         self._max_move_cost: int = 0
         self._states: queue.Queue[State] = queue.Queue()
 
-    def build_world_from_file(self, filename: str, ws_server: WebSocketServer) -> bool:
+    def build_world_from_file(
+        self,
+        filename: str,
+        ws_server: WebSocketServer | None,
+        random_seed: int | None = None,
+    ) -> bool:
         try:
             aegis_world_file_info = WorldFileParser().parse_world_file(filename)
-            success = self.build_world(aegis_world_file_info)
+            success = self.build_world(aegis_world_file_info, random_seed)
+            if ws_server is None:
+                return success
 
             world = self._get_json_world(filename)
             data = {"event_type": "World", "data": world}
@@ -126,17 +237,24 @@ class AegisWorld:
         except Exception:
             return False
 
-    def build_world(self, aegis_world_file: AegisWorldFile | None) -> bool:
+    def build_world(
+        self, aegis_world_file: AegisWorldFile | None, random_seed: int | None = None
+    ) -> bool:
         if aegis_world_file is None:
             return False
         try:
-            self._agent_spawn_locations = aegis_world_file.agent_spawn_locations
+            # the world file is kept unchanged, so the world can be reset from it
+            self._aegis_world_file = aegis_world_file
+            self._agent_spawn_locations = dict(aegis_world_file.agent_spawn_locations)
             self._low_survivor_level = aegis_world_file.low_survivor_level
             self._mid_survivor_level = aegis_world_file.mid_survivor_level
             self._high_survivor_level = aegis_world_file.high_survivor_level
-            self._random_seed = aegis_world_file.random_seed
+            self._random_seed = (
+                aegis_world_file.random_seed if random_seed is None else random_seed
+            )
             self._initial_agent_energy = aegis_world_file.initial_agent_energy
-            Utility.set_random_seed(aegis_world_file.random_seed)
+            Utility.set_random_seed(self._random_seed)
+            self._random = RandomStreams(self._random_seed)
             self.round = 1
 
             # Create a world of known size
@@ -166,8 +284,7 @@ class AegisWorld:
 
                 # reverse so the top of the stack is actually
                 # the top declared in the world file
-                grid_info_setting.contents.reverse()
-                for content in grid_info_setting.contents:
+                for content in reversed(grid_info_setting.contents):
                     object_handler = self._object_handlers.get(content["type"].upper())
                     if not object_handler:
                         continue
@@ -177,6 +294,7 @@ class AegisWorld:
                         grid.add_layer(layer)
 
             # Grids that are safe
+            burning: list[Location] = []
             for x in range(self._world.width):
                 for y in range(self._world.height):
                     grid = self._world.get_grid_at(Location(x, y))
@@ -185,6 +303,18 @@ class AegisWorld:
 
                     if grid.is_stable():
                         self._safe_grid_list.append(grid)
+                    if grid.is_on_fire():
+                        burning.append(grid.location)
+                    for layer in grid.get_grid_layers():
+                        if isinstance(layer, Survivor):
+                            self._survivor_locations[layer.id] = grid.location
+                        elif isinstance(layer, SurvivorGroup):
+                            self._survivor_group_locations[layer.id] = grid.location
+                    digest = grid.digest()
+                    self._grid_digests[grid.location] = digest
+                    self._grids_digest ^= digest
+
+            self._fire_simulator.start(self._world.width, self._world.height, burning)
 
             survivor_group_handler = cast(
                 SurvivorGroupHandler, self._object_handlers.get("SVG")
@@ -200,85 +330,167 @@ class AegisWorld:
             self._number_of_survivors = (
                 self._number_of_survivors_alive + self._number_of_survivors_dead
             )
+            for survivor in survivor_handler.sv_map.values():
+                survivor.move_to_store(self._survivor_store)
             self._survivors_list = survivor_handler.sv_map
             self._survivor_groups_list = survivor_group_handler.svg_map
+            self._survivor_simulator.survivors_list = self._survivors_list
+            self._survivor_simulator.survivor_groups_list = self._survivor_groups_list
             self._write_agent_world_file()
             return True
         except Exception as e:
             print(f"Error in building world: {e}")
             return False
 
+    def reset(self, random_seed: int | None = None) -> bool:
+        """
+        Restores the world to how it was right after it was built, without reading the world file again.
+
+        Args:
+            random_seed: The seed to build the world with, None to use the world file's seed.
+
+        Returns:
+            True if the world was rebuilt.
+        """
+        aegis_world_file = self._aegis_world_file
+        if aegis_world_file is None:
+            return False
+
+        for object_handler in set(self._object_handlers.values()):
+            object_handler.reset()
+        self._init_state()
+        return self.build_world(aegis_world_file, random_seed)
+
     def install_object_handler(self, object_handler: ObjectHandler) -> None:
         keys = object_handler.get_keys()
         for key in keys:
             self._object_handlers[key.upper()] = object_handler
 
+    def install_simulator(self, simulator: Simulator) -> None:
+        """
+        Adds a simulator to run at the end of every round, after the ones installed
+        before it. It stays installed when the world is reset.
+
+        Args:
+            simulator: The simulator to add.
+        """
+        self._installed_simulators.append(simulator)
+        self._simulators.append(simulator)
+
     def _write_agent_world_file(self) -> None:
         try:
-            file = "WorldInfoFile.out"
-            with open(file, "w") as writer:
-                if self._world is None:
-                    return
-
-                width = self._world.width
-                height = self._world.height
-                _ = writer.write(f"Size: ( WIDTH {width} , HEIGHT {height} )\n")
-                for x in range(self._world.width):
-                    for y in range(self._world.height):
-                        grid = self._world.get_grid_at(Location(x, y))
-                        if grid is None:
-                            _ = writer.write(f"[({x},{y}),No Grid]\n")
-                            continue
-
-                        choice = Utility.next_boolean()
-                        percent = 0
+            file = self._agent_world_file
+            # the text only depends on the world and its seed, the file is only
+            # written when the text changed
+            writer = io.StringIO()
+            if self._world is None:
+                return
+
+            width = self._world.width
+            height = self._world.height
+            _ = writer.write(f"Size: ( WIDTH {width} , HEIGHT {height} )\n")
+            for x in range(self._world.width):
+                for y in range(self._world.height):
+                    grid = self._world.get_grid_at(Location(x, y))
+                    if grid is None:
+                        _ = writer.write(f"[({x},{y}),No Grid]\n")
+                        continue
 
+                    stream = self._random.stream(RandomStreams.WORLD_INFO, 0, x, y)
+                    choice = stream.next_boolean()
+                    percent = 0
 
-                        if grid.number_of_survivors() <= 0:
-                            percent = 0
-                        else:
-                            if grid.number_of_survivors() <= self._low_survivor_level:
-                                if choice:
-                                    percent = Utility.random_in_range(0, 5)
-                                else:
-                                    percent = 5 + Utility.random_in_range(0, 5)
-                            elif grid.number_of_survivors() <= self._mid_survivor_level:
-                                if choice:
-                                    percent = 15 + Utility.random_in_range(0, 10)
-                                else:
-                                    percent = 25 + Utility.random_in_range(0, 15)
+                    if grid.number_of_survivors() <= 0:
+                        percent = 0
+                    else:
+                        if grid.number_of_survivors() <= self._low_survivor_level:
+                            if choice:
+                                percent = stream.random_in_range(0, 5)
                             else:
-                                if choice:
-                                    percent = 15 + Utility.random_in_range(0, 35)
-                                else:
-                                    percent = 50 + Utility.random_in_range(0, 40)
-                            percent = max(1, percent)
-
-                        fire = "+F" if grid.is_on_fire() else "-F"
-                        killer = "+K" if grid.is_killer() else "-K"
-                        charging = "+C" if grid.is_charging_grid() else "-C"
-
-                        if MOVE_COST_TOGGLE:
-                            _ = writer.write(
-                                f"[({x},{y}),({fire},{killer},{charging}),{percent:3.0f}%,{grid.move_cost}]\n"
-                            )
+                                percent = 5 + stream.random_in_range(0, 5)
+                        elif grid.number_of_survivors() <= self._mid_survivor_level:
+                            if choice:
+                                percent = 15 + stream.random_in_range(0, 10)
+                            else:
+                                percent = 25 + stream.random_in_range(0, 15)
                         else:
-                            _ = writer.write(
-                                f"[({x},{y}),({fire},{killer},{charging}),{percent:3.0f}%]\n"
-                            )
+                            if choice:
+                                percent = 15 + stream.random_in_range(0, 35)
+                            else:
+                                percent = 50 + stream.random_in_range(0, 40)
+                        percent = max(1, percent)
+
+                    fire = "+F" if grid.is_on_fire() else "-F"
+                    killer = "+K" if grid.is_killer() else "-K"
+                    charging = "+C" if grid.is_charging_grid() else "-C"
+
+                    if MOVE_COST_TOGGLE:
+                        _ = writer.write(
+                            f"[({x},{y}),({fire},{killer},{charging}),{percent:3.0f}%,{grid.move_cost}]\n"
+                        )
+                    else:
+                        _ = writer.write(
+                            f"[({x},{y}),({fire},{killer},{charging}),{percent:3.0f}%]\n"
+                        )
             path = os.path.realpath(os.getcwd())
-            self._agent_world_filename = os.path.join(path, file)
+            agent_world_filename = os.path.join(path, file)
+            text = writer.getvalue()
+            if (
+                text != self._agent_world_file_text
+                or agent_world_filename != self._agent_world_filename
+                or not os.path.exists(agent_world_filename)
+            ):
+                with open(file, "w") as out:
+                    _ = out.write(text)
+                self._agent_world_file_text = text
+            self._agent_world_filename = agent_world_filename
         except Exception:
             print(
                 f"Aegis  : Unable to write agent world file to '{self._agent_world_filename}'!"
             )
 
     def run_simulators(self) -> str:
+        """
+        Runs the installed simulators for the round, the parallel safe simulators
+        installed next to each other at the same time.
+
+        Returns:
+            The changes the simulators made, for the replay.
+        """
         s = "Sim_Events;\n"
-        if Constants.FIRE_SPREAD:
-            s += self._fire_simulator.run()
+        simulators = [
+            simulator for simulator in self._simulators if simulator.is_enabled()
+        ]
+        start = 0
+        while start < len(simulators):
+            end = start + 1
+            if simulators[start].parallel_safe:
+                while end < len(simulators) and simulators[end].parallel_safe:
+                    end += 1
+            batch = simulators[start:end]
+            if len(batch) == 1:
+                results = [self._run_simulator(batch[0])]
+            else:
+                if AegisWorld._simulator_pool is None:
+                    AegisWorld._simulator_pool = ThreadPoolExecutor(
+                        thread_name_prefix="aegis-simulator"
+                    )
+                results = list(
+                    AegisWorld._simulator_pool.map(self._run_simulator, batch)
+                )
+
+            for simulator, (events, seconds) in zip(batch, results):
+                if simulator.parallel_safe:
+                    apply_start = time.perf_counter()
+                    simulator.apply(self, events)
+                    seconds += time.perf_counter() - apply_start
+                self._simulator_timings.setdefault(
+                    simulator.name, SimulatorTiming()
+                ).add(seconds)
+                self._apply_simulator_events(events)
+                s += simulator.get_replay_text(events)
+            start = end
 
-        s += self._survivor_simulator.run()
         top_layer_remove_message = "Top_Layer_Rem; { "
         if not self._top_layer_removed_grid_list:
             top_layer_remove_message += "NONE"
@@ -293,8 +505,8 @@ class AegisWorld:
         if not self._agents:
             agents_information_message += "NONE"
         else:
-            for agent in self._agents:
-                agents_information_message += f"({agent.agent_id.id},{agent.agent_id.gid},{agent.get_energy_level()},{agent.location.x},{agent.location.y}),"
+            for id, gid, energy_level, x, y in self._agent_store.get_states():
+                agents_information_message += f"({id},{gid},{energy_level},{x},{y}),"
         agents_information_message += " };\n"
         s += agents_information_message
         s += "End_Sim;\n"
@@ -302,31 +514,53 @@ class AegisWorld:
 
     def grim_reaper(self) -> AgentIDList:
         dead_agents = AgentIDList()
-        for agent in self._agents:
-            if agent.get_energy_level() <= 0:
-                print(f"Aegis  : Agent {agent} ran out of energy and died.\n")
-                dead_agents.add(agent.agent_id)
+        # an agent can only have died if its energy level or location changed,
+        # or its grid caught fire, since it was last checked
+        for id, gid, energy_level, x, y in self._agent_store.take_changed_states():
+            agent_id = AgentID(id, gid)
+            if energy_level <= 0:
+                print(f"Aegis  : Agent {agent_id} ran out of energy and died.\n")
+                dead_agents.add(agent_id)
                 continue
 
             if self._world:
-                grid = self._world.get_grid_at(agent.location)
+                grid = self._world.get_grid_at(Location(x, y))
                 if grid is None:
                     continue
 
                 if grid.is_on_fire():
-                    print(f"Aegis  : Agent {agent} ran into the fire and died.\n")
-                    dead_agents.add(agent.agent_id)
+                    print(f"Aegis  : Agent {agent_id} ran into the fire and died.\n")
+                    dead_agents.add(agent_id)
                 elif grid.is_killer():
-                    print(f"Aegis  : Agent {agent} ran into killer grid and died.\n")
-                    dead_agents.add(agent.agent_id)
+                    print(f"Aegis  : Agent {agent_id} ran into killer grid and died.\n")
+                    dead_agents.add(agent_id)
 
         self._number_of_dead_agents += dead_agents.size()
         return dead_agents
 
+    def set_agent_world_file(self, file: str) -> None:
+        """
+        Sets the file the agents' view of the world is written to, relative to the working directory.
+
+        Args:
+            file: The name of the file, "WorldInfoFile.out" by default.
+        """
+        self._agent_world_file = file
+
     def get_agent_world_filename(self) -> str:
         return self._agent_world_filename
 
-    def _get_spawn(self, agent_id: AgentID) -> tuple[Location, int | None]:
+    def get_random_seed(self) -> int:
+        """Returns the seed the world was built with."""
+        return self._random_seed
+
+    def get_random_streams(self) -> RandomStreams:
+        """Returns the random number streams of the world, seeded with its seed."""
+        return self._random
+
+    def _get_spawn(
+        self, agent_id: AgentID, stream: RandomStream
+    ) -> tuple[Location, int | None]:
         # Priority spawn
         spawns = self._agent_spawn_locations
         for spawn, gid in spawns:
@@ -336,7 +570,7 @@ class AegisWorld:
         # Spawn randomly
         no_gid_locations = [spawn for spawn, gid in spawns if gid is None]
 
-        return random.choice(no_gid_locations), None
+        return stream.choice(no_gid_locations), None
 
     def _delete_prio_spawn(self, loc: Location, gid: int):
         spawn_locs = self._agent_spawn_locations
@@ -351,7 +585,10 @@ class AegisWorld:
         if self._world is None:
             return
 
-        spawn_loc, gid = self._get_spawn(agent_id)
+        stream = self._random.stream(
+            RandomStreams.SPAWN, self.round, agent_id.id, agent_id.gid
+        )
+        spawn_loc, gid = self._get_spawn(agent_id, stream)
         grid = self._world.get_grid_at(spawn_loc)
 
         if grid is not None and gid is not None:
@@ -361,7 +598,7 @@ class AegisWorld:
             if len(self._safe_grid_list) == 0:
                 grid = self._world.get_grid_at(Location(0, 0))
             else:
-                grid = random.choice(self._safe_grid_list)
+                grid = stream.choice(self._safe_grid_list)
 
         if grid is None:
             raise Exception("Aegis  : No grid found for agent")
@@ -375,8 +612,9 @@ class AegisWorld:
         self.add_agent(agent)
 
     def add_agent(self, agent: Agent) -> None:
-        if agent not in self._agents:
-            self._agents.append(agent)
+        if agent.agent_id not in self._agents:
+            agent.move_to_store(self._agent_store)
+            self._agents.add(agent)
             if self._world is None:
                 return
 
@@ -384,15 +622,37 @@ class AegisWorld:
             if grid is None:
                 return
 
+            grid = self._own_grid(grid)
             grid.agent_id_list.add(agent.agent_id)
+            self._grid_changed(grid.location)
             self._number_of_alive_agents += 1
             print(f"Aegis  : Added agent {agent}")
 
     def get_agent(self, agent_id: AgentID) -> Agent | None:
-        for agent in self._agents:
-            if agent.agent_id == agent_id:
-                return agent
-        return None
+        return self._agents.get(agent_id)
+
+    def remove_energy_from_agents(self, agents: list[Agent], energy: int) -> None:
+        """
+        Removes the same amount of energy from agents, in one pass over their energy.
+
+        Args:
+            agents: The agents, all in the world.
+            energy: The amount of energy to remove from every agent.
+        """
+        self._agent_store.remove_energy([agent.slot for agent in agents], energy)
+
+    def charge_agents(self, agents: list[Agent], energy: int, max_energy: int) -> None:
+        """
+        Adds the same amount of energy to agents, in one pass over their energy.
+
+        Args:
+            agents: The agents, all in the world.
+            energy: The amount of energy to add to every agent.
+            max_energy: The most energy an agent can have.
+        """
+        self._agent_store.add_energy(
+            [agent.slot for agent in agents], energy, max_energy
+        )
 
     def move_agent(self, agent_id: AgentID, location: Location) -> None:
         agent = self.get_agent(agent_id)
@@ -405,18 +665,29 @@ class AegisWorld:
         if dest_grid is None or curr_grid is None:
             return
 
+        curr_grid = self._own_grid(curr_grid)
+        dest_grid = self._own_grid(dest_grid)
         curr_grid.agent_id_list.remove(agent.agent_id)
         dest_grid.agent_id_list.add(agent.agent_id)
+        self._grid_changed(curr_grid.location)
+        self._grid_changed(dest_grid.location)
         agent.location = dest_grid.location
 
     def remove_agent(self, agent: Agent | None) -> None:
-        if agent in self._agents and self._world is not None:
-            self._agents.remove(agent)
+        if (
+            agent is not None
+            and self._agents.get(agent.agent_id) is agent
+            and self._world is not None
+        ):
+            _ = self._agents.remove(agent.agent_id)
+            agent.move_to_store(AgentStore())
             agent_grid = self._world.get_grid_at(agent.location)
             if agent_grid is None:
                 return
 
+            agent_grid = self._own_grid(agent_grid)
             agent_grid.agent_id_list.remove(agent.agent_id)
+            self._grid_changed(agent_grid.location)
             self._number_of_alive_agents -= 1
 
     def remove_layer_from_grid(self, location: Location) -> None:
@@ -427,10 +698,12 @@ class AegisWorld:
         if grid is None:
             return
 
+        grid = self._own_grid(grid)
         world_object = grid.remove_top_layer()
         if world_object is None:
             return
 
+        self._grid_changed(grid.location)
         self._top_layer_removed_grid_list.append(location)
         if isinstance(world_object, Survivor):
             survivor = world_object
@@ -449,28 +722,334 @@ class AegisWorld:
                     survivor_group.number_of_survivors
                 )
 
+    def fork(self) -> "AegisWorld":
+        """
+        Returns a copy of the world, to run on its own and drop when it isn't needed anymore.
+
+        The copy shares the grids, survivors and cached GridInfos with this world and
+        only copies the per-world lists, counters and agent store, so forking takes time
+        in the number of agents and survivors, not in the number of grids. Afterwards
+        both worlds copy a grid, survivor or survivor group the first time they change
+        it, so neither sees the changes of the other.
+
+        The fork draws from the same random streams, it draws the same numbers as
+        this world for the same round and entity.
+
+        Returns:
+            The copy of the world.
+        """
+        fork = AegisWorld()
+        fork._aegis_world_file = self._aegis_world_file
+        fork._agent_world_filename = self._agent_world_filename
+        fork._agent_world_file_text = self._agent_world_file_text
+        fork._agent_world_file = self._agent_world_file
+        fork._agent_locations = dict(self._agent_locations)
+        fork._agent_spawn_locations = dict(self._agent_spawn_locations)
+        fork._low_survivor_level = self._low_survivor_level
+        fork._mid_survivor_level = self._mid_survivor_level
+        fork._high_survivor_level = self._high_survivor_level
+        fork._random_seed = self._random_seed
+        fork._random = self._random
+        fork.round = self.round
+        fork._initial_agent_energy = self._initial_agent_energy
+        fork._number_of_survivors = self._number_of_survivors
+        fork._number_of_alive_agents = self._number_of_alive_agents
+        fork._number_of_dead_agents = self._number_of_dead_agents
+        fork._number_of_survivors_alive = self._number_of_survivors_alive
+        fork._number_of_survivors_dead = self._number_of_survivors_dead
+        fork._number_of_survivors_saved_alive = self._number_of_survivors_saved_alive
+        fork._number_of_survivors_saved_dead = self._number_of_survivors_saved_dead
+        fork._max_move_cost = self._max_move_cost
+
+        if self._world is not None:
+            fork._world = self._world.fork()
+        fork._grid_info_cache = dict(self._grid_info_cache)
+        fork._grid_cells = dict(self._grid_cells)
+        fork._unsent_grids = set(self._unsent_grids)
+        fork._safe_grid_list = list(self._safe_grid_list)
+        fork._top_layer_removed_grid_list = list(self._top_layer_removed_grid_list)
+        fork._grid_digests = dict(self._grid_digests)
+        fork._grids_digest = self._grids_digest
+        fork._changed_grids = set(self._changed_grids)
+        fork._unreported_grids = set(self._unreported_grids)
+        fork._survivor_locations = self._survivor_locations
+        fork._survivor_group_locations = self._survivor_group_locations
+        fork._survivors_list = dict(self._survivors_list)
+        # the shared survivors keep the store as it is now, each world changes a copy
+        store = self._survivor_store
+        self._survivor_store = store.copy()
+        fork._survivor_store = store.copy()
+        fork._survivor_groups_list = dict(self._survivor_groups_list)
+
+        fork._agent_store = self._agent_store.copy()
+        for agent in self._agents:
+            fork._agents.add(agent.clone(fork._agent_store))
+
+        fork._fire_simulator.copy_state(self._fire_simulator)
+        for simulator in self._installed_simulators:
+            fork.install_simulator(simulator)
+        fork._survivor_simulator.survivors_list = fork._survivors_list
+        fork._survivor_simulator.survivor_groups_list = fork._survivor_groups_list
+        self._survivor_simulator.survivor_store = self._survivor_store
+        fork._survivor_simulator.survivor_store = fork._survivor_store
+
+        for world in (self, fork):
+            world._owned_grids = set()
+            world._owned_survivors = set()
+            world._owned_survivor_groups = set()
+        return fork
+
+    def _own_grid(self, grid: Grid) -> Grid:
+        """Returns the grid to change, a copy of it if it is shared with a fork."""
+        owned_grids = self._owned_grids
+        if owned_grids is None or grid.location in owned_grids or self._world is None:
+            return grid
+        grid = grid.clone(clone_layers=False)
+        self._world.set_grid_at(grid.location, grid)
+        owned_grids.add(grid.location)
+        return grid
+
+    def _own_survivor(self, survivor: Survivor) -> Survivor:
+        """Returns the survivor to change, a copy of it if it is shared with a fork."""
+        location = self._survivor_locations.get(survivor.id)
+        if location is not None:
+            self._grid_changed(location)
+        owned_survivors = self._owned_survivors
+        if owned_survivors is None or survivor.id in owned_survivors:
+            return survivor
+        copy = survivor.clone(self._survivor_store)
+        self._replace_layer(location, survivor, copy)
+        if self._survivors_list.get(survivor.id) is survivor:
+            self._survivors_list[survivor.id] = copy
+        owned_survivors.add(survivor.id)
+        return copy
+
+    def _own_survivor_group(self, survivor_group: SurvivorGroup) -> SurvivorGroup:
+        """Returns the survivor group to change, a copy of it if it is shared with a fork."""
+        location = self._survivor_group_locations.get(survivor_group.id)
+        if location is not None:
+            self._grid_changed(location)
+        owned_survivor_groups = self._owned_survivor_groups
+        if owned_survivor_groups is None or survivor_group.id in owned_survivor_groups:
+            return survivor_group
+        copy = survivor_group.clone()
+        self._replace_layer(location, survivor_group, copy)
+        if self._survivor_groups_list.get(survivor_group.id) is survivor_group:
+            self._survivor_groups_list[survivor_group.id] = copy
+        owned_survivor_groups.add(survivor_group.id)
+        return copy
+
+    def _replace_layer(
+        self, location: Location | None, layer: WorldObject, new_layer: WorldObject
+    ) -> None:
+        if location is None:
+            return
+        grid = self.get_grid_at(location)
+        if grid is not None:
+            self._own_grid(grid).replace_layer(layer, new_layer)
+
+    def _run_simulator(
+        self, simulator: Simulator
+    ) -> tuple[list[SimulatorEvent], float]:
+        start = time.perf_counter()
+        events = simulator.run(self, self._random, self.round)
+        return events, time.perf_counter() - start
+
+    def _apply_simulator_events(self, events: list[SimulatorEvent]) -> None:
+        for event in events:
+            if event.location is None:
+                continue
+            self._grid_changed(event.location)
+            grid = self.get_grid_at(event.location)
+            if grid is None:
+                continue
+            for agent_id in grid.agent_id_list:
+                agent = self._agents.get(agent_id)
+                if agent is not None:
+                    self._agent_store.touch(agent.slot)
+
+    def get_simulator_timings(self) -> dict[str, SimulatorTiming]:
+        """Returns the time each simulator took to run, by name, in this simulation."""
+        return self._simulator_timings
+
+    def get_grid_to_change(self, location: Location) -> Grid | None:
+        """
+        Returns the grid at a location for a simulator to change, a copy of it if
+        it is shared with a fork of the world.
+
+        Args:
+            location: The location of the grid.
+        """
+        grid = self.get_grid_at(location)
+        if grid is None:
+            return None
+        return self._own_grid(grid)
+
     def get_grid_at(self, location: Location) -> Grid | None:
         if self._world is not None:
             return self._world.get_grid_at(location)
         return None
 
-    def get_surround_info(self, location: Location) -> SurroundInfo | None:
-        surround_info = SurroundInfo()
+    def get_grid_info(self, location: Location) -> GridInfo:
+        """
+        Returns the GridInfo of a location, a NO_GRID GridInfo if it is off the map.
+
+        The GridInfo is cached until the grid's layers, fire or agents change, or
+        the survivors on it lose energy, so it is shared by every result built
+        from it and must not be changed.
+
+        Args:
+            location: The location of the grid.
+        """
+        grid_info = self._grid_info_cache.get(location)
+        if grid_info is None:
+            grid = self.get_grid_at(location)
+            grid_info = GridInfo() if grid is None else grid.get_grid_info()
+            self._grid_info_cache[location] = grid_info
+        return grid_info
+
+    def clip_area(
+        self, location: Location, width: int, height: int
+    ) -> tuple[Location, int, int]:
+        """
+        Cuts a rectangle of grids down to the part of it on the map.
+
+        Args:
+            location: The location of the corner of the rectangle with the lowest X and Y.
+            width: The number of grids along X.
+            height: The number of grids along Y.
+
+        Returns:
+            The corner, width and height of the part on the map, the width and
+            height are 0 if none of it is.
+        """
+        if self._world is None:
+            return location, 0, 0
+        min_x = max(location.x, 0)
+        min_y = max(location.y, 0)
+        max_x = min(location.x + width, self._world.width)
+        max_y = min(location.y + height, self._world.height)
+        if min_x >= max_x or min_y >= max_y:
+            return location, 0, 0
+        return Location(min_x, min_y), max_x - min_x, max_y - min_y
+
+    def get_area_info(
+        self, location: Location, width: int, height: int
+    ) -> list[GridInfo]:
+        """
+        Returns the GridInfos of a rectangle of grids, see `get_grid_info`.
+
+        Args:
+            location: The location of the corner of the rectangle with the lowest X and Y.
+            width: The number of grids along X.
+            height: The number of grids along Y.
+
+        Returns:
+            The GridInfos, ordered by X then Y.
+        """
+        return [
+            self.get_grid_info(Location(x, y))
+            for x in range(location.x, location.x + width)
+            for y in range(location.y, location.y + height)
+        ]
+
+    def _grid_changed(self, location: Location) -> None:
+        """
+        Drops the cached GridInfo of a grid that changed, and has its digest and
+        JSON updated.
+        """
+        _ = self._grid_info_cache.pop(location, None)
+        self._changed_grids.add(location)
+        self._unsent_grids.add(location)
+
+    def _update_grid_digests(self) -> None:
+        """Digests the grids that changed since the last update again."""
         if self._world is None:
             return
+        for location in self._changed_grids:
+            grid = self._world.get_grid_at(location)
+            if grid is None:
+                continue
+            digest = grid.digest()
+            self._grids_digest ^= self._grid_digests.get(location, 0) ^ digest
+            self._grid_digests[location] = digest
+        self._unreported_grids |= self._changed_grids
+        self._changed_grids.clear()
+
+    def get_state_digest(self) -> int:
+        """
+        Returns the digest of the state of the world, the XOR of the digests of its
+        grids and agents.
+
+        The digests are kept up to date as the world changes, only the grids that
+        changed since the last call are digested again.
+        """
+        self._update_grid_digests()
+        return self._grids_digest ^ self._agent_store.get_digest()
+
+    def state_digest_message(self, all_grids: bool = False) -> str:
+        """
+        Returns the digest of the state of the world for the replay, with the digests
+        of the agents and of the grids that changed since the last message.
+
+        Args:
+            all_grids: True to list the digests of every grid, not only the ones that changed.
+        """
+        self._update_grid_digests()
+        if all_grids:
+            self._unreported_grids.update(self._grid_digests)
+        agents_digest = self._agent_store.get_digest()
+        s = f"State_Digest; {{ WORLD {self._grids_digest ^ agents_digest:016x} ; "
+        s += f"AGENTS {agents_digest:016x} ; CELLS "
+        if not self._unreported_grids:
+            s += "NONE"
+        else:
+            for location in sorted(
+                self._unreported_grids, key=lambda loc: (loc.x, loc.y)
+            ):
+                s += f"({location.x},{location.y},{self._grid_digests[location]:016x}),"
+            self._unreported_grids.clear()
+        s += " };\n"
+        return s
+
+    def get_life_signals(self, location: Location, agent_id: AgentID) -> LifeSignals:
+        """
+        Returns the life signals an agent senses in a grid this round.
+
+        Args:
+            location: The location of the grid.
+            agent_id: The agent that senses them, every agent gets its own distortion.
+        """
+        if self._world is None:
+            return LifeSignals()
         grid = self._world.get_grid_at(location)
         if grid is None:
-            return
-        surround_info.life_signals = grid.get_generated_life_signals()
-        surround_info.set_current_info(grid.get_grid_info())
+            return LifeSignals()
+        stream = self._random.stream(
+            RandomStreams.LIFE_SIGNALS,
+            self.round,
+            location.x,
+            location.y,
+            agent_id.id,
+            agent_id.gid,
+        )
+        return grid.get_generated_life_signals(stream)
 
-        for direction in Direction:
-            grid = self._world.get_grid_at(location.add(direction))
-            if grid is None:
-                surround_info.set_surround_info(direction, GridInfo())
-            else:
-                surround_info.set_surround_info(direction, grid.get_grid_info())
-        return surround_info
+    def get_surround_info(
+        self, location: Location, agent_id: AgentID
+    ) -> SurroundInfo | None:
+        if self._world is None:
+            return
+        grid = self._world.get_grid_at(location)
+        if grid is None:
+            return
+        return SurroundInfo(
+            self.get_life_signals(location, agent_id),
+            {
+                direction: self.get_grid_info(location.add(direction))
+                for direction in Direction
+            },
+        )
 
     def remove_survivor(self, survivor: Survivor) -> None:
         del self._survivors_list[survivor.id]
@@ -484,63 +1063,46 @@ class AegisWorld:
         return world
 
     def convert_to_json(self) -> WorldDict:
+        return self.snapshot().convert_to_json()
+
+    def snapshot(self) -> WorldSnapshot:
+        """
+        Returns what the viewer is sent of the world now, to turn into JSON with
+        `WorldSnapshot.convert_to_json` on another thread.
+
+        Only the grids that changed since the last snapshot are read again, the
+        JSON of the others is shared with it.
+        """
         if self._world is None:
             raise Exception(
                 "Aegis  : World is not initialized! Cannot send world object to client!"
             )
 
-        agent_data: list[AgentInfoDict] = []
-        grid_data: list[GridCellDict] = []
-        top_layer_rem_data: list[LocationDict] = []
-        agent_map = {
-            (
-                agent.agent_id.id,
-                agent.agent_id.gid,
-            ): agent
+        if not self._grid_cells:
+            for x in range(self._world.width):
+                for y in range(self._world.height):
+                    self._update_grid_cell(Location(x, y))
+        else:
+            for location in self._unsent_grids:
+                # a grid keeps its place in the order it was first added in
+                if location in self._grid_cells:
+                    self._update_grid_cell(location)
+        self._unsent_grids.clear()
+
+        agent_states = {
+            (agent.agent_id.id, agent.agent_id.gid): (
+                agent.get_energy_level(),
+                agent.command_sent,
+            )
             for agent in self._agents
         }
-
-        for x in range(self._world.width):
-            for y in range(self._world.height):
-                grid = self._world.get_grid_at(Location(x, y))
-                if grid is None:
-                    continue
-
-                grid_info = grid.get_grid_info()
-                grid_layers = grid.get_grid_layers()
-
-                grid_dict: GridCellDict = {
-                    "grid_type": str(grid_info.grid_type),
-                    "stack": {
-                        "grid_loc": {"x": x, "y": y},
-                        "move_cost": grid_info.move_cost,
-                        "contents": [layer.json() for layer in grid_layers],
-                    },
-                }
-                grid_data.append(grid_dict)
-
-                for agent_id in grid.agent_id_list:
-                    key = (agent_id.id, agent_id.gid)
-                    agent = agent_map.get(key)
-
-                    if agent is not None:
-                        agent_dict: AgentInfoDict = {
-                            "id": agent.agent_id.id,
-                            "gid": agent.agent_id.gid,
-                            "x": x,
-                            "y": y,
-                            "energy_level": agent.get_energy_level(),
-                            "command_sent": agent.command_sent,
-                        }
-                        agent_data.append(agent_dict)
-
-        for top_layer in self._top_layer_removed_grid_list:
-            top_dict: LocationDict = {"x": top_layer.x, "y": top_layer.y}
-            top_layer_rem_data.append(top_dict)
-
+        top_layer_rem_data: list[LocationDict] = [
+            {"x": top_layer.x, "y": top_layer.y}
+            for top_layer in self._top_layer_removed_grid_list
+        ]
         world_dict: WorldDict = {
-            "grid_data": grid_data,
-            "agent_data": agent_data,
+            "grid_data": [],
+            "agent_data": [],
             "top_layer_rem_data": top_layer_rem_data,
             "number_of_alive_agents": self._number_of_alive_agents,
             "number_of_dead_agents": self._number_of_dead_agents,
@@ -550,8 +1112,26 @@ class AegisWorld:
             "number_of_survivors_saved_alive": self._number_of_survivors_saved_alive,
             "number_of_survivors_saved_dead": self._number_of_survivors_saved_dead,
         }
+        return WorldSnapshot(tuple(self._grid_cells.values()), agent_states, world_dict)
 
-        return world_dict
+    def _update_grid_cell(self, location: Location) -> None:
+        """Builds the JSON of a grid again, with the agents on it."""
+        grid = self.get_grid_at(location)
+        if grid is None:
+            return
+        grid_info = self.get_grid_info(location)
+        grid_dict: GridCellDict = {
+            "grid_type": str(grid_info.grid_type),
+            "stack": {
+                "grid_loc": {"x": location.x, "y": location.y},
+                "move_cost": grid_info.move_cost,
+                "contents": [layer.json() for layer in grid.get_grid_layers()],
+            },
+        }
+        agent_keys = tuple(
+            (agent_id.id, agent_id.gid) for agent_id in grid.agent_id_list
+        )
+        self._grid_cells[location] = (grid_dict, agent_keys)
 
     def set_state(self, state: State) -> None:
         self._states.put(state)
@@ -576,4 +1156,12 @@ class AegisWorld:
         )
 
     def get_agents(self) -> list[Agent]:
-        return self._agents
+        return list(self._agents)
+
+    def get_survivors(self) -> list[Survivor]:
+        """Returns the survivors that haven't been saved."""
+        return list(self._survivors_list.values())
+
+    def get_survivor_store(self) -> SurvivorStore:
+        """Returns the store the survivors of the world are kept in."""
+        return self._survivor_store
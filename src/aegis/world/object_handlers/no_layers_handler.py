@@ -19,4 +19,4 @@ class NoLayersHandler(ObjectHandler):
 
     @override
     def reset(self) -> None:
-        pass
+        self.world_object_count = 0
@@ -32,3 +32,4 @@ class RubbleHandler(ObjectHandler):
     @override
     def reset(self) -> None:
         self.rb_map.clear()
+        self.world_object_count = 0
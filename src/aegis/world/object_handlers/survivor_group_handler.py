@@ -40,5 +40,6 @@ class SurvivorGroupHandler(ObjectHandler):
     @override
     def reset(self) -> None:
         self.svg_map.clear()
+        self.world_object_count = 0
         self.alive = 0
         self.dead = 0
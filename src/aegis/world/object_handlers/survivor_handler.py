@@ -48,5 +48,6 @@ class SurvivorHandler(ObjectHandler):
     @override
     def reset(self) -> None:
         self.sv_map.clear()
+        self.world_object_count = 0
         self.alive = 0
         self.dead = 0
@@ -0,0 +1,11 @@
+__all__ = [
+    "FireSimulator",
+    "Simulator",
+    "SimulatorEvent",
+    "SimulatorTiming",
+    "SurvivorSimulator",
+]
+
+from aegis.world.simulators.fire_simulator import FireSimulator
+from aegis.world.simulators.simulator import Simulator, SimulatorEvent, SimulatorTiming
+from aegis.world.simulators.survivor_simulator import SurvivorSimulator
@@ -1,43 +1,170 @@
-from aegis.common import Direction, Utility
-from aegis.common.world.grid import Grid
-from aegis.common.world.world import World
-
-
-class FireSimulator:
-    def __init__(
-        self,
-        fire_grids_list: list[Grid],
-        non_fire_grids_list: list[Grid],
-        world: World | None,
-    ) -> None:
-        self._fire_grids_list = fire_grids_list
-        self._non_fire_grids_list = non_fire_grids_list
-        self._world = world
-
-    def run(self) -> str:
-        s = ""
-        if not self._non_fire_grids_list or self._world is None:
-            return s
-        count = 0
-        number_to_spread = Utility.random_in_range(0, 2)
-        s += "Fire Grids; { "
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, override
+
+from aegis.common import Constants, Direction, Location, RandomStreams
+from aegis.world.simulators.simulator import Simulator, SimulatorEvent
+
+if TYPE_CHECKING:
+    from aegis.world.aegis_world import AegisWorld
+
+# the fire spreads in every direction but CENTER
+_DIRECTIONS = [direction for direction in Direction if direction != Direction.CENTER]
+_OFFSETS = [(direction.dx, direction.dy) for direction in _DIRECTIONS]
+
+
+class FireSimulator(Simulator):
+    """
+    Spreads the fire from grid to grid.
+
+    Grids are kept as indices, X * height + Y. The simulator keeps the burning grids,
+    the frontier of grids next to them that can still catch fire, and the burning
+    grids the fire can still spread from, those with a frontier grid next to them.
+    The frontier is worked out once, before the fire first spreads, and the
+    neighbours of a grid are worked out from its index when needed, so a round only
+    takes time in the number of grids that catch fire, not in the size of the world.
+    """
+
+    def __init__(self) -> None:
+        super().__init__("fire")
+        self._width = 0
+        self._height = 0
+        self._burning: set[int] = set()
+        self._frontier: set[int] = set()
+        # the burning grids the fire can spread from, and where they are in the list
+        self._spreading: list[int] = []
+        self._spreading_index: dict[int, int] = {}
+        self._set_up = False
+
+    def start(self, width: int, height: int, burning: list[Location]) -> None:
+        """
+        Sets the fire up for a world that was just built.
+
+        Args:
+            width: The width of the world.
+            height: The height of the world.
+            burning: The grids that are on fire.
+        """
+        self._width = width
+        self._height = height
+        self._burning = {location.x * height + location.y for location in burning}
+        self._frontier = set()
+        self._spreading = []
+        self._spreading_index = {}
+        self._set_up = False
+
+    def _set_up_frontier(self) -> None:
+        self._set_up = True
+        for index in sorted(self._burning):
+            for neighbour in self._get_neighbours(index):
+                if neighbour >= 0 and neighbour not in self._burning:
+                    self._frontier.add(neighbour)
+                    self._add_spreading(index)
+
+    def copy_state(self, other: FireSimulator) -> None:
+        """Makes the fire the same as another simulator's, for a fork of its world."""
+        self._width = other._width
+        self._height = other._height
+        self._burning = set(other._burning)
+        self._frontier = set(other._frontier)
+        self._spreading = list(other._spreading)
+        self._spreading_index = dict(other._spreading_index)
+        self._set_up = other._set_up
+
+    def _get_neighbours(self, index: int) -> list[int]:
+        """Returns the neighbours of a grid in `_DIRECTIONS` order, -1 off the world."""
+        width = self._width
+        height = self._height
+        x, y = divmod(index, height)
+        neighbours: list[int] = []
+        for dx, dy in _OFFSETS:
+            nx = x + dx
+            ny = y + dy
+            if 0 <= nx < width and 0 <= ny < height:
+                neighbours.append(nx * height + ny)
+            else:
+                neighbours.append(-1)
+        return neighbours
+
+    def _add_spreading(self, index: int) -> None:
+        if index not in self._spreading_index:
+            self._spreading_index[index] = len(self._spreading)
+            self._spreading.append(index)
+
+    def _remove_spreading(self, index: int) -> None:
+        position = self._spreading_index.pop(index)
+        last = self._spreading.pop()
+        if last != index:
+            self._spreading[position] = last
+            self._spreading_index[last] = position
+
+    def _ignite(self, index: int) -> None:
+        self._frontier.discard(index)
+        self._burning.add(index)
+        for neighbour in self._get_neighbours(index):
+            if neighbour < 0:
+                continue
+            if neighbour not in self._burning:
+                self._frontier.add(neighbour)
+                self._add_spreading(index)
+            elif neighbour in self._spreading_index and not any(
+                n >= 0 and n not in self._burning
+                for n in self._get_neighbours(neighbour)
+            ):
+                self._remove_spreading(neighbour)
+
+    @override
+    def is_enabled(self) -> bool:
+        return Constants.FIRE_SPREAD
+
+    @override
+    def run(
+        self, world: AegisWorld, streams: RandomStreams, round: int
+    ) -> list[SimulatorEvent]:
+        """
+        Spreads the fire from some of the grids it can spread from.
+
+        Args:
+            world: The world the fire spreads in.
+            streams: The random numbers of the world.
+            round: The round the fire is spread in.
+
+        Returns:
+            The grids that caught fire.
+        """
+        if not self._set_up:
+            self._set_up_frontier()
+        events: list[SimulatorEvent] = []
+        stream = streams.stream(RandomStreams.FIRE, round)
+        height = self._height
+        number_to_spread = stream.random_in_range(0, 2)
         for _ in range(number_to_spread):
-            fire_grid = self._fire_grids_list[
-                Utility.random_in_range(0, len(self._fire_grids_list) - 1)
+            if not self._spreading:
+                break
+            fire_index = self._spreading[
+                stream.random_in_range(0, len(self._spreading) - 1)
             ]
-            number_of_directions = Utility.random_in_range(1, 3)
+            neighbours = self._get_neighbours(fire_index)
+            number_of_directions = stream.random_in_range(1, 3)
             for _ in range(number_of_directions):
-                dir = Direction.get_random_direction()
-                spread_grid = self._world.get_grid_at(fire_grid.location.add(dir))
-                if spread_grid is None or spread_grid.is_on_fire():
+                spread_index = neighbours[
+                    stream.random_in_range(0, len(_DIRECTIONS) - 1)
+                ]
+                if spread_index not in self._frontier:
                     continue
 
-                s += f"{spread_grid.location.proc_string()}"
-                count += 1
-                self._non_fire_grids_list.remove(spread_grid)
+                location = Location(spread_index // height, spread_index % height)
+                spread_grid = world.get_grid_to_change(location)
+                if spread_grid is None:
+                    continue
                 spread_grid.set_on_fire(True)
-                self._fire_grids_list.append(spread_grid)
-        if count <= 0:
-            s += "NONE"
-        s += " };\n"
-        return s
+                self._ignite(spread_index)
+                events.append(SimulatorEvent(SimulatorEvent.FIRE, location))
+        return events
+
+    @override
+    def get_replay_text(self, events: list[SimulatorEvent]) -> str:
+        locations = "".join(
+            event.location.proc_string() for event in events if event.location
+        )
+        return f"Fire Grids; {{ {locations or 'NONE'} }};\n"
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from aegis.common import Location, RandomStreams
+
+if TYPE_CHECKING:
+    from aegis.world.aegis_world import AegisWorld
+
+
+class SimulatorEvent:
+    """
+    A change a simulator made to the world in a round.
+
+    Attributes:
+        kind (str): What changed, one of the constants of this class or a kind of
+            the simulator's own.
+        location (Location | None): The grid that changed. AEGIS counts the grid
+            as changed, for the agents on it and the state digest.
+        id (int | None): The object that changed, like a survivor's ID.
+        value (int | None): The object's new value, like a survivor's energy.
+    """
+
+    FIRE = "FIRE"
+    SURVIVOR_ENERGY = "SURVIVOR_ENERGY"
+    SURVIVOR_GROUP_ENERGY = "SURVIVOR_GROUP_ENERGY"
+
+    def __init__(
+        self,
+        kind: str,
+        location: Location | None = None,
+        id: int | None = None,
+        value: int | None = None,
+    ) -> None:
+        self.kind = kind
+        self.location = location
+        self.id = id
+        self.value = value
+
+    def __str__(self) -> str:
+        return f"{self.kind} ( {self.location} , {self.id} , {self.value} )"
+
+
+class SimulatorTiming:
+    """
+    The time a simulator took to run.
+
+    Attributes:
+        last_round (float): The seconds it took in the last round it ran.
+        total (float): The seconds it took in every round together.
+        rounds (int): The number of rounds it ran in.
+    """
+
+    def __init__(self) -> None:
+        self.last_round = 0.0
+        self.total = 0.0
+        self.rounds = 0
+
+    def add(self, seconds: float) -> None:
+        self.last_round = seconds
+        self.total += seconds
+        self.rounds += 1
+
+
+class Simulator(ABC):
+    """
+    A stage of the world that runs at the end of every round, after the agents'
+    commands, like the fire spreading or the survivors losing energy.
+
+    Simulators are installed with `AegisWorld.install_simulator` and run in the
+    order they were installed. An installed simulator is shared with the forks of
+    the world, so it keeps its state in the world it is given, not in itself.
+
+    A simulator that is parallel safe may run at the same time as the parallel safe
+    simulators installed next to it. Its `run` must only read the world, draw from
+    streams of its own and return the changes it wants to make, which are made by
+    `apply`, one simulator at a time in the order they were installed.
+    """
+
+    def __init__(self, name: str, parallel_safe: bool = False) -> None:
+        """
+        Args:
+            name: Names the simulator, in the timings.
+            parallel_safe: Whether the simulator may run at the same time as others.
+        """
+        self.name = name
+        self.parallel_safe = parallel_safe
+
+    def is_enabled(self) -> bool:
+        """Returns whether the simulator runs this round, it writes nothing to the replay if not."""
+        return True
+
+    @abstractmethod
+    def run(
+        self, world: AegisWorld, streams: RandomStreams, round: int
+    ) -> list[SimulatorEvent]:
+        """
+        Runs the simulator for a round.
+
+        Grids are changed through `AegisWorld.get_grid_to_change`, so forks of the
+        world don't see the change.
+
+        Args:
+            world: The world to simulate.
+            streams: The random numbers of the world.
+            round: The round to simulate.
+
+        Returns:
+            The changes made, or to make in `apply` for a parallel safe simulator.
+        """
+        pass
+
+    def apply(self, world: AegisWorld, events: list[SimulatorEvent]) -> None:
+        """
+        Makes the changes a parallel safe simulator returned from `run`.
+
+        Args:
+            world: The world to change.
+            events: The changes `run` returned.
+        """
+        pass
+
+    def get_replay_text(self, events: list[SimulatorEvent]) -> str:
+        """
+        Returns the lines the simulator writes to the replay for a round.
+
+        Args:
+            events: The changes of the round.
+        """
+        return ""
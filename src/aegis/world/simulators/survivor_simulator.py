@@ -1,65 +1,169 @@
-from aegis.common.utility import Utility
-from aegis.common.world.objects import SurvivorGroup, Survivor
+from __future__ import annotations
 
+from collections.abc import Callable
+from typing import TYPE_CHECKING, override
 
-class SurvivorSimulator:
+from aegis.common import RandomStreams
+from aegis.common.world.objects import SurvivorGroup, Survivor, WorldObject
+from aegis.common.world.survivor_store import SurvivorStore
+from aegis.world.simulators.simulator import Simulator, SimulatorEvent
+
+if TYPE_CHECKING:
+    from aegis.world.aegis_world import AegisWorld
+
+
+class SurvivorSimulator(Simulator):
     def __init__(
         self,
         survivors_list: dict[int, Survivor],
         survivor_groups_list: dict[int, SurvivorGroup],
+        own_survivor: Callable[[Survivor], Survivor] | None = None,
+        own_survivor_group: Callable[[SurvivorGroup], SurvivorGroup] | None = None,
+        survivor_store: SurvivorStore | None = None,
     ) -> None:
+        """
+        Args:
+            survivors_list: The survivors, by ID.
+            survivor_groups_list: The survivor groups, by ID.
+            own_survivor: Returns the survivor to change in place of one that is
+                shared with a fork of the world, None if nothing is shared.
+            own_survivor_group: The same for survivor groups.
+            survivor_store: The store the survivors are kept in, or a copy of it,
+                None for an empty store.
+        """
+        super().__init__("survivors")
+        self.survivor_store = (
+            survivor_store if survivor_store is not None else SurvivorStore()
+        )
         self.survivors_list = survivors_list
         self.survivor_groups_list = survivor_groups_list
+        self._own_survivor = own_survivor
+        self._own_survivor_group = own_survivor_group
+
+    @override
+    def run(
+        self, world: AegisWorld, streams: RandomStreams, round: int
+    ) -> list[SimulatorEvent]:
+        """
+        Drains the energy of some of the survivors and survivor groups.
+
+        Args:
+            world: The world the survivors are in.
+            streams: The random numbers of the world, every survivor and survivor
+                group draws from a stream of its own.
+            round: The round the survivors are simulated for.
+
+        Returns:
+            The survivors and survivor groups that lost energy, with their new energy.
+        """
+        return self.update_sv_list(streams, round) + self.update_svg_list(
+            streams, round
+        )
 
-    def run(self) -> str:
-        s = ""
-        s += f"{self.update_sv_list()}\n"
-        s += f"{self.update_svg_list()}\n"
-        return s
+    @override
+    def get_replay_text(self, events: list[SimulatorEvent]) -> str:
+        survivors = "".join(
+            f"({event.id},{event.value})"
+            for event in events
+            if event.kind == SimulatorEvent.SURVIVOR_ENERGY
+        )
+        survivor_groups = "".join(
+            f"({event.id},{event.value})"
+            for event in events
+            if event.kind == SimulatorEvent.SURVIVOR_GROUP_ENERGY
+        )
+        return (
+            f"SV; {{ {survivors or 'NONE'} }};\n"
+            f"SVG; {{ {survivor_groups or 'NONE'} }};\n"
+        )
 
-    def update_sv_list(self) -> str:
-        s = "SV; { "
-        changed_count = 0
-        for survivor in self.survivors_list.values():
-            change = Utility.random_in_range(0, 20)
-            if change < 12:
-                continue
-            if survivor.is_dead():
-                continue
-            changed_count += 1
-            remove_energy = survivor.damage_factor * Utility.random_in_range(1, 5)
-            remove_energy += survivor.body_mass + survivor.mental_state
-            change = Utility.random_in_range(5, 10)
-            if remove_energy > change:
-                remove_energy %= change
+    def update_sv_list(
+        self, streams: RandomStreams, round: int
+    ) -> list[SimulatorEvent]:
+        """
+        Drains the energy of some of the survivors. The survivors are read from the
+        columns of the survivor store and the random numbers of all of them are
+        drawn at once, only the survivors that lose energy are gone through one by
+        one. The survivors must be kept in the store, or in the store it was copied
+        from.
+        """
+        survivors = list(self.survivors_list.values())
+        if not survivors:
+            return []
+        store = self.survivor_store
+        slots = [survivor.slot for survivor in survivors]
+        keys = streams.stream_keys(
+            RandomStreams.SURVIVORS, round, [survivor.id for survivor in survivors]
+        )
+        changes = RandomStreams.numbers_in_range(keys, 1, 0, 20)
+        states = store.states
+        dead = WorldObject.State.DEAD.value
+        drained = [
+            i
+            for i, change in enumerate(changes)
+            if change >= 12 and states[slots[i]] != dead
+        ]
+        drained_keys = [keys[i] for i in drained]
+        damages = RandomStreams.numbers_in_range(drained_keys, 2, 1, 5)
+        limits = RandomStreams.numbers_in_range(drained_keys, 3, 5, 10)
+
+        events: list[SimulatorEvent] = []
+        for i, damage, limit in zip(drained, damages, limits):
+            slot = slots[i]
+            remove_energy = store.damage_factor[slot] * damage
+            remove_energy += store.body_mass[slot] + store.mental_state[slot]
+            if remove_energy > limit:
+                remove_energy %= limit
                 remove_energy += 1
+            survivor = survivors[i]
+            if self._own_survivor is not None:
+                survivor = self._own_survivor(survivor)
             survivor.remove_energy(remove_energy)
-            s += f"({survivor.id},{survivor.get_energy_level()})"
-        if changed_count <= 0:
-            s += "NONE"
-        s += " };"
-        return s
-
-    def update_svg_list(self) -> str:
-        s = "SVG; { "
-        changed_count = 0
-        for survivor_group in self.survivor_groups_list.values():
-            change = Utility.random_in_range(0, 20)
-            if change < 12:
-                continue
-            if survivor_group.is_dead():
-                continue
-            changed_count += 1
-            remove_energy = (
-                survivor_group.number_of_survivors * Utility.random_in_range(1, 10)
+            events.append(
+                SimulatorEvent(
+                    SimulatorEvent.SURVIVOR_ENERGY,
+                    id=survivor.id,
+                    value=survivor.get_energy_level(),
+                )
             )
-            change = Utility.random_in_range(5, 10)
-            if remove_energy > change:
-                remove_energy %= change
+        return events
+
+    def update_svg_list(
+        self, streams: RandomStreams, round: int
+    ) -> list[SimulatorEvent]:
+        survivor_groups = list(self.survivor_groups_list.values())
+        if not survivor_groups:
+            return []
+        keys = streams.stream_keys(
+            RandomStreams.SURVIVOR_GROUPS,
+            round,
+            [survivor_group.id for survivor_group in survivor_groups],
+        )
+        changes = RandomStreams.numbers_in_range(keys, 1, 0, 20)
+        drained = [
+            i
+            for i, change in enumerate(changes)
+            if change >= 12 and not survivor_groups[i].is_dead()
+        ]
+        drained_keys = [keys[i] for i in drained]
+        damages = RandomStreams.numbers_in_range(drained_keys, 2, 1, 10)
+        limits = RandomStreams.numbers_in_range(drained_keys, 3, 5, 10)
+
+        events: list[SimulatorEvent] = []
+        for i, damage, limit in zip(drained, damages, limits):
+            survivor_group = survivor_groups[i]
+            remove_energy = survivor_group.number_of_survivors * damage
+            if remove_energy > limit:
+                remove_energy %= limit
                 remove_energy += 1
+            if self._own_survivor_group is not None:
+                survivor_group = self._own_survivor_group(survivor_group)
             survivor_group.remove_energy(remove_energy)
-            s += f"({survivor_group.id},{survivor_group.get_energy_level()})"
-        if changed_count <= 0:
-            s += "NONE"
-        s += " };"
-        return s
+            events.append(
+                SimulatorEvent(
+                    SimulatorEvent.SURVIVOR_GROUP_ENERGY,
+                    id=survivor_group.id,
+                    value=survivor_group.get_energy_level(),
+                )
+            )
+        return events
@@ -3,16 +3,19 @@
 # pyright: reportUnknownMemberType = false
 from __future__ import annotations
 
+import os
 import sys
 
 import agent.brain
 from agent.agent_states import AgentStates
 from agent.log_levels import LogLevels
 from aegis.common import AgentID, Location
+from aegis.common.commands.aegis_command import AegisCommand
 from aegis.common.commands.agent_commands import CONNECT
 from aegis.common.commands.command import Command
 from aegis.common.network.aegis_socket import AegisSocket
 from aegis.common.network.aegis_socket_exception import AegisSocketException
+from aegis.common.network.local_aegis_socket import LocalAegisSocket
 from aegis.common.parsers.aegis_parser import AegisParser
 from aegis.common.parsers.aegis_parser_exception import AegisParserException
 
@@ -20,7 +23,9 @@ from aegis.common.parsers.aegis_parser_exception import AegisParserException
 class BaseAgent:
     """Represents a base agent that connects to and interacts with AEGIS."""
 
-    AGENT_PORT = 6001
+    AGENT_PORT = int(os.environ.get("AEGIS_PORT", 6001))
+    # the session to join when AEGIS hosts several simulations
+    AGENT_SESSION: str | None = os.environ.get("AEGIS_SESSION")
     _agent = None
     _log_level: LogLevels = LogLevels.Nothing
     _log_test: bool = False
@@ -33,7 +38,7 @@ class BaseAgent:
         self._location = Location(-1, -1)
         self._brain: agent.brain.Brain | None = None
         self._energy_level = -1
-        self._aegis_socket = None
+        self._aegis_socket: AegisSocket | LocalAegisSocket | None = None
 
     @staticmethod
     def get_base_agent() -> BaseAgent:
@@ -42,6 +47,16 @@ class BaseAgent:
             BaseAgent._agent = BaseAgent()
         return BaseAgent._agent
 
+    def activate(self) -> None:
+        """
+        Makes this the base agent returned by `get_base_agent` and logged by `log`.
+
+        Used when several agents run in one process, each one is activated before
+        it handles commands from AEGIS. Brains get their own agent from
+        `Brain.base_agent` instead.
+        """
+        BaseAgent._agent = self
+
     def set_agent_state(self, agent_state: AgentStates) -> None:
         """
         Sets the state of the base agent.
@@ -60,6 +75,15 @@ class BaseAgent:
         """Returns the current round number of the simulation."""
         return self._round
 
+    def skip_rounds(self, rounds: int) -> None:
+        """
+        Counts the rounds the agent did not think in while AEGIS followed its move plan.
+
+        Args:
+            rounds: The number of rounds.
+        """
+        self._round += rounds
+
     def get_agent_id(self) -> AgentID:
         """Returns the ID of the base agent."""
         return self._id
@@ -146,6 +170,7 @@ class BaseAgent:
         """
         if self._agent_state == AgentStates.CONNECTING:
             self._brain = brain
+            brain.set_base_agent(self)
             if self._connect_to_aegis(host, group_name):
                 self._run_base_agent_states()
             else:
@@ -153,6 +178,33 @@ class BaseAgent:
         else:
             self.log(LogLevels.Error, "Multiple calls made to start method, ( call ignored )")
 
+    def start_local(self, aegis_socket: LocalAegisSocket, brain: agent.brain.Brain) -> None:
+        """
+        Starts the agent on an in-memory connection to AEGIS running in the same process.
+
+        AEGIS drives the agent afterwards by calling `handle_aegis_command`.
+
+        Args:
+            aegis_socket: The connection to AEGIS.
+            brain: The brain for the base agent.
+
+        Raises:
+            ValueError: If the brain holds the base agent of another agent, like one
+                it got from `get_base_agent` when it was built.
+        """
+        for value in getattr(brain, "__dict__", {}).values():
+            if isinstance(value, BaseAgent) and value is not self:
+                raise ValueError(
+                    f"{type(brain).__name__} holds another agent's BaseAgent, "
+                    + "use Brain.base_agent instead."
+                )
+        if self._agent_state == AgentStates.CONNECTING:
+            self._brain = brain
+            brain.set_base_agent(self)
+            self._aegis_socket = aegis_socket
+        else:
+            self.log(LogLevels.Error, "Multiple calls made to start method, ( call ignored )")
+
     def _connect_to_aegis(self, host: str, group_name: str) -> bool:
         """
         Attempts to connect to AEGIS.
@@ -165,10 +217,11 @@ class BaseAgent:
         for _ in range(5):
             self.log(LogLevels.Always, "Trying to connect to AEGIS...")
             try:
-                self._aegis_socket = AegisSocket()
-                self._aegis_socket.connect(host, self.AGENT_PORT)
-                self._aegis_socket.send_message(str(CONNECT(group_name)))
-                message = self._aegis_socket.read_message()
+                aegis_socket = AegisSocket()
+                self._aegis_socket = aegis_socket
+                aegis_socket.connect(host, self.AGENT_PORT)
+                aegis_socket.send_command(CONNECT(group_name, self.AGENT_SESSION))
+                message = aegis_socket.read_message()
                 if message is not None and self._brain is not None:
                     self._brain.handle_aegis_command(AegisParser.parse_aegis_command(message))
                 if self.get_agent_state() == AgentStates.CONNECTED:
@@ -194,19 +247,13 @@ class BaseAgent:
         while not end:
             try:
                 aegis_socket = self._aegis_socket
-                if aegis_socket is not None:
+                if isinstance(aegis_socket, AegisSocket):
                     message = aegis_socket.read_message()
                     try:
                         if message is not None:
-                            aegis_command = AegisParser.parse_aegis_command(message)
-                            if self._brain is not None:
-                                self._brain.handle_aegis_command(aegis_command)
-                                agent_state = self._agent_state
-                                if agent_state == AgentStates.THINK:
-                                    self._round += 1
-                                    self._brain.think()
-                                elif agent_state == AgentStates.SHUTTING_DOWN:
-                                    end = True
+                            end = self.handle_aegis_command(
+                                AegisParser.parse_aegis_command(message)
+                            )
                     except AegisParserException as e:
                         self.log(
                             LogLevels.Always,
@@ -220,6 +267,28 @@ class BaseAgent:
         if self._aegis_socket is not None:
             self._aegis_socket.disconnect()
 
+    def handle_aegis_command(self, aegis_command: AegisCommand) -> bool:
+        """
+        Passes a command from AEGIS to the brain, and lets the brain think when its round starts.
+
+        Args:
+            aegis_command: The command received from AEGIS.
+
+        Returns:
+            True if the agent is shutting down.
+        """
+        if self._brain is None:
+            return False
+
+        self._brain.handle_aegis_command(aegis_command)
+        agent_state = self._agent_state
+        if agent_state == AgentStates.THINK:
+            self._round += 1
+            self._brain.think()
+        elif agent_state == AgentStates.SHUTTING_DOWN:
+            return True
+        return False
+
     def send(self, agent_action: Command) -> None:
         """
         Sends an action command to the AEGIS system.
@@ -229,7 +298,7 @@ class BaseAgent:
         """
         if self._aegis_socket is not None:
             try:
-                self._aegis_socket.send_message(str(agent_action))
+                self._aegis_socket.send_command(agent_action)
             except AegisSocketException:
                 self.log(LogLevels.Always, f"Failed to send {agent_action}")
 
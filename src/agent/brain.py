@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 
 from aegis.common.commands.aegis_command import AegisCommand
@@ -10,7 +12,9 @@ from aegis.common.commands.aegis_commands import (
     DISCONNECT,
     MESSAGES_END,
     MESSAGES_START,
+    MOVE_PLAN_RESULT,
     MOVE_RESULT,
+    OBSERVE_AREA_RESULT,
     ROUND_END,
     ROUND_START,
     SAVE_SURV_RESULT,
@@ -30,6 +34,28 @@ class Brain(ABC):
     def __init__(self) -> None:
         """Initializes the Brain instance with no world information."""
         self._world: World | None = None
+        self._base_agent: agent.base_agent.BaseAgent | None = None
+
+    @property
+    def base_agent(self) -> agent.base_agent.BaseAgent:
+        """
+        The base agent of the brain's agent, set when the agent is started.
+
+        Brains running in the AEGIS process each have their own base agent, so a
+        brain must use this rather than `BaseAgent.get_base_agent`.
+        """
+        if self._base_agent is None:
+            return agent.base_agent.BaseAgent.get_base_agent()
+        return self._base_agent
+
+    def set_base_agent(self, base_agent: agent.base_agent.BaseAgent) -> None:
+        """
+        Sets the base agent of the brain's agent.
+
+        Args:
+            base_agent: The base agent the brain is started with.
+        """
+        self._base_agent = base_agent
 
     def get_world(self) -> World | None:
         """Returns the current world information associated with the brain."""
@@ -65,6 +91,24 @@ class Brain(ABC):
         """
         pass
 
+    def handle_move_plan_result(self, mpr: MOVE_PLAN_RESULT) -> None:
+        """
+        Handles the MOVE_PLAN_RESULT command, sent when a move plan ends.
+
+        Args:
+            mpr: The MOVE_PLAN_RESULT command to handle.
+        """
+        pass
+
+    def handle_observe_area_result(self, oar: OBSERVE_AREA_RESULT) -> None:
+        """
+        Handles the OBSERVE_AREA_RESULT command.
+
+        Args:
+            oar: The OBSERVE_AREA_RESULT command to handle.
+        """
+        pass
+
     @abstractmethod
     def think(self) -> None:
         """
@@ -80,7 +124,7 @@ class Brain(ABC):
         Args:
             aegis_command: The command received from AEGIS.
         """
-        base_agent = agent.base_agent.BaseAgent.get_base_agent()
+        base_agent = self.base_agent
         if isinstance(aegis_command, CONNECT_OK):
             connect_ok: CONNECT_OK = aegis_command
             base_agent.set_agent_id(connect_ok.new_agent_id)
@@ -110,6 +154,16 @@ class Brain(ABC):
             base_agent.set_location(move_result_current_info.location)
             self.handle_move_result(move_result)
 
+        elif isinstance(aegis_command, MOVE_PLAN_RESULT):
+            move_plan_result: MOVE_PLAN_RESULT = aegis_command
+            base_agent.skip_rounds(move_plan_result.rounds)
+            self.handle_move_plan_result(move_plan_result)
+
+        elif isinstance(aegis_command, OBSERVE_AREA_RESULT):
+            observe_area_result: OBSERVE_AREA_RESULT = aegis_command
+            base_agent.set_energy_level(observe_area_result.energy_level)
+            self.handle_observe_area_result(observe_area_result)
+
         elif isinstance(aegis_command, ROUND_END):
             base_agent.set_agent_state(AgentStates.IDLE)
 
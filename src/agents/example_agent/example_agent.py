@@ -26,7 +26,6 @@ from agent.log_levels import LogLevels
 class ExampleAgent(Brain):
     def __init__(self) -> None:
         super().__init__()
-        self._agent = BaseAgent.get_base_agent()
         self.SURVIVOR_LOCATION = None
 
     @override
@@ -43,7 +42,7 @@ class ExampleAgent(Brain):
 
         # At the start of the first round, send a request for surrounding information
         # by moving to the center of the current grid. This will help initiate pathfinding.
-        if self._agent.get_round_number() == 1:
+        if self.base_agent.get_round_number() == 1:
             self.send_and_end_turn(MOVE(Direction.CENTER))
             return
 
@@ -55,7 +54,7 @@ class ExampleAgent(Brain):
 
         # Fetch the grid at the agent’s current location. If the location is outside the world’s bounds,
         # return a default move action and end the turn.
-        grid = world.get_grid_at(self._agent.get_location())
+        grid = world.get_grid_at(self.base_agent.get_location())
         if grid is None:
             self.send_and_end_turn(MOVE(Direction.CENTER))
             return
@@ -79,7 +78,7 @@ class ExampleAgent(Brain):
         
         if self.SURVIVOR_LOCATION:
             # Perform A* search
-            path = self.a_star_search(self._agent.get_location(), self.SURVIVOR_LOCATION, world)
+            path = self.a_star_search(self.base_agent.get_location(), self.SURVIVOR_LOCATION, world)
             if path:
                 next_move = path[0]  # Get the next step from the path
                 self.send_and_end_turn(MOVE(next_move))
@@ -149,8 +148,8 @@ class ExampleAgent(Brain):
     def send_and_end_turn(self, command: AgentCommand):
         """Send a command and end your turn."""
         BaseAgent.log(LogLevels.Always, f"SENDING {command}")
-        self._agent.send(command)
-        self._agent.send(END_TURN())
+        self.base_agent.send(command)
+        self.base_agent.send(END_TURN())
 
     def update_surround(self, surround_info: SurroundInfo):
         """Updates the current and surrounding grid cells of the agent."""
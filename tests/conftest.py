@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+# AEGIS reads its config from sys_files, relative to the repository
+os.chdir(ROOT_DIR)
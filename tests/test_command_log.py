@@ -0,0 +1,124 @@
+import contextlib
+import io
+from pathlib import Path
+
+from aegis.aegis_main import Aegis
+from aegis.common import Direction
+from aegis.common.commands.aegis_commands import MOVE_RESULT, SAVE_SURV_RESULT
+from aegis.common.commands.agent_commands import END_TURN, MOVE, SAVE_SURV
+from agent.brain import Brain
+
+WORLD_FILE = "worlds/ver2_1.world"
+AGENTS = 4
+ROUNDS = 30
+
+DIRECTIONS = list(Direction)
+
+
+class WanderingAgent(Brain):
+    """Moves in a different direction every turn and saves a survivor now and then."""
+
+    def __init__(self, number: int) -> None:
+        super().__init__()
+        self._turn = number
+
+    def handle_move_result(self, mr: MOVE_RESULT) -> None:
+        pass
+
+    def handle_save_surv_result(self, ssr: SAVE_SURV_RESULT) -> None:
+        pass
+
+    def think(self) -> None:
+        self._turn += 1
+        if self._turn % 5 == 0:
+            self.base_agent.send(SAVE_SURV())
+        else:
+            self.base_agent.send(MOVE(DIRECTIONS[self._turn % len(DIRECTIONS)]))
+        self.base_agent.send(END_TURN())
+
+
+def start_aegis(run_dir: Path, *args: str) -> Aegis:
+    aegis = Aegis()
+    assert aegis.read_command_line(
+        ["-WorldFile", WORLD_FILE, "-Headless", "true", "-RunDir", str(run_dir)]
+        + list(args)
+    )
+    assert aegis.start_up(listen=False)
+    return aegis
+
+
+def read_replay(run_dir: Path) -> list[str]:
+    """Returns the lines of a replay, without the ones with the time it ran."""
+    replay = (run_dir / "replay.txt").read_text()
+    return [line for line in replay.splitlines() if "System Run" not in line]
+
+
+def test_a_resimulated_run_replays_the_logged_run(tmp_path: Path) -> None:
+    logged_dir = tmp_path / "logged"
+    resimulated_dir = tmp_path / "resimulated"
+    logged_dir.mkdir()
+    resimulated_dir.mkdir()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        aegis = start_aegis(
+            logged_dir, "-NumRound", str(ROUNDS), "-CommandLog", "commands.jsonl"
+        )
+        try:
+            assert aegis.build_world()
+            for number in range(AGENTS):
+                _ = aegis.add_local_agent(WanderingAgent(number))
+            aegis.start_running()
+            aegis.run_state()
+        finally:
+            aegis.shutdown()
+
+        # the logged number of rounds is run, not the one given here
+        aegis = start_aegis(
+            resimulated_dir,
+            "-NumRound",
+            "5",
+            "-Resimulate",
+            str(logged_dir / "commands.jsonl"),
+        )
+        try:
+            assert aegis.resimulate()
+        finally:
+            aegis.shutdown()
+
+    logged_replay = read_replay(logged_dir)
+    assert f"Simulation Start: Number of Rounds {ROUNDS};" in logged_replay
+    assert any("#Save SV" in line for line in logged_replay)
+    assert read_replay(resimulated_dir) == logged_replay
+
+
+def test_a_command_log_of_another_world_is_not_resimulated(tmp_path: Path) -> None:
+    log = tmp_path / "commands.jsonl"
+    with contextlib.redirect_stdout(io.StringIO()):
+        aegis = start_aegis(tmp_path, "-NumRound", "3", "-CommandLog", log.name)
+        try:
+            assert aegis.build_world()
+            _ = aegis.add_local_agent(WanderingAgent(0))
+            aegis.start_running()
+            aegis.run_state()
+        finally:
+            aegis.shutdown()
+
+        aegis = Aegis()
+        assert aegis.read_command_line(
+            [
+                "-WorldFile",
+                "worlds/ver3_2.world",
+                "-NumRound",
+                "3",
+                "-RunDir",
+                str(tmp_path),
+                "-Resimulate",
+                str(log),
+            ]
+        )
+        assert aegis.start_up(listen=False)
+        with contextlib.redirect_stderr(io.StringIO()):
+            try:
+                assert not aegis.resimulate()
+            finally:
+                aegis.shutdown()
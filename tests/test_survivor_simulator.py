@@ -0,0 +1,87 @@
+import contextlib
+import io
+from pathlib import Path
+
+import pytest
+
+from aegis.common import RandomStreams
+from aegis.common.world.objects import Survivor
+from aegis.world.aegis_world import AegisWorld
+
+ROUNDS = 40
+
+
+def build_world(world_name: str, tmp_path: Path) -> AegisWorld:
+    world = AegisWorld()
+    world.set_agent_world_file(str(tmp_path / "WorldInfoFile.out"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert world.build_world_from_file(f"worlds/{world_name}.world", None)
+    return world
+
+
+def run_rounds(world: AegisWorld, first_round: int, rounds: int) -> str:
+    replay = ""
+    for round in range(first_round, first_round + rounds):
+        world.round = round
+        replay += world.run_simulators()
+    return replay
+
+
+def drain_one_by_one(
+    survivor: Survivor, streams: RandomStreams, round: int
+) -> int | None:
+    """Drains a survivor's energy the way the simulator did before it drew in batches."""
+    stream = streams.stream(RandomStreams.SURVIVORS, round, survivor.id)
+    if stream.random_in_range(0, 20) < 12 or survivor.is_dead():
+        return None
+    remove_energy = survivor.damage_factor * stream.random_in_range(1, 5)
+    remove_energy += survivor.body_mass + survivor.mental_state
+    limit = stream.random_in_range(5, 10)
+    if remove_energy > limit:
+        remove_energy = remove_energy % limit + 1
+    survivor.remove_energy(remove_energy)
+    return survivor.get_energy_level()
+
+
+@pytest.mark.parametrize("world_name", ["ver2_1", "ver3_2"])
+def test_survivors_of_a_built_world_lose_energy_through_the_store(
+    world_name: str, tmp_path: Path
+) -> None:
+    world = build_world(world_name, tmp_path)
+    survivors = world.get_survivors()
+    assert survivors
+    store = world.get_survivor_store()
+    for survivor in survivors:
+        assert survivor.store is store
+    expected = [survivor.clone() for survivor in survivors]
+    energy_before = [survivor.get_energy_level() for survivor in survivors]
+    streams = RandomStreams(world.get_random_seed())
+
+    for round in range(1, ROUNDS + 1):
+        world.round = round
+        replay = world.run_simulators()
+        drained = "".join(
+            f"({survivor.id},{energy})"
+            for survivor in expected
+            if (energy := drain_one_by_one(survivor, streams, round)) is not None
+        )
+        assert f"SV; {{ {drained or 'NONE'} }};" in replay.splitlines()
+
+    for survivor, expected_survivor, energy in zip(survivors, expected, energy_before):
+        assert store.energy[survivor.slot] == survivor.get_energy_level()
+        assert survivor.get_energy_level() == expected_survivor.get_energy_level()
+        assert survivor.get_energy_level() < energy
+
+
+def test_a_fork_drains_its_own_survivors(tmp_path: Path) -> None:
+    world = build_world("ver3_2", tmp_path)
+    fork = world.fork()
+    energy_before = [survivor.get_energy_level() for survivor in world.get_survivors()]
+
+    _ = run_rounds(fork, 1, ROUNDS)
+
+    assert [
+        survivor.get_energy_level() for survivor in world.get_survivors()
+    ] == energy_before
+    for survivor, energy in zip(fork.get_survivors(), energy_before):
+        assert survivor.get_energy_level() < energy